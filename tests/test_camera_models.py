@@ -180,6 +180,62 @@ def test_camera_event():
         traceback.print_exc()
         return False
 
+def test_camera_info_dict_cache():
+    """Test the memoized CameraInfo.to_dict follows field changes"""
+    print("🔍 Testing CameraInfo.to_dict cache...")
+    
+    from datetime import datetime, timedelta
+    from webcam_ip.camera.models import CameraInfo, CameraCapabilities, CameraStatus
+    
+    now = datetime(2025, 7, 30, 15, 0, 0)
+    camera = CameraInfo("/dev/video0")
+    camera.mark_connected(CameraCapabilities(resolution="640x480", fps=30), now=now)
+    
+    # mark_connected(now=) stamps both timestamps with the shared tick
+    data = camera.to_dict()
+    assert data["status"] == "CONNECTED"
+    assert data["connected_at"] == now.isoformat()
+    assert data["last_seen"] == now.isoformat()
+    assert list(data)[list(data).index("connected_at") + 1] == "uptime_seconds"
+    
+    # Callers get a copy; changing it does not reach the cache
+    data["status"] = "TAMPERED"
+    data["extra"] = True
+    data = camera.to_dict()
+    assert data["status"] == "CONNECTED" and "extra" not in data
+    
+    # Every assignment after a to_dict() call shows up in the next one
+    later = now + timedelta(seconds=5)
+    camera.last_seen = later
+    assert camera.to_dict()["last_seen"] == later.isoformat()
+    
+    camera.connected_at = later
+    assert camera.to_dict()["connected_at"] == later.isoformat()
+    
+    camera.status = CameraStatus.DISCONNECTED
+    data = camera.to_dict()
+    assert not camera.connected
+    assert data["status"] == "DISCONNECTED"
+    assert "uptime_seconds" not in data and "resolution" not in data
+    
+    camera.mark_error("device busy")
+    data = camera.to_dict()
+    assert data["status"] == "ERROR" and data["error_message"] == "device busy"
+    
+    camera.mark_disconnected(now=later)
+    assert camera.to_dict()["disconnected_at"] == later.isoformat()
+    
+    # copy() starts with the same serialized form and is cached separately
+    clone = camera.copy()
+    assert clone.to_dict() == camera.to_dict()
+    clone.mark_connected(now=now)
+    assert clone.to_dict()["status"] == "CONNECTED"
+    assert camera.to_dict()["status"] == "DISCONNECTED"
+    assert camera.to_dict()["last_seen"] == later.isoformat()
+    
+    print("✅ CameraInfo.to_dict cache working correctly")
+    return True
+
 def main():
     print("=" * 50)
     print("🔍 CAMERA MODELS VALIDATION TEST")
@@ -188,6 +244,7 @@ def main():
     tests = [
         test_camera_capabilities,
         test_camera_info,
+        test_camera_info_dict_cache,
         test_camera_registry,
         test_camera_status_enum,   
         test_camera_event          
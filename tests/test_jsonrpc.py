@@ -7,6 +7,8 @@ Tests the core JSON-RPC functionality
 import asyncio
 import json
 
+import pytest
+
 async def test_jsonrpc_basic():
     """Test basic JSON-RPC handler functionality"""
     print("🔍 Testing JSON-RPC Handler...")
@@ -104,6 +106,130 @@ async def test_method_registration():
         traceback.print_exc()
         return False
 
+@pytest.mark.asyncio
+async def test_get_camera_statuses():
+    """Test batched camera status lookups"""
+    print("🔍 Testing get_camera_statuses...")
+    
+    from webcam_ip.server import methods
+    from webcam_ip.server.jsonrpc_handler import JSONRPCHandler
+    
+    async def fake_status(device):
+        if device == "/dev/video1":
+            raise OSError("device vanished")
+        return {"device": device, "status": "CONNECTED"}
+    
+    saved = (methods._MONITOR_AVAILABLE, getattr(methods, "get_camera_status_by_device", None))
+    methods._MONITOR_AVAILABLE = True
+    methods.get_camera_status_by_device = fake_status
+    try:
+        handler = JSONRPCHandler()
+        methods.register_all_methods(handler)
+        
+        request = {"jsonrpc": "2.0", "method": "get_camera_statuses",
+                   "params": {"devices": ["/dev/video0", "/dev/video2"]}, "id": 1}
+        result = json.loads(await handler.handle_request(json.dumps(request)))["result"]
+        assert result == {
+            "/dev/video0": {"device": "/dev/video0", "status": "CONNECTED"},
+            "/dev/video2": {"device": "/dev/video2", "status": "CONNECTED"},
+        }, f"Unexpected statuses: {result}"
+        
+        # One failing device is reported in place, the rest still answer
+        request["params"] = {"devices": ["/dev/video0", "/dev/video1"]}
+        result = json.loads(await handler.handle_request(json.dumps(request)))["result"]
+        assert result["/dev/video0"]["status"] == "CONNECTED"
+        assert result["/dev/video1"]["status"] == "ERROR"
+        assert "device vanished" in result["/dev/video1"]["error_message"]
+        
+        # Invalid paths reject the whole batch
+        for devices in (["/dev/video0", "/dev/sda"], ["../video0"], "/dev/video0"):
+            request["params"] = {"devices": devices}
+            response = json.loads(await handler.handle_request(json.dumps(request)))
+            assert "error" in response and "result" not in response, f"Accepted {devices!r}: {response}"
+    finally:
+        methods._MONITOR_AVAILABLE = saved[0]
+        if saved[1] is not None:
+            methods.get_camera_status_by_device = saved[1]
+    
+    print("✅ get_camera_statuses working correctly")
+    return True
+
+@pytest.mark.asyncio
+async def test_precomputed_responses():
+    """Test constant-result and templated response fast paths"""
+    print("🔍 Testing precomputed responses...")
+    
+    from webcam_ip.server.jsonrpc_handler import JSONRPCHandler
+    
+    calls = []
+    shared = {"version": 1}
+    
+    def ping():
+        calls.append("ping")
+        return "pong"
+    ping.precomputed_result = "pong"
+    
+    def info():
+        return shared
+    info.precomputed_result = shared
+    
+    def info_alias():
+        return shared
+    info_alias.precomputed_result = shared
+    
+    def answer():
+        return 42
+    
+    handler = JSONRPCHandler()
+    handler.register_methods([("ping", ping), ("info", info), ("info_alias", info_alias), ("answer", answer)])
+    
+    # Integer ids are answered from the template without calling the method
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","id":7}')
+    assert response == '{"jsonrpc":"2.0","result":"pong","id":7}', response
+    for params in ("[]", "{}", "null"):
+        response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","params":%s,"id":8}' % params)
+        assert json.loads(response)["result"] == "pong", response
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","id":"abc"}')
+    assert json.loads(response) == {"jsonrpc": "2.0", "result": "pong", "id": "abc"}, response
+    assert calls == [], f"Precomputed method was called: {calls}"
+    
+    # Answered before dispatch: the single-request path is never entered
+    dispatch = handler._handle_single_request
+    async def no_dispatch(request):
+        raise AssertionError(f"Dispatched {request}")
+    handler._handle_single_request = no_dispatch
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","id":15}')
+    assert response == '{"jsonrpc":"2.0","result":"pong","id":15}', response
+    handler._handle_single_request = dispatch
+    
+    # Falsy but non-empty params are still invalid
+    for params in ("0", '""', "false"):
+        response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","params":%s,"id":9}' % params)
+        assert json.loads(response)["error"]["code"] == -32602, response
+    
+    # Wrong protocol version is not short-circuited
+    response = await handler.handle_request('{"jsonrpc":"1.0","method":"ping","id":10}')
+    assert json.loads(response)["error"]["code"] == -32600, response
+    
+    # Two methods sharing one result object: dropping one keeps the other
+    handler.unregister_method("info")
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"info_alias","id":11}')
+    assert json.loads(response)["result"] == shared, response
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"info","id":12}')
+    assert json.loads(response)["error"]["code"] == -32601, response
+    
+    # Re-registering without precomputed_result goes back to calling the method
+    handler.register_method("ping", lambda: "pong again")
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"ping","id":13}')
+    assert json.loads(response)["result"] == "pong again", response
+    
+    # Scalar results use the fixed template too
+    response = await handler.handle_request('{"jsonrpc":"2.0","method":"answer","id":14}')
+    assert response == '{"jsonrpc":"2.0","result":42,"id":14}', response
+    
+    print("✅ Precomputed responses working correctly")
+    return True
+
 async def main():
     print("=" * 50)
     print("🔍 JSON-RPC VALIDATION TEST")
@@ -111,7 +237,9 @@ async def main():
     
     tests = [
         test_jsonrpc_basic,
-        test_method_registration
+        test_method_registration,
+        test_get_camera_statuses,
+        test_precomputed_responses
     ]
     
     passed = 0
@@ -4,6 +4,7 @@ Logging Configuration Validation Test
 Tests the logging system functionality
 """
 
+import logging
 import tempfile
 import os
 from pathlib import Path
@@ -46,7 +47,7 @@ def test_logging_setup():
     print("🔍 Testing logging setup...")
     
     try:
-        from webcam_ip.utils.logging import LogConfig, setup_logging, get_logger
+        from webcam_ip.utils.logging import LogConfig, setup_logging, get_logger, flush_logging
         
         # Create temporary directory for logs
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -65,6 +66,7 @@ def test_logging_setup():
             # Get a logger and test it
             logger = get_logger("test_logger")
             logger.info("Test log message")
+            flush_logging()
             
             # Check log file was created
             log_file = Path(temp_dir) / "server.log"
@@ -88,7 +90,7 @@ def test_structured_logging():
     print("🔍 Testing structured logging...")
     
     try:
-        from webcam_ip.utils.logging import LogConfig, setup_logging, get_logger
+        from webcam_ip.utils.logging import LogConfig, setup_logging, get_logger, flush_logging
         
         with tempfile.TemporaryDirectory() as temp_dir:
             config = LogConfig(
@@ -105,6 +107,7 @@ def test_structured_logging():
             logger = get_logger("test_structured", structured=True)
             logger.set_context(component="test", request_id="req-123")
             logger.info("Structured log message", user_id=456, action="test")
+            flush_logging()
             
             # Check JSON log file
             log_file = Path(temp_dir) / "server.log"
@@ -169,6 +172,143 @@ def test_json_formatter():
         traceback.print_exc()
         return False
 
+def test_parse_file_size():
+    """Test max_file_size parsing, including the fallback"""
+    print("🔍 Testing file size parsing...")
+    
+    from webcam_ip.utils.logging import LogConfig
+    
+    default = 10 * 1024 * 1024
+    cases = {
+        "10MB": 10 * 1024 * 1024,
+        "5KB": 5 * 1024,
+        "100B": 100,
+        "1GB": 1024 * 1024 * 1024,
+        " 2mb ": 2 * 1024 * 1024,
+        "1.5KB": 1536,
+        "garbage": default,
+        "MB": default,
+        "": default,
+    }
+    for size, expected in cases.items():
+        parsed = LogConfig(max_file_size=size).max_file_size_bytes
+        assert parsed == expected, f"{size!r}: expected {expected} bytes, got {parsed}"
+    
+    print("✅ File size parsing working correctly")
+    return True
+
+class _ListHandler(logging.Handler):
+    """Collects records instead of writing them"""
+    
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+    
+    def emit(self, record):
+        self.records.append(record)
+
+def _capturing_logger(name, level):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    return logger, handler
+
+def test_structured_logger_bind():
+    """Test bound loggers carry merged context without touching the parent"""
+    print("🔍 Testing StructuredLogger.bind...")
+    
+    from webcam_ip.utils.logging import StructuredLogger
+    
+    logger, handler = _capturing_logger("test_bind", logging.DEBUG)
+    base = StructuredLogger(logger)
+    base.set_context(component="server")
+    
+    bound = base.bind(request_id="req-1")
+    bound.info("bound message", user_id=7)
+    base.info("base message")
+    
+    # Later changes to the parent do not leak into the bound logger
+    base.set_context(component="changed")
+    bound.info("bound again")
+    
+    bound_record, base_record, again_record = handler.records
+    assert bound_record.component == "server"
+    assert bound_record.request_id == "req-1"
+    assert bound_record.user_id == 7
+    assert not hasattr(base_record, "request_id"), "bind() must not change the parent's context"
+    assert again_record.component == "server"
+    assert bound.bind(component="child").bind()._context == {"component": "child", "request_id": "req-1"}
+    
+    print("✅ StructuredLogger.bind working correctly")
+    return True
+
+def test_structured_logger_disabled_level():
+    """Test filtered-out levels return before building a record"""
+    print("🔍 Testing StructuredLogger disabled-level fast path...")
+    
+    from webcam_ip.utils.logging import StructuredLogger
+    
+    logger, handler = _capturing_logger("test_disabled_level", logging.WARNING)
+    structured = StructuredLogger(logger)
+    structured.set_context(component="test")
+    
+    calls = []
+    original_make_record = logger.makeRecord
+    
+    def make_record(*args, **kwargs):
+        calls.append(args[1])
+        return original_make_record(*args, **kwargs)
+    
+    logger.makeRecord = make_record
+    try:
+        structured.debug("dropped", field=1)
+        structured.info("dropped")
+        assert calls == [], f"Disabled levels built a record: {calls}"
+        
+        structured.warning("kept")
+        assert calls == [logging.WARNING]
+        
+        # The cached check follows level changes
+        logger.setLevel(logging.DEBUG)
+        structured.debug("now kept")
+        assert calls == [logging.WARNING, logging.DEBUG]
+    finally:
+        del logger.makeRecord
+    
+    assert [record.getMessage() for record in handler.records] == ["kept", "now kept"]
+    
+    print("✅ Disabled-level fast path working correctly")
+    return True
+
+def test_queued_logging_keeps_call_time_arguments():
+    """Test queued records are logged with their arguments as they were at call time"""
+    print("🔍 Testing queued logging arguments...")
+    
+    from webcam_ip.utils.logging import LogConfig, setup_logging, flush_logging
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        setup_logging(LogConfig(
+            level="INFO",
+            log_dir=Path(temp_dir),
+            console_enabled=False,
+            file_enabled=True,
+            queue_handlers=True
+        ))
+        
+        stats = {"frames": 1}
+        logging.getLogger("test_queued_args").info("stats %s", stats)
+        stats["frames"] = 2
+        flush_logging()
+        
+        log_content = (Path(temp_dir) / "server.log").read_text()
+        assert "stats {'frames': 1}" in log_content, f"Argument logged at drain time: {log_content}"
+    
+    print("✅ Queued logging keeps call-time arguments")
+    return True
+
 def main():
     print("=" * 50)
     print("🔍 LOGGING VALIDATION TEST")
@@ -178,7 +318,11 @@ def main():
         test_log_config,
         test_logging_setup,
         test_structured_logging,
-        test_json_formatter
+        test_json_formatter,
+        test_parse_file_size,
+        test_structured_logger_bind,
+        test_structured_logger_disabled_level,
+        test_queued_logging_keeps_call_time_arguments
     ]
     
     passed = 0
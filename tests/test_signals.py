@@ -1,6 +1,13 @@
 import pytest
 import asyncio
-
+import gc
+import os
+import signal
+import threading
+import time
+import weakref
+
+from webcam_ip.utils import signals
 from webcam_ip.utils.signals import SignalHandler, GracefulShutdown, ShutdownReason
 
 
@@ -90,3 +97,195 @@ async def test_gracefulshutdown_context_manager_async():
         mgr.add_cleanup_handler(cleanup_async, async_handler=True)
 
     assert called == ["cleanup_async"]
+
+
+def test_sync_cleanup_runs_in_reverse_order():
+    called = []
+
+    handler = SignalHandler(timeout=1.0)
+    for name in ("first", "second", "third"):
+        handler.add_cleanup_handler(lambda name=name: called.append(name), async_handler=False)
+
+    handler.trigger_shutdown(ShutdownReason.MANUAL)
+    handler.run_sync_cleanup()
+
+    assert called == ["third", "second", "first"]
+
+
+@pytest.mark.asyncio
+async def test_async_cleanup_starts_in_reverse_order():
+    called = []
+
+    def make_cleanup(name):
+        async def cleanup():
+            called.append(name)
+            await asyncio.sleep(0)
+        return cleanup
+
+    handler = SignalHandler(timeout=1.0)
+    for name in ("first", "second", "third"):
+        handler.add_cleanup_handler(make_cleanup(name), async_handler=True)
+
+    handler.trigger_shutdown(ShutdownReason.MANUAL)
+    await handler.run_async_cleanup()
+
+    assert called == ["third", "second", "first"]
+
+
+@pytest.mark.asyncio
+async def test_stop_phase_runs_before_drain():
+    called = []
+
+    async def stop_accepting():
+        await asyncio.sleep(0.01)
+        called.append("stop")
+
+    async def drain():
+        called.append("drain")
+
+    handler = SignalHandler(timeout=1.0)
+    handler.add_cleanup_handler(stop_accepting, async_handler=True, phase='stop')
+    handler.add_cleanup_handler(drain, async_handler=True)
+
+    handler.trigger_shutdown(ShutdownReason.MANUAL)
+    await handler.run_async_cleanup()
+
+    assert called == ["stop", "drain"]
+
+
+@pytest.mark.asyncio
+async def test_stuck_stop_handler_does_not_block_drain(monkeypatch):
+    called = []
+
+    async def stuck():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            called.append("stop cancelled")
+            raise
+
+    async def drain():
+        called.append("drain")
+
+    monkeypatch.setattr(signals, "STOP_PHASE_TIMEOUT", 0.05)
+    handler = SignalHandler(timeout=1.0)
+    handler.add_cleanup_handler(stuck, async_handler=True, phase='stop')
+    handler.add_cleanup_handler(drain, async_handler=True)
+
+    handler.trigger_shutdown(ShutdownReason.MANUAL)
+    await asyncio.wait_for(handler.run_async_cleanup(), timeout=1.0)
+
+    assert called == ["stop cancelled", "drain"]
+
+
+def test_parallel_sync_handlers_run_concurrently():
+    called = []
+    # Each parallel handler waits for the other: passes only if both run at once
+    barrier = threading.Barrier(2, timeout=1.0)
+
+    def make_parallel(name):
+        def cleanup():
+            barrier.wait()
+            called.append(name)
+        return cleanup
+
+    def ordered():
+        called.append("ordered")
+
+    handler = SignalHandler(timeout=2.0)
+    handler.add_cleanup_handler(make_parallel("parallel1"), parallel=True)
+    handler.add_cleanup_handler(make_parallel("parallel2"), parallel=True)
+    handler.add_cleanup_handler(ordered)
+
+    handler.trigger_shutdown(ShutdownReason.MANUAL)
+    handler.run_sync_cleanup()
+
+    assert not barrier.broken
+    assert sorted(called) == ["ordered", "parallel1", "parallel2"]
+
+
+class _Resource:
+    def __init__(self, name, closed):
+        self.name = name
+        self.closed = closed
+
+    def close(self):
+        self.closed.append(self.name)
+
+
+class _SlottedResource:
+    # No __weakref__ slot: cannot be held weakly
+    __slots__ = ("closed",)
+
+    def __init__(self, closed):
+        self.closed = closed
+
+    def close(self):
+        self.closed.append("slotted")
+
+
+def test_resources_held_weakly_and_closed_in_reverse_order():
+    closed = []
+
+    with GracefulShutdown(timeout=1.0, setup_signals=False) as gs:
+        first = _Resource("first", closed)
+        discarded = _Resource("discarded", closed)
+        last = _Resource("last", closed)
+        gs.add_resource(first)
+        gs.add_resource(discarded)
+        gs.add_resource(_SlottedResource(closed))
+        gs.add_resource(last)
+
+        # The shutdown manager must not keep a discarded resource alive
+        discarded_ref = weakref.ref(discarded)
+        del discarded
+        gc.collect()
+        assert discarded_ref() is None
+
+    assert closed == ["last", "slotted", "first"]
+
+
+def test_setup_signal_handlers_returns_one_instance():
+    assert signals.get_signal_handler() is None
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(signals.setup_signal_handlers(timeout=1.0)))
+                   for _ in range(8)]
+        # signal.signal() only works in the main thread; install there first
+        # so the racing threads all take the lookup path
+        first = signals.setup_signal_handlers(timeout=1.0)
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(result is first for result in results)
+        assert signals.get_signal_handler() is first
+
+        # Restoring the handlers frees the slot for a fresh instance
+        first.restore_signal_handlers()
+        assert signals.get_signal_handler() is None
+        second = signals.setup_signal_handlers(timeout=1.0)
+        assert second is not first
+    finally:
+        handler = signals.get_signal_handler()
+        if handler is not None:
+            handler.restore_signal_handlers()
+
+
+def test_fallback_signal_sets_shutdown_state_without_polling():
+    handler = SignalHandler(timeout=1.0)
+    # No running loop: installed with signal.signal() and the wakeup socket
+    handler.setup_signal_handlers()
+    try:
+        os.kill(os.getpid(), signal.SIGTERM)
+        # Set by the reader thread; nothing here polls or waits on the handler
+        deadline = time.monotonic() + 2.0
+        while handler.shutdown_context is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert handler.shutdown_event.is_set()
+        assert handler.shutdown_context.reason == ShutdownReason.SIGNAL_SIGTERM
+        assert handler.shutdown_context.signal_number == signal.SIGTERM
+    finally:
+        handler.restore_signal_handlers()
@@ -0,0 +1,127 @@
+import pytest
+import asyncio
+
+from webcam_ip.server.snapshot_stream import SnapshotStream, JPEG_SOI, JPEG_EOI
+
+
+class _FakeProcess:
+    """Stands in for the ffmpeg process; already exited, so nothing is terminated"""
+    returncode = 0
+
+
+def _jpeg(payload: bytes) -> bytes:
+    return JPEG_SOI + payload + JPEG_EOI
+
+
+async def _feed(reader: asyncio.StreamReader, *chunks: bytes):
+    """Feed chunks one at a time, letting the reader task consume each as its own read"""
+    for chunk in chunks:
+        reader.feed_data(chunk)
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+def _start_reader(stream: SnapshotStream) -> asyncio.StreamReader:
+    """Run the frame splitter on a fake stdout instead of a real ffmpeg pipe"""
+    reader = asyncio.StreamReader()
+    stream._proc = _FakeProcess()
+    stream._reader_task = asyncio.get_running_loop().create_task(
+        stream._read_frames(stream._proc, reader))
+    return reader
+
+
+@pytest.mark.asyncio
+async def test_frames_split_across_reads():
+    stream = SnapshotStream("/dev/video0", idle_timeout=10.0)
+    frames = []
+    stream._deliver = frames.append
+    reader = _start_reader(stream)
+
+    frame = _jpeg(b"frame-data")
+    # SOI and EOI markers both cut in half between reads
+    await _feed(reader, frame[:1], frame[1:5], frame[5:-1], frame[-1:])
+    reader.feed_eof()
+    await stream._reader_task
+
+    assert frames == [frame]
+
+
+@pytest.mark.asyncio
+async def test_junk_before_soi_is_skipped():
+    stream = SnapshotStream("/dev/video0", idle_timeout=10.0)
+    frames = []
+    stream._deliver = frames.append
+    reader = _start_reader(stream)
+
+    frame = _jpeg(b"payload")
+    await _feed(reader, b"\x00junk\xff", b"more junk", frame)
+    reader.feed_eof()
+    await stream._reader_task
+
+    assert frames == [frame]
+
+
+@pytest.mark.asyncio
+async def test_several_frames_in_one_chunk():
+    stream = SnapshotStream("/dev/video0", idle_timeout=10.0)
+    frames = []
+    stream._deliver = frames.append
+    reader = _start_reader(stream)
+
+    first, second, third = _jpeg(b"one"), _jpeg(b"two"), _jpeg(b"three")
+    # The third frame is still incomplete when the first chunk ends
+    await _feed(reader, first + second + third[:4], third[4:])
+    reader.feed_eof()
+    await stream._reader_task
+
+    assert frames == [first, second, third]
+
+
+@pytest.mark.asyncio
+async def test_next_frame_gets_the_next_complete_frame():
+    stream = SnapshotStream("/dev/video0", idle_timeout=10.0)
+    reader = _start_reader(stream)
+
+    request = asyncio.ensure_future(stream.next_frame(timeout=1.0))
+    await asyncio.sleep(0)
+    frame = _jpeg(b"snapshot")
+    await _feed(reader, frame)
+
+    assert await request == frame
+    await stream.close()
+
+
+@pytest.mark.asyncio
+async def test_waiters_fail_when_stream_ends():
+    stream = SnapshotStream("/dev/video0", idle_timeout=10.0)
+    reader = _start_reader(stream)
+
+    request = asyncio.ensure_future(stream.next_frame(timeout=1.0))
+    await asyncio.sleep(0)
+    # ffmpeg exits part way through a frame
+    await _feed(reader, JPEG_SOI + b"partial")
+    reader.feed_eof()
+
+    with pytest.raises(RuntimeError, match="ended"):
+        await request
+    assert not stream.running
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_is_closed():
+    stream = SnapshotStream("/dev/video0", idle_timeout=0.05)
+    reader = _start_reader(stream)
+
+    request = asyncio.ensure_future(stream.next_frame(timeout=1.0))
+    await asyncio.sleep(0)
+    await _feed(reader, _jpeg(b"frame"))
+    await request
+    assert stream.running
+
+    await asyncio.sleep(0.1)
+    # The close task is held by the stream until it finishes
+    await asyncio.gather(*stream._close_tasks)
+
+    assert not stream.running
+    assert stream._proc is None
+    assert not stream._close_tasks
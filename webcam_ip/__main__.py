@@ -1,11 +1,16 @@
 # webcam_ip/__main__.py
-from .config import Config
-from .server import create_server
+from .config import load_config
+from .server import create_server, run_server
 
 async def main():
-    config = Config.load()
+    server_config, _, _ = load_config()
     server = create_server(
-        host=config.server.host,
-        port=config.server.port
+        host=server_config.host,
+        port=server_config.port
     )
-    await server.start()
\ No newline at end of file
+    await server.start()
+
+if __name__ == "__main__":
+    # run_server picks uvloop before the loop exists, so subprocess and pipe
+    # transports (ffmpeg, gst-launch) run on libuv too
+    run_server(main())
@@ -27,6 +27,7 @@ from .monitor import (
     CameraMonitor,
     EventDrivenCameraMonitor,
     MonitorConfig,
+    MonitorStats,
     create_camera_monitor,
     get_current_cameras,
     get_camera_status_by_device
@@ -54,6 +55,7 @@ __all__ = [
     "CameraMonitor",
     "EventDrivenCameraMonitor",
     "MonitorConfig",
+    "MonitorStats",
     "create_camera_monitor",
     "get_current_cameras",
     "get_camera_status_by_device"
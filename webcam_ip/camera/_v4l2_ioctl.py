@@ -0,0 +1,134 @@
+"""
+V4L2 ioctl Probe
+
+Queries capture formats, frame sizes and frame rates straight from the
+driver with VIDIOC_* ioctls. The capability detector calls probe() and
+is_capture_device() in-process; no v4l2-ctl subprocess or text parsing
+is involved.
+"""
+
+import fcntl
+import os
+import struct
+
+# ioctl request encoding (asm-generic/ioctl.h)
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+def _ioc(direction: int, nr: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord('V') << 8) | nr
+
+# struct v4l2_capability
+_CAPABILITY = struct.Struct("16s32s32sIII3I")
+# struct v4l2_fmtdesc
+_FMTDESC = struct.Struct("III32sII3I")
+# struct v4l2_frmsizeenum (union sized for stepwise)
+_FRMSIZE = struct.Struct("III6I2I")
+# struct v4l2_frmivalenum (union sized for stepwise)
+_FRMIVAL = struct.Struct("IIIII6I2I")
+
+VIDIOC_QUERYCAP = _ioc(_IOC_READ, 0, _CAPABILITY.size)
+VIDIOC_ENUM_FMT = _ioc(_IOC_READ | _IOC_WRITE, 2, _FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES = _ioc(_IOC_READ | _IOC_WRITE, 74, _FRMSIZE.size)
+VIDIOC_ENUM_FRAMEINTERVALS = _ioc(_IOC_READ | _IOC_WRITE, 75, _FRMIVAL.size)
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+V4L2_FRMSIZE_TYPE_DISCRETE = 1
+V4L2_FRMIVAL_TYPE_DISCRETE = 1
+
+def _ioctl(fd: int, request: int, packer: struct.Struct, *values):
+    """Issue an ioctl with a packed struct and return the unpacked result"""
+    buf = bytearray(packer.pack(*values))
+    fcntl.ioctl(fd, request, buf)
+    return packer.unpack(buf)
+
+def _fourcc(value: int) -> str:
+    return value.to_bytes(4, 'little').decode('ascii', errors='replace').strip()
+
+def _max_fps(fd: int, pixel_format: int, width: int, height: int) -> int:
+    """Highest discrete frame rate for a format/size, 0 if unknown"""
+    best = 0
+    index = 0
+    while True:
+        try:
+            fields = _ioctl(fd, VIDIOC_ENUM_FRAMEINTERVALS, _FRMIVAL,
+                            index, pixel_format, width, height, 0, *([0] * 8))
+        except OSError:
+            break
+        ival_type, numerator, denominator = fields[4], fields[5], fields[6]
+        if ival_type == V4L2_FRMIVAL_TYPE_DISCRETE and numerator:
+            best = max(best, int(denominator / numerator))
+        else:
+            # Stepwise/continuous: the minimum interval gives the maximum rate
+            if numerator:
+                best = max(best, int(denominator / numerator))
+            break
+        index += 1
+    return best
+
+def _query_capabilities(fd: int) -> tuple:
+    """VIDIOC_QUERYCAP: the unpacked struct v4l2_capability"""
+    return _ioctl(fd, VIDIOC_QUERYCAP, _CAPABILITY, b"", b"", b"", 0, 0, 0, 0, 0, 0)
+
+def _supports_capture(cap: tuple) -> bool:
+    capabilities, device_caps = cap[4], cap[5]
+    caps = device_caps if capabilities & V4L2_CAP_DEVICE_CAPS else capabilities
+    return bool(caps & V4L2_CAP_VIDEO_CAPTURE)
+
+def is_capture_device(device: str) -> bool:
+    """Whether a device answers VIDIOC_QUERYCAP as a video capture device"""
+    fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        return _supports_capture(_query_capabilities(fd))
+    finally:
+        os.close(fd)
+
+def probe(device: str) -> dict:
+    """Query capture formats, frame sizes and frame rates for a device"""
+    fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        cap = _query_capabilities(fd)
+        if not _supports_capture(cap):
+            return {"device": device, "ok": False, "error": "not a video capture device"}
+
+        formats = []
+        sizes = []
+        fmt_index = 0
+        while True:
+            try:
+                desc = _ioctl(fd, VIDIOC_ENUM_FMT, _FMTDESC,
+                              fmt_index, V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b"", 0, 0, 0, 0, 0)
+            except OSError:
+                break
+            pixel_format = desc[4]
+            formats.append(_fourcc(pixel_format))
+
+            size_index = 0
+            while True:
+                try:
+                    frm = _ioctl(fd, VIDIOC_ENUM_FRAMESIZES, _FRMSIZE,
+                                 size_index, pixel_format, 0, *([0] * 8))
+                except OSError:
+                    break
+                if frm[2] == V4L2_FRMSIZE_TYPE_DISCRETE:
+                    width, height = frm[3], frm[4]
+                else:
+                    # Stepwise/continuous: report the largest size
+                    width, height = frm[4], frm[7]
+                sizes.append([width, height, _max_fps(fd, pixel_format, width, height)])
+                if frm[2] != V4L2_FRMSIZE_TYPE_DISCRETE:
+                    break
+                size_index += 1
+            fmt_index += 1
+
+        return {
+            "device": device,
+            "ok": True,
+            "card": cap[1].rstrip(b"\0").decode(errors="replace"),
+            "formats": formats,
+            "sizes": sizes,
+        }
+    finally:
+        os.close(fd)
@@ -1,20 +1,69 @@
 """
 Camera Capability Detection
 
-Handles detection of camera capabilities using v4l2-ctl with robust parsing.
+Handles detection of camera capabilities using V4L2 ioctls, with robust
+v4l2-ctl output parsing as a fallback.
 Provides fallback mechanisms and comprehensive error handling.
 """
 
 import os
 import re
+import sys
+import struct
+import asyncio
+import ctypes
+import ctypes.util
 import subprocess
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+import time
+from typing import Optional, List, Dict, Any, Tuple, Callable, Set, Collection
 from dataclasses import dataclass
 from .models import CameraCapabilities
+from . import _v4l2_ioctl as v4l2_ioctl
 
 logger = logging.getLogger(__name__)
 
+# inotify constants (see inotify(7))
+IN_ATTRIB = 0x00000004
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Interned /dev/videoN paths by node name, so repeated scans hand out the same
+# string objects and dict lookups keyed by device path compare by identity
+_VIDEO_PATHS: Dict[str, str] = {}
+
+# Resolutions preferred when choosing a default capture mode
+_COMMON_RESOLUTIONS = frozenset({(1920, 1080), (1280, 720), (640, 480)})
+
+# v4l2-ctl output patterns, compiled once
+_FORMAT_RE = re.compile(r'\[(\d+)\]:\s*\'(\w+)\'\s*\(([^)]+)\)')
+_SIZE_RE = re.compile(r'Size:\s*Discrete\s*((\d+)x(\d+))')
+_FPS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*fps')
+_WIDTH_HEIGHT_RE = re.compile(r'Width/Height\s*:\s*(\d+)/(\d+)')
+_PIXEL_FORMAT_RE = re.compile(r'Pixel Format\s*:\s*\'(\w+)\'')
+
+# v4l2-ctl failures that will not go away by retrying
+_HARD_V4L2_ERRORS = re.compile(r'No such device|No such file or directory|Permission denied|Inappropriate ioctl')
+# v4l2-ctl failures worth retrying after a short delay
+_TRANSIENT_V4L2_ERRORS = re.compile(r'Device or resource busy|Resource temporarily unavailable')
+
+def _open_inotify(path: str, mask: int) -> Optional[int]:
+    """Open a non-blocking inotify fd watching path, or None if unavailable"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, path.encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
 @dataclass
 class DetectionConfig:
     """Configuration for camera detection"""
@@ -24,11 +73,21 @@ class DetectionConfig:
     fallback_resolution: str = "640x480"
     fallback_fps: int = 30
     fallback_formats: List[str] = None
+    use_ioctl: bool = True  # query the driver with VIDIOC_* ioctls before trying v4l2-ctl
     
     def __post_init__(self):
         if self.fallback_formats is None:
             self.fallback_formats = ["YUYV"]
 
+def _ioctl_probe(device: str) -> Dict[str, Any]:
+    """Query a device in-process with VIDIOC_* ioctls, never raising"""
+    try:
+        return v4l2_ioctl.probe(device)
+    except OSError as e:
+        return {"device": device, "ok": False, "error": e.strerror or str(e)}
+    except Exception as e:
+        return {"device": device, "ok": False, "error": str(e)}
+
 class CameraCapabilityDetector:
     """
     Handles camera capability detection using v4l2-ctl with improved parsing
@@ -70,7 +129,14 @@ class CameraCapabilityDetector:
         logger.info(f"Detecting capabilities for {device}")
         
         try:
-            # Primary detection method
+            # Primary detection method: direct ioctls, no subprocess
+            if self.config.use_ioctl:
+                capabilities = self._detect_with_ioctl(device)
+                if capabilities:
+                    self._cache_capabilities(device, capabilities)
+                    return capabilities
+            
+            # v4l2-ctl detection method
             capabilities = self._detect_with_v4l2_list_formats(device)
             if capabilities:
                 self._cache_capabilities(device, capabilities)
@@ -101,6 +167,32 @@ class CameraCapabilityDetector:
             logger.error(f"Exception during capability detection for {device}: {e}")
             return None
     
+    def _detect_with_ioctl(self, device: str) -> Optional[CameraCapabilities]:
+        """Detection with VIDIOC_ENUM_FMT/FRAMESIZES/FRAMEINTERVALS ioctls"""
+        result = _ioctl_probe(device)
+        if not result.get("ok"):
+            logger.debug(f"ioctl probe could not query {device}: {result.get('error')}")
+            return None
+        
+        formats = result.get("formats") or []
+        if not formats:
+            return None
+        
+        best = self._fallback_mode()
+        for width, height, fps in result.get("sizes", []):
+            candidate = (width, height, fps or self.config.fallback_fps)
+            if self._is_better_resolution(candidate, best):
+                best = candidate
+        
+        capabilities = CameraCapabilities(
+            resolution=f"{best[0]}x{best[1]}",
+            fps=best[2],
+            formats=formats
+        )
+        
+        logger.info(f"Detected capabilities: {capabilities.resolution} @ {capabilities.fps}fps, formats: {capabilities.formats}")
+        return capabilities
+    
     def _detect_with_v4l2_list_formats(self, device: str) -> Optional[CameraCapabilities]:
         """Primary detection method using v4l2-ctl --list-formats-ext"""
         try:
@@ -150,9 +242,15 @@ class CameraCapabilityDetector:
                 
                 logger.debug(f"Command failed with exit code {result.returncode}: {result.stderr}")
                 
-                # Retry on certain errors
+                # Deterministic errors (missing device, no access, not a capture node) fail fast
+                if _HARD_V4L2_ERRORS.search(result.stderr):
+                    break
+                
+                # Only retry errors that are known to be transient
+                if not _TRANSIENT_V4L2_ERRORS.search(result.stderr):
+                    break
+                
                 if attempt < self.config.max_retries - 1:
-                    import time
                     time.sleep(self.config.retry_delay)
                 
             except subprocess.TimeoutExpired:
@@ -170,23 +268,16 @@ class CameraCapabilityDetector:
         """Parse v4l2-ctl --list-formats-ext output with robust regex patterns"""
         try:
             formats = []
-            best_resolution = self.config.fallback_resolution
-            best_fps = self.config.fallback_fps
+            best = self._fallback_mode()
             
             lines = output.split('\n')
             current_format = None
             
-            # Improved regex patterns
-            format_pattern = re.compile(r'\[(\d+)\]:\s*\'(\w+)\'\s*\(([^)]+)\)')
-            size_pattern = re.compile(r'Size:\s*Discrete\s*(\d+x\d+)')
-            fps_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*fps')
-            interval_pattern = re.compile(r'Interval:\s*Discrete\s*[\d.]+s\s*\(([^)]+)\)')
-            
             for i, line in enumerate(lines):
                 line = line.strip()
                 
                 # Check for format line
-                format_match = format_pattern.search(line)
+                format_match = _FORMAT_RE.search(line)
                 if format_match:
                     current_format = format_match.group(2)  # e.g., "YUYV"
                     if current_format not in formats:
@@ -195,7 +286,7 @@ class CameraCapabilityDetector:
                     continue
                 
                 # Check for size line
-                size_match = size_pattern.search(line)
+                size_match = _SIZE_RE.search(line)
                 if size_match and current_format:
                     resolution = size_match.group(1)
                     logger.debug(f"Found resolution: {resolution} for format {current_format}")
@@ -204,9 +295,9 @@ class CameraCapabilityDetector:
                     fps_found = self._find_fps_for_resolution(lines, i, resolution)
                     if fps_found:
                         # Prefer higher resolution or higher fps
-                        if self._is_better_resolution(resolution, best_resolution, fps_found, best_fps):
-                            best_resolution = resolution
-                            best_fps = fps_found
+                        candidate = (int(size_match.group(2)), int(size_match.group(3)), fps_found)
+                        if self._is_better_resolution(candidate, best):
+                            best = candidate
                             logger.debug(f"Updated best: {resolution} @ {fps_found}fps")
             
             if not formats:
@@ -214,8 +305,8 @@ class CameraCapabilityDetector:
                 return None
             
             capabilities = CameraCapabilities(
-                resolution=best_resolution,
-                fps=best_fps,
+                resolution=f"{best[0]}x{best[1]}",
+                fps=best[2],
                 formats=formats
             )
             
@@ -228,8 +319,6 @@ class CameraCapabilityDetector:
     
     def _find_fps_for_resolution(self, lines: List[str], start_index: int, resolution: str) -> int:
         """Find FPS information for a specific resolution"""
-        fps_pattern = re.compile(r'(\d+(?:\.\d+)?)\s*fps')
-        
         # Look in the next 10 lines for FPS information
         for i in range(start_index + 1, min(start_index + 11, len(lines))):
             line = lines[i].strip()
@@ -239,7 +328,7 @@ class CameraCapabilityDetector:
                 if 'Interval:' not in line and 'fps' not in line:
                     break
             
-            fps_match = fps_pattern.search(line)
+            fps_match = _FPS_RE.search(line)
             if fps_match:
                 try:
                     fps = int(float(fps_match.group(1)))
@@ -253,9 +342,6 @@ class CameraCapabilityDetector:
     def _parse_get_fmt_output(self, output: str) -> Optional[CameraCapabilities]:
         """Parse v4l2-ctl --get-fmt-video output"""
         try:
-            width_pattern = re.compile(r'Width/Height\s*:\s*(\d+)/(\d+)')
-            pixelformat_pattern = re.compile(r'Pixel Format\s*:\s*\'(\w+)\'')
-            
             width, height = 640, 480  # defaults
             pixel_format = "YUYV"  # default
             
@@ -263,13 +349,13 @@ class CameraCapabilityDetector:
                 line = line.strip()
                 
                 # Extract width/height
-                width_match = width_pattern.search(line)
+                width_match = _WIDTH_HEIGHT_RE.search(line)
                 if width_match:
                     width = int(width_match.group(1))
                     height = int(width_match.group(2))
                 
                 # Extract pixel format
-                format_match = pixelformat_pattern.search(line)
+                format_match = _PIXEL_FORMAT_RE.search(line)
                 if format_match:
                     pixel_format = format_match.group(1)
             
@@ -288,35 +374,46 @@ class CameraCapabilityDetector:
             logger.error(f"Error parsing get-fmt output: {e}")
             return None
     
-    def _is_better_resolution(self, new_res: str, current_res: str, new_fps: int, current_fps: int) -> bool:
-        """Determine if new resolution/fps combo is better than current"""
+    def _fallback_mode(self) -> Tuple[int, int, int]:
+        """Fallback (width, height, fps) used as the starting point for best-mode selection"""
         try:
-            new_w, new_h = map(int, new_res.split('x'))
-            cur_w, cur_h = map(int, current_res.split('x'))
-            
-            new_pixels = new_w * new_h
-            cur_pixels = cur_w * cur_h
-            
-            # Prefer higher resolution, but not at the cost of very low FPS
-            if new_pixels > cur_pixels and new_fps >= 15:
-                return True
-            
-            # If same resolution, prefer higher FPS
-            if new_pixels == cur_pixels and new_fps > current_fps:
-                return True
-            
-            # Prefer common resolutions
-            common_resolutions = ["1920x1080", "1280x720", "640x480"]
-            if new_res in common_resolutions and current_res not in common_resolutions:
-                return True
-            
-            return False
-            
+            width, height = map(int, self.config.fallback_resolution.split('x'))
         except ValueError:
-            return False
+            width, height = 640, 480
+        return width, height, self.config.fallback_fps
+    
+    @staticmethod
+    def _is_better_resolution(new: Tuple[int, int, int], current: Tuple[int, int, int]) -> bool:
+        """Determine if new (width, height, fps) mode is better than current"""
+        new_w, new_h, new_fps = new
+        cur_w, cur_h, cur_fps = current
+        
+        new_pixels = new_w * new_h
+        cur_pixels = cur_w * cur_h
+        
+        # Prefer higher resolution, but not at the cost of very low FPS
+        if new_pixels > cur_pixels and new_fps >= 15:
+            return True
+        
+        # If same resolution, prefer higher FPS
+        if new_pixels == cur_pixels and new_fps > cur_fps:
+            return True
+        
+        # Prefer common resolutions
+        if (new_w, new_h) in _COMMON_RESOLUTIONS and (cur_w, cur_h) not in _COMMON_RESOLUTIONS:
+            return True
+        
+        return False
     
     def _device_responds(self, device: str) -> bool:
         """Check if device responds to basic v4l2-ctl query"""
+        if self.config.use_ioctl:
+            # VIDIOC_QUERYCAP only; format enumeration already failed upstream
+            try:
+                return v4l2_ioctl.is_capture_device(device)
+            except Exception:
+                return False
+        
         try:
             cmd = ["v4l2-ctl", "--device", device, "--info"]
             result = self._run_v4l2_command(cmd)
@@ -337,7 +434,6 @@ class CameraCapabilityDetector:
             return None
         
         # Check if cache is still valid
-        import time
         cache_time = self._last_cache_time.get(device, 0)
         if time.time() - cache_time > self._cache_timeout:
             self._invalidate_cache(device)
@@ -347,7 +443,6 @@ class CameraCapabilityDetector:
     
     def _cache_capabilities(self, device: str, capabilities: CameraCapabilities):
         """Cache capabilities for a device"""
-        import time
         self._capability_cache[device] = capabilities
         self._last_cache_time[device] = time.time()
         logger.debug(f"Cached capabilities for {device}")
@@ -364,40 +459,167 @@ class CameraCapabilityDetector:
         self._last_cache_time.clear()
         logger.info("Cleared capability cache")
     
-    def get_supported_devices(self, device_range: range = range(10)) -> List[str]:
+    def _scan_video_devices(self, device_range: Optional[range] = None,
+                            device_paths: Optional[Collection[str]] = None) -> List[str]:
+        """
+        Enumerate /dev/videoN nodes with a single directory scan
+        
+        Args:
+            device_range: Optional range of device numbers to keep
+            device_paths: Optional precomputed candidate paths to keep
+            
+        Returns:
+            Readable device paths sorted by device number
+        """
+        found = []
+        
+        try:
+            with os.scandir('/dev') as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.startswith('video') or not name[5:].isdigit():
+                        continue
+                    
+                    path = _VIDEO_PATHS.get(name)
+                    if path is None:
+                        path = _VIDEO_PATHS.setdefault(name, sys.intern(entry.path))
+                    if device_paths is not None and path not in device_paths:
+                        continue
+                    
+                    number = int(name[5:])
+                    if device_range is not None and number not in device_range:
+                        continue
+                    
+                    found.append((number, path))
+        except OSError as e:
+            logger.error(f"Could not scan /dev for video devices: {e}")
+            return []
+        
+        found.sort()
+        return [path for _, path in found if os.access(path, os.R_OK)]
+    
+    def get_supported_devices(self, device_range: Optional[range] = None,
+                              device_paths: Optional[Collection[str]] = None) -> List[str]:
         """
         Get list of supported video devices
         
         Args:
-            device_range: Range of device numbers to check (default 0-9)
+            device_range: Range of device numbers to check (default: all /dev/videoN nodes)
+            device_paths: Precomputed candidate paths to check instead of a range
             
         Returns:
             List of device paths that exist and respond
         """
         supported = []
         
-        for i in device_range:
-            device = f"/dev/video{i}"
-            
-            if self._is_valid_device(device):
-                # Quick check if device responds
-                if self._device_responds(device):
-                    supported.append(device)
-                    logger.debug(f"Device {device} is supported")
-                else:
-                    logger.debug(f"Device {device} exists but doesn't respond")
+        for device in self._scan_video_devices(device_range, device_paths):
+            # Quick check if device responds
+            if self._device_responds(device):
+                supported.append(device)
+                logger.debug(f"Device {device} is supported")
             else:
-                logger.debug(f"Device {device} not found or not accessible")
+                logger.debug(f"Device {device} exists but doesn't respond")
         
         logger.info(f"Found {len(supported)} supported devices: {supported}")
         return supported
     
-    def detect_all_capabilities(self, device_range: range = range(10)) -> Dict[str, CameraCapabilities]:
+    async def watch_async(self, callback: Callable[[str, Optional[CameraCapabilities]], Any],
+                          poll_interval: float = 1.0):
+        """
+        Watch /dev for video device changes until cancelled
+        
+        Uses inotify when available so no work is done while nothing changes,
+        and falls back to periodic scanning otherwise.
+        
+        Args:
+            callback: Called with (device, capabilities) when a device appears,
+                      or (device, None) when it is removed. May be async.
+            poll_interval: Scan interval for the polling fallback
+        """
+        loop = asyncio.get_running_loop()
+        known: Set[str] = set()
+        
+        async def device_added(device: str):
+            if device in known:
+                return
+            known.add(device)
+            capabilities = await loop.run_in_executor(None, self.detect_capabilities, device)
+            await _notify(device, capabilities)
+        
+        async def device_removed(device: str):
+            if device not in known:
+                return
+            known.discard(device)
+            self._invalidate_cache(device)
+            await _notify(device, None)
+        
+        async def _notify(device: str, capabilities: Optional[CameraCapabilities]):
+            try:
+                result = callback(device, capabilities)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error in device watch callback for {device}: {e}")
+        
+        # Watch before the initial scan so a device plugged in during it is
+        # still queued; events for devices the scan found are skipped via known
+        fd = _open_inotify('/dev', IN_CREATE | IN_DELETE | IN_ATTRIB)
+        
+        try:
+            for device in self._scan_video_devices():
+                await device_added(device)
+        except BaseException:
+            if fd is not None:
+                os.close(fd)
+            raise
+        
+        if fd is None:
+            logger.warning("inotify not available, falling back to polling /dev")
+            while True:
+                await asyncio.sleep(poll_interval)
+                current = set(self._scan_video_devices())
+                for device in sorted(known - current):
+                    await device_removed(device)
+                for device in sorted(current - known):
+                    await device_added(device)
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def on_readable():
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(data):
+                _, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+                offset += name_len
+                if name.startswith('video') and name[5:].isdigit():
+                    queue.put_nowait((mask, os.path.join('/dev', name)))
+        
+        loop.add_reader(fd, on_readable)
+        logger.info("Watching /dev for video device changes (inotify)")
+        
+        try:
+            while True:
+                mask, device = await queue.get()
+                if mask & IN_DELETE:
+                    await device_removed(device)
+                elif os.access(device, os.R_OK):
+                    # IN_ATTRIB covers udev fixing permissions after creation
+                    await device_added(device)
+        finally:
+            loop.remove_reader(fd)
+            os.close(fd)
+    
+    def detect_all_capabilities(self, device_range: Optional[range] = None) -> Dict[str, CameraCapabilities]:
         """
         Detect capabilities for all available devices
         
         Args:
-            device_range: Range of device numbers to check
+            device_range: Range of device numbers to check (default: all)
             
         Returns:
             Dictionary mapping device paths to capabilities
@@ -421,10 +643,10 @@ def detect_camera_capabilities(device: str) -> Optional[CameraCapabilities]:
     """Convenience function to detect capabilities for a single device"""
     return default_detector.detect_capabilities(device)
 
-def get_supported_cameras(device_range: range = range(10)) -> List[str]:
+def get_supported_cameras(device_range: Optional[range] = None) -> List[str]:
     """Convenience function to get supported camera devices"""
     return default_detector.get_supported_devices(device_range)
 
-def detect_all_cameras(device_range: range = range(10)) -> Dict[str, CameraCapabilities]:
+def detect_all_cameras(device_range: Optional[range] = None) -> Dict[str, CameraCapabilities]:
     """Convenience function to detect all camera capabilities"""
     return default_detector.detect_all_capabilities(device_range)
\ No newline at end of file
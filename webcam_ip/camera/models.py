@@ -18,7 +18,18 @@ class CameraStatus(Enum):
     ERROR = "ERROR"
     UNKNOWN = "UNKNOWN"
 
-@dataclass
+# Plain-string status values, compared against the cached value in to_dict()
+STATUS_CONNECTED = CameraStatus.CONNECTED.value
+STATUS_DISCONNECTED = CameraStatus.DISCONNECTED.value
+STATUS_ERROR = CameraStatus.ERROR.value
+
+# CameraInfo fields that appear in to_dict(); assigning one drops the cache
+_SERIALIZED_FIELDS = frozenset({
+    "device", "status", "capabilities", "connected_at", "disconnected_at",
+    "last_seen", "error_message", "metadata",
+})
+
+@dataclass(slots=True)
 class CameraCapabilities:
     """
     Camera capability information detected from v4l2-ctl
@@ -72,7 +83,7 @@ class CameraCapabilities:
             "controls": self.controls
         }
 
-@dataclass
+@dataclass(slots=True)
 class CameraInfo:
     """
     Complete camera information container
@@ -95,6 +106,13 @@ class CameraInfo:
     last_seen: Optional[datetime] = None
     error_message: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Memoized serialized values, maintained by __setattr__ (no defaults here:
+    # __init__ would reset them after the fields they derive from are set)
+    _status_value: str = field(init=False, repr=False, compare=False)
+    _last_seen_iso: Optional[str] = field(init=False, repr=False, compare=False)
+    _connected_at_iso: Optional[str] = field(init=False, repr=False, compare=False)
+    _disconnected_at_iso: Optional[str] = field(init=False, repr=False, compare=False)
+    _dict_cache: Optional[Dict[str, Any]] = field(init=False, repr=False, compare=False, default=None)
     
     def __post_init__(self):
         """Initialize timestamps and validate device path"""
@@ -104,6 +122,21 @@ class CameraInfo:
         if self.last_seen is None:
             self.last_seen = datetime.now()
     
+    def __setattr__(self, name: str, value: Any):
+        """Keep the memoized status value, ISO strings and dict in step with the fields"""
+        object.__setattr__(self, name, value)
+        if name not in _SERIALIZED_FIELDS:
+            return
+        object.__setattr__(self, "_dict_cache", None)
+        if name == "status":
+            object.__setattr__(self, "_status_value", value.value)
+        elif name == "last_seen":
+            object.__setattr__(self, "_last_seen_iso", value.isoformat() if value else None)
+        elif name == "connected_at":
+            object.__setattr__(self, "_connected_at_iso", value.isoformat() if value else None)
+        elif name == "disconnected_at":
+            object.__setattr__(self, "_disconnected_at_iso", value.isoformat() if value else None)
+    
     @property
     def connected(self) -> bool:
         """Check if camera is currently connected"""
@@ -138,22 +171,27 @@ class CameraInfo:
             return self.capabilities.fps
         return 0
     
-    def mark_connected(self, capabilities: Optional[CameraCapabilities] = None):
-        """Mark camera as connected with optional capabilities"""
+    def mark_connected(self, capabilities: Optional[CameraCapabilities] = None,
+                       now: Optional[datetime] = None):
+        """Mark camera as connected with optional capabilities (now: shared tick timestamp)"""
+        if now is None:
+            now = datetime.now()
         self.status = CameraStatus.CONNECTED
-        self.connected_at = datetime.now()
-        self.last_seen = datetime.now()
+        self.connected_at = now
+        self.last_seen = now
         self.disconnected_at = None
         self.error_message = None
         
         if capabilities:
             self.capabilities = capabilities
     
-    def mark_disconnected(self):
-        """Mark camera as disconnected"""
+    def mark_disconnected(self, now: Optional[datetime] = None):
+        """Mark camera as disconnected (now: shared tick timestamp)"""
+        if now is None:
+            now = datetime.now()
         self.status = CameraStatus.DISCONNECTED
-        self.disconnected_at = datetime.now()
-        self.last_seen = datetime.now()
+        self.disconnected_at = now
+        self.last_seen = now
         # Keep capabilities for reference
     
     def mark_error(self, error_message: str):
@@ -162,24 +200,53 @@ class CameraInfo:
         self.error_message = error_message
         self.last_seen = datetime.now()
     
-    def update_last_seen(self):
+    def update_last_seen(self, now: Optional[datetime] = None):
         """Update the last seen timestamp"""
-        self.last_seen = datetime.now()
+        self.last_seen = now if now is not None else datetime.now()
+    
+    def copy(self) -> "CameraInfo":
+        """Return an independent copy (capabilities are shared, metadata is copied)"""
+        return CameraInfo(
+            device=self.device,
+            status=self.status,
+            capabilities=self.capabilities,
+            connected_at=self.connected_at,
+            disconnected_at=self.disconnected_at,
+            last_seen=self.last_seen,
+            error_message=self.error_message,
+            metadata=self.metadata.copy()
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert to dictionary for JSON-RPC notifications and responses
         
-        This is the format sent to WebSocket clients
+        This is the format sent to WebSocket clients. The serialized form is
+        memoized until one of its fields is assigned; each call returns a
+        fresh shallow copy, so callers may modify it. Changes made inside
+        capabilities or metadata in place are not tracked.
         """
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._dict_cache = self._build_dict()
+        
+        data = dict(cached)
+        if "uptime_seconds" in data:
+            # Uptime changes on every call; its slot is kept in the cached dict
+            data["uptime_seconds"] = (datetime.now() - self.connected_at).total_seconds()
+        return data
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Serialize the fields that only change on state transitions"""
+        status = self._status_value
         data = {
             "device": self.device,
-            "status": self.status.value,
-            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "status": status,
+            "last_seen": self._last_seen_iso,
         }
         
         # Add connection-specific data
-        if self.status == CameraStatus.CONNECTED:
+        if status == STATUS_CONNECTED:
             if self.capabilities:
                 data.update({
                     "resolution": self.capabilities.resolution,
@@ -188,14 +255,14 @@ class CameraInfo:
                 })
             
             if self.connected_at:
-                data["connected_at"] = self.connected_at.isoformat()
-                data["uptime_seconds"] = self.uptime_seconds
+                data["connected_at"] = self._connected_at_iso
+                data["uptime_seconds"] = None  # filled in by to_dict()
         
-        elif self.status == CameraStatus.DISCONNECTED:
+        elif status == STATUS_DISCONNECTED:
             if self.disconnected_at:
-                data["disconnected_at"] = self.disconnected_at.isoformat()
+                data["disconnected_at"] = self._disconnected_at_iso
         
-        elif self.status == CameraStatus.ERROR:
+        elif status == STATUS_ERROR:
             if self.error_message:
                 data["error_message"] = self.error_message
         
@@ -219,14 +286,14 @@ class CameraInfo:
         
         # Add all timestamps
         data.update({
-            "connected_at": self.connected_at.isoformat() if self.connected_at else None,
-            "disconnected_at": self.disconnected_at.isoformat() if self.disconnected_at else None,
+            "connected_at": self._connected_at_iso,
+            "disconnected_at": self._disconnected_at_iso,
             "device_number": self.device_number,
         })
         
         return data
 
-@dataclass
+@dataclass(slots=True)
 class CameraEvent:
     """
     Camera event for monitoring and logging
@@ -278,6 +345,7 @@ class CameraRegistry:
         self._cameras: Dict[str, CameraInfo] = {}
         self._events: List[CameraEvent] = []
         self._max_events = 1000  # Keep last 1000 events
+        self.generation = 0  # bumped on every add/remove so readers can detect changes
     
     def get_camera(self, device: str) -> Optional[CameraInfo]:
         """Get camera by device path"""
@@ -287,6 +355,7 @@ class CameraRegistry:
         """Add or update camera information"""
         old_camera = self._cameras.get(camera_info.device)
         self._cameras[camera_info.device] = camera_info
+        self.generation += 1
         
         # Record event if status changed
         if old_camera and old_camera.status != camera_info.status:
@@ -314,6 +383,7 @@ class CameraRegistry:
             self._add_event(event)
             
             del self._cameras[device]
+            self.generation += 1
             return True
         return False
     
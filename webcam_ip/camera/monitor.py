@@ -7,14 +7,21 @@ polling and event-driven monitoring options.
 """
 
 import asyncio
+import contextvars
+import importlib.util
 import logging
+import os
+import sys
 import threading
 import time
+import warnings
 import concurrent.futures
 from datetime import datetime
-from typing import Dict, Callable, Optional, List, Set, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Callable, Optional, List, Set, Any, Tuple, Mapping, Collection
+from dataclasses import dataclass, field, asdict
 
+from ..utils.clock import now_iso
 from .models import CameraInfo, CameraStatus, CameraCapabilities, CameraEvent, camera_registry
 from .detector import CameraCapabilityDetector, DetectionConfig
 
@@ -25,14 +32,39 @@ class MonitorConfig:
     """Configuration for camera monitoring"""
     poll_interval: float = 0.1  # 100ms for sub-200ms response
     device_range: range = None
+    device_paths: Optional[Tuple[str, ...]] = field(init=False, repr=False)  # derived from device_range
+    scan_all_devices: bool = False  # accept every /dev/videoN found by the /dev scan, ignoring device_range
     detection_timeout: float = 2.0
     max_detection_retries: int = 2
     enable_capability_detection: bool = True
     capability_cache_timeout: float = 30.0
+    event_settle_time: float = 0.2  # quiet period before applying a burst of udev events
+    add_retry_delay: float = 0.05  # first backoff for a node that is not ready yet
+    add_retry_attempts: int = 5  # delays double each attempt (0.05s .. 0.8s)
+    event_debounce: float = 0.0  # opt-in: per device, emit only the final state once events go quiet (delays every event)
+    event_batch_window: float = 0.02  # coalesce camera events raised within this window
+    batch_events: bool = False  # deliver each window as one callback(list_of_events)
+    full_scan_interval: float = 1.0  # polling: max time between full scans while sysfs is unchanged
     
     def __post_init__(self):
         if self.device_range is None:
             self.device_range = range(10)  # /dev/video0 to /dev/video9
+        # Build candidate paths once; interned so known_cameras lookups hit on identity.
+        # None lets the detector's single /dev scan report every video node.
+        if self.scan_all_devices:
+            self.device_paths = None
+        else:
+            self.device_paths = tuple(sys.intern(f"/dev/video{i}") for i in self.device_range)
+
+@dataclass(slots=True)
+class MonitorStats:
+    """Monitoring counters (attribute increments instead of string-keyed dict updates)"""
+    monitoring_started: Optional[datetime] = None
+    total_events: int = 0
+    connect_events: int = 0
+    disconnect_events: int = 0
+    error_events: int = 0
+    detection_failures: int = 0
 
 class CameraMonitor:
     """
@@ -47,6 +79,9 @@ class CameraMonitor:
     - Performance optimizations
     """
     
+    ERROR_SUMMARY_INTERVAL = 60.0  # seconds between summaries of a repeating loop error
+    _from_factory = False  # set on instances returned by create_camera_monitor()
+    
     def __init__(self, 
                  callback: Callable[[Dict[str, Any]], None],
                  loop: asyncio.AbstractEventLoop,
@@ -55,7 +90,8 @@ class CameraMonitor:
         Initialize camera monitor
         
         Args:
-            callback: Async callback function for camera events
+            callback: Async callback function for camera events (receives a
+                list of events per batch window when config.batch_events is set)
             loop: Event loop for scheduling callbacks (FIXES the threading issue!)
             config: Monitor configuration
         """
@@ -63,13 +99,23 @@ class CameraMonitor:
         self.loop = loop  # Store the main event loop - THIS FIXES THE BUG!
         self.config = config or MonitorConfig()
         
-        # Monitoring state
+        # Monitoring state (the monitor runs as a task on the main loop)
         self.monitoring = False
-        self.monitor_thread: Optional[threading.Thread] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
         
-        # Camera state tracking
+        # Camera state tracking. known_cameras is copy-on-write: writers build a
+        # new dict and rebind the attribute (atomic), readers never lock.
         self.known_cameras: Dict[str, CameraInfo] = {}
-        self.lock = threading.Lock()
+        # Writers run one at a time: every change is applied while holding this
+        # loop-side lock, including the worker-thread passes it awaits
+        self._apply_lock = asyncio.Lock()
+        
+        # Read-only copies of known_cameras handed out to API readers
+        self._snapshot: Mapping[str, CameraInfo] = MappingProxyType({})
+        
+        # Capabilities memoized per device node: (device, st_ino, st_rdev) -> (time, caps)
+        self._info_cache: Dict[Tuple[str, int, int], Tuple[float, Optional[CameraCapabilities]]] = {}
         
         # Detection components
         detection_config = DetectionConfig(
@@ -79,42 +125,84 @@ class CameraMonitor:
         self.detector = CameraCapabilityDetector(detection_config)
         
         # Statistics
-        self.stats = {
-            "monitoring_started": None,
-            "total_events": 0,
-            "connect_events": 0,
-            "disconnect_events": 0,
-            "error_events": 0,
-            "detection_failures": 0,
-        }
+        self.stats = MonitorStats()
+        self._started_monotonic = 0.0  # uptime base; immune to wall-clock jumps
+        
+        # Repeated identical loop errors are counted, not re-logged with tracebacks
+        self._last_error_repr: Optional[str] = None
+        self._last_error_count = 0
+        self._last_error_logged = 0.0
         
         logger.info(f"Camera monitor initialized with config: {self.config}")
-        self._stop_event = threading.Event()
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)  # For capability detection
+        
+        # Camera events waiting for the next batch flush on the loop
+        self._pending_events: List[Dict[str, Any]] = []
+        self._events_lock = threading.Lock()
+        self._flush_scheduled = False
+        
+        # Per-device debounce: latest event and quiet-period timer (timers live on the loop)
+        self._debounced_events: Dict[str, Dict[str, Any]] = {}
+        self._debounce_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._delivered_status: Dict[str, str] = {}
+        
+        # Identify the loop thread so callers already on it can skip call_soon_threadsafe
+        self._loop_thread_ident: Optional[int] = None
+        self.loop.call_soon_threadsafe(self._record_loop_thread)
+    
+    def _record_loop_thread(self):
+        """Remember the event loop's thread (runs on the loop)"""
+        self._loop_thread_ident = threading.get_ident()
+    
+    def _submit_to_loop(self, coro):
+        """Schedule a coroutine on the main loop, avoiding the threadsafe path on the loop thread"""
+        if threading.get_ident() == self._loop_thread_ident:
+            self.loop.create_task(coro)
+        else:
+            self.loop.call_soon_threadsafe(self.loop.create_task, coro)
+    
+    def _call_on_loop(self, func: Callable, *args):
+        """Run a plain callable on the main loop, directly when already on it"""
+        if threading.get_ident() == self._loop_thread_ident:
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Create a task on the loop and keep a reference until it finishes (runs on the loop)"""
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
     
     def start_monitoring(self):
-        """Start camera monitoring in a separate thread"""
+        """Start camera monitoring on the main event loop"""
         if self.monitoring:
             logger.warning("Camera monitoring already started")
             return
 
+        # Only direct construction is deprecated: create_camera_monitor() picks
+        # polling on purpose (use_event_driven=False) or as a logged fallback
+        if (type(self) is CameraMonitor and not self._from_factory
+                and sys.platform.startswith('linux')
+                and importlib.util.find_spec('pyudev') is not None):
+            warnings.warn(
+                "Polling CameraMonitor is deprecated on Linux when pyudev is available; "
+                "use create_camera_monitor() for udev event notifications",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            logger.warning("Using polling camera monitor although pyudev is available")
+
         self.monitoring = True
-        self._stop_event.clear()  # Reset stop event
-        self.stats["monitoring_started"] = datetime.now()
-        
-        # Start monitoring thread
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop,
-            name="CameraMonitor",
-            daemon=True
-        )
-        self.monitor_thread.start()
+        self.stats.monitoring_started = datetime.now()
+        self._started_monotonic = time.monotonic()
+        
+        self._call_on_loop(self._start_on_loop)
         logger.info("Camera monitoring started")
         
         # Send initial camera status using proper async scheduling
-        self.loop.call_soon_threadsafe(
-            lambda: asyncio.create_task(self._send_initial_status())
-        )
+        self._submit_to_loop(self._send_initial_status())
     
     def stop_monitoring(self):
         """Stop camera monitoring gracefully"""
@@ -123,87 +211,218 @@ class CameraMonitor:
 
         logger.info("Stopping camera monitoring...")
         self.monitoring = False
-        self._stop_event.set()  # Signal the thread to wake up and exit
-
-        # Wait for monitor thread to finish
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=2.0)
-            if self.monitor_thread.is_alive():
-                logger.warning("Monitor thread did not stop gracefully")
+        self._call_on_loop(self._stop_on_loop)
 
         # Shutdown the executor
         self.executor.shutdown(wait=True)
 
         # Log final statistics
-        duration = datetime.now() - self.stats["monitoring_started"]
-        logger.info(f"Camera monitoring stopped after {duration.total_seconds():.1f}s")
+        duration = time.monotonic() - self._started_monotonic
+        logger.info(f"Camera monitoring stopped after {duration:.1f}s")
         logger.info(f"Final stats: {self.stats}")
 
-    def _monitor_loop(self):
-        """Main monitoring loop running in separate thread"""
+    def _start_on_loop(self):
+        """Start the polling task (runs on the loop)"""
+        self._monitor_task = self._spawn(self._monitor_loop())
+    
+    def _stop_on_loop(self):
+        """Cancel the polling task (runs on the loop)"""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        self._cancel_debounce()
+    
+    def _cancel_debounce(self):
+        """Drop debounced events that have not been emitted yet (runs on the loop)"""
+        for handle in self._debounce_handles.values():
+            handle.cancel()
+        self._debounce_handles.clear()
+        with self._events_lock:
+            self._debounced_events.clear()
+    
+    async def _monitor_loop(self):
+        """Main polling loop; detection runs in the executor, waiting happens on the loop"""
         logger.info("Camera monitoring loop started")
 
-        while self.monitoring:
-            try:
-                # Detect current cameras
-                current_cameras = self._detect_current_cameras()
-
-                # Process changes with thread-safe locking
-                with self.lock:
-                    self._process_camera_changes(current_cameras)
-
-                # Wait for poll interval or until stop event is set
-                if self._stop_event.wait(self.config.poll_interval):
-                    break  # Stop event set, exit promptly
-
-            except Exception as e:
-                logger.error(f"Error in camera monitoring loop: {e}", exc_info=True)
-                self.stats["error_events"] += 1
-                # Wait for 1s or until stop event is set
-                if self._stop_event.wait(1.0):
-                    break
+        sysfs_state = None
+        last_full_scan = 0.0
+        try:
+            while self.monitoring:
+                delay = self.config.poll_interval
+                try:
+                    # Steady state is one directory read: skip the probe pass while the
+                    # set of v4l2 nodes is unchanged, but rescan periodically to catch
+                    # nodes that only became readable/responsive later
+                    state = self._video4linux_state()
+                    now = time.monotonic()
+                    if (state is not None and state == sysfs_state
+                            and now - last_full_scan < self.config.full_scan_interval):
+                        await asyncio.sleep(delay)
+                        continue
+                    sysfs_state = state
+                    last_full_scan = now
+                    
+                    async with self._apply_lock:
+                        await self._run_blocking(self._poll_cameras)
+                    self._flush_repeated_errors()
+                except Exception as e:
+                    self._log_loop_error(e)
+                    self.stats.error_events += 1
+                    delay = 1.0
+                
+                await asyncio.sleep(delay)
+        finally:
+            self._flush_repeated_errors()
+            logger.info("Camera monitoring loop stopped")
+    
+    def _log_loop_error(self, error: Exception):
+        """Log a loop failure with traceback once; count identical repeats instead"""
+        key = repr(error)
+        now = time.monotonic()
+        if key == self._last_error_repr:
+            self._last_error_count += 1
+            if now - self._last_error_logged >= self.ERROR_SUMMARY_INTERVAL:
+                self._flush_repeated_errors()
+                self._last_error_repr = key
+                self._last_error_logged = now
+            return
+        
+        self._flush_repeated_errors()
+        self._last_error_repr = key
+        self._last_error_logged = now
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(f"Error in camera monitoring loop: {error}", exc_info=error)
+    
+    def _flush_repeated_errors(self):
+        """Emit a summary line for suppressed repeats of the last loop error"""
+        if self._last_error_count:
+            logger.error(f"Camera monitoring error repeated {self._last_error_count} times: "
+                         f"{self._last_error_repr}")
+        self._last_error_repr = None
+        self._last_error_count = 0
+    
+    @staticmethod
+    def _video4linux_state() -> Optional[frozenset]:
+        """
+        Cheap change token for the set of v4l2 device nodes
+        
+        Uses the /sys/class/video4linux listing rather than its mtime, which
+        sysfs does not reliably update. None if sysfs is unavailable.
+        """
+        try:
+            return frozenset(os.listdir('/sys/class/video4linux'))
+        except OSError:
+            return None
+    
+    def _poll_cameras(self):
+        """One polling pass: detect cameras and apply changes (blocking)"""
+        # One wall-clock read per tick, shared by every camera touched
+        tick_time = datetime.now()
+        
+        # Detect current cameras
+        current_cameras = self._detect_current_cameras(tick_time)
 
-        logger.info("Camera monitoring loop stopped")
+        # Process changes (cheap key comparison when nothing changed)
+        self._process_camera_changes(current_cameras, tick_time)
+    
+    def _candidate_devices(self) -> Optional[Collection[str]]:
+        """Device paths worth probing (None: every node found in /dev)"""
+        return self.config.device_paths
     
-    def _detect_current_cameras(self) -> Dict[str, CameraInfo]:
+    def _detect_current_cameras(self, now: Optional[datetime] = None) -> Dict[str, CameraInfo]:
         """Detect currently connected cameras"""
         current_cameras = {}
         
         try:
             # Get supported devices from detector
-            supported_devices = self.detector.get_supported_devices(self.config.device_range)
+            supported_devices = self.detector.get_supported_devices(device_paths=self._candidate_devices())
             
             for device in supported_devices:
                 try:
-                    camera_info = self._create_camera_info(device)
+                    camera_info = self._create_camera_info(device, now)
                     if camera_info:
                         current_cameras[device] = camera_info
                         logger.debug(f"Detected camera: {device}")
                     
                 except Exception as e:
                     logger.error(f"Error detecting camera {device}: {e}")
-                    self.stats["detection_failures"] += 1
+                    self.stats.detection_failures += 1
+            
+            # Forget memoized info for devices that are gone
+            present = set(supported_devices)
+            for key in [key for key in self._info_cache if key[0] not in present]:
+                self._info_cache.pop(key, None)
             
         except Exception as e:
             logger.error(f"Error during camera detection: {e}")
-            self.stats["detection_failures"] += 1
+            self.stats.detection_failures += 1
         
         return current_cameras
     
-    def _create_camera_info(self, device: str) -> Optional[CameraInfo]:
+    @staticmethod
+    def _device_identity(device: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Identify the device node instance behind a video path
+        
+        Returns (device, st_ino, st_rdev) from a single stat. devtmpfs creates a
+        new inode whenever the node is re-created on re-plug, so a different
+        camera on the same path gets a new key.
+        """
+        try:
+            st = os.stat(device)
+        except OSError:
+            return None
+        return device, st.st_ino, st.st_rdev
+    
+    def _get_cached_info_capabilities(self, key: Optional[Tuple[str, int, int]]):
+        """Return (hit, capabilities) for a memoized device identity"""
+        if key is None:
+            return False, None
+        entry = self._info_cache.get(key)
+        if entry is None:
+            return False, None
+        cached_at, capabilities = entry
+        if time.monotonic() - cached_at > self.config.capability_cache_timeout:
+            self._info_cache.pop(key, None)
+            return False, None
+        return True, capabilities
+    
+    def _invalidate_info_cache(self, device: Optional[str] = None):
+        """Drop memoized camera info for one device, or for all devices"""
+        if device is None:
+            self._info_cache.clear()
+            return
+        for key in [key for key in self._info_cache if key[0] == device]:
+            self._info_cache.pop(key, None)
+    
+    def _create_camera_info(self, device: str, now: Optional[datetime] = None) -> Optional[CameraInfo]:
         """Create CameraInfo for a device"""
         try:
-            camera_info = CameraInfo(device=device, status=CameraStatus.CONNECTED)
+            camera_info = CameraInfo(device=device, status=CameraStatus.CONNECTED, last_seen=now)
 
             # Detect capabilities if enabled, off the main thread
             if self.config.enable_capability_detection:
-                # Submit detection to thread pool and wait for result
-                future = self.executor.submit(self.detector.detect_capabilities, device)
-                try:
-                    capabilities = future.result(timeout=self.config.detection_timeout + 1)
-                except Exception as e:
-                    logger.warning(f"Capability detection for {device} timed out or failed: {e}")
-                    capabilities = None
+                identity = self._device_identity(device)
+                hit, capabilities = self._get_cached_info_capabilities(identity)
+                
+                if not hit:
+                    # New node (or expired entry): the detector's own cache is
+                    # keyed by path only and may still hold the capabilities of
+                    # a previous camera on this path, so drop it first
+                    self.detector._invalidate_cache(device)
+                    
+                    # Submit detection to thread pool and wait for result
+                    future = self.executor.submit(self.detector.detect_capabilities, device)
+                    try:
+                        capabilities = future.result(timeout=self.config.detection_timeout + 1)
+                    except Exception as e:
+                        logger.warning(f"Capability detection for {device} timed out or failed: {e}")
+                        capabilities = None
+                    
+                    if capabilities and identity is not None:
+                        # Replace entries for earlier nodes on this path
+                        self._invalidate_info_cache(device)
+                        self._info_cache[identity] = (time.monotonic(), capabilities)
 
                 if capabilities:
                     camera_info.capabilities = capabilities
@@ -211,61 +430,147 @@ class CameraMonitor:
                 else:
                     logger.warning(f"Could not detect capabilities for {device}")
 
-            camera_info.mark_connected(camera_info.capabilities)
+            camera_info.mark_connected(camera_info.capabilities, now)
             return camera_info
 
         except Exception as e:
             logger.error(f"Error creating camera info for {device}: {e}")
             return None
     
-    def _process_camera_changes(self, current_cameras: Dict[str, CameraInfo]):
+    def _publish(self, cameras: Dict[str, CameraInfo]):
+        """Publish a new known_cameras dict and its read-only snapshot (call with _apply_lock held)"""
+        self.known_cameras = cameras
+        self._snapshot = MappingProxyType({
+            device: info.copy() for device, info in cameras.items()
+        })
+    
+    def _process_camera_changes(self, current_cameras: Dict[str, CameraInfo],
+                                now: Optional[datetime] = None):
         """Process camera connect/disconnect events"""
+        known = self.known_cameras
+        # Steady state: compare the key views in C without building any lists
+        if current_cameras.keys() == known.keys():
+            return
         
-        # Find newly connected cameras
-        for device, camera_info in current_cameras.items():
-            if device not in self.known_cameras:
-                # New camera connected
-                self.known_cameras[device] = camera_info
-                self._schedule_camera_event(camera_info, "connected")
-        
-        # Find disconnected cameras
-        disconnected_devices = []
-        for device in list(self.known_cameras.keys()):
-            if device not in current_cameras:
-                # Camera disconnected
-                camera_info = self.known_cameras[device]
-                camera_info.mark_disconnected()
+        # Key views support set operations directly; no intermediate lists
+        connected = current_cameras.keys() - known.keys()
+        disconnected = known.keys() - current_cameras.keys()
+        
+        cameras = dict(known)
+        
+        # Newly connected cameras
+        for device in connected:
+            camera_info = current_cameras[device]
+            cameras[device] = camera_info
+            self._schedule_camera_event(camera_info, "connected")
+        
+        # Disconnected cameras
+        for device in disconnected:
+            camera_info = cameras.pop(device, None)
+            if camera_info:
+                camera_info.mark_disconnected(now)
                 self._schedule_camera_event(camera_info, "disconnected")
-                disconnected_devices.append(device)
         
-        # Remove disconnected cameras after processing
-        for device in disconnected_devices:
-            del self.known_cameras[device]
+        self._publish(cameras)
     
     def _schedule_camera_event(self, camera_info: CameraInfo, event_type: str):
         """Schedule camera event callback using proper async integration"""
         try:
             # Update statistics
-            self.stats["total_events"] += 1
+            self.stats.total_events += 1
             if event_type == "connected":
-                self.stats["connect_events"] += 1
+                self.stats.connect_events += 1
                 logger.info(f"Camera connected: {camera_info.device} - {camera_info.resolution} @ {camera_info.fps}fps")
             elif event_type == "disconnected":
-                self.stats["disconnect_events"] += 1
+                self.stats.disconnect_events += 1
                 logger.info(f"Camera disconnected: {camera_info.device}")
             
             # Create event data
             event_data = camera_info.to_dict()
             
-            # Schedule callback in main event loop using call_soon_threadsafe
-            # THIS FIXES THE THREADING + ASYNCIO BUG!
-            self.loop.call_soon_threadsafe(
-                lambda: asyncio.create_task(self._execute_callback(event_data))
-            )
+            if self.config.event_debounce <= 0:
+                self._queue_event(event_data)
+                return
+            
+            # Keep only the latest event per device; (re)start its quiet timer
+            with self._events_lock:
+                self._debounced_events[camera_info.device] = event_data
+            self._call_on_loop(self._arm_debounce, camera_info.device)
             
         except Exception as e:
             logger.error(f"Error scheduling camera event: {e}")
-            self.stats["error_events"] += 1
+            self.stats.error_events += 1
+    
+    def _arm_debounce(self, device: str):
+        """Restart a device's quiet-period timer (runs on the loop)"""
+        handle = self._debounce_handles.get(device)
+        if handle is not None:
+            handle.cancel()
+        self._debounce_handles[device] = self.loop.call_later(
+            self.config.event_debounce, self._emit_debounced, device
+        )
+    
+    def _emit_debounced(self, device: str):
+        """Emit a device's final state once its events went quiet (runs on the loop)"""
+        self._debounce_handles.pop(device, None)
+        with self._events_lock:
+            event_data = self._debounced_events.pop(device, None)
+        if event_data is None:
+            return
+        
+        # A connect/disconnect flap that ends where it started is not worth announcing;
+        # devices never announced count as disconnected
+        status = event_data.get("status")
+        if self._delivered_status.get(device, CameraStatus.DISCONNECTED.value) == status:
+            logger.debug(f"Suppressed camera event for {device}: still {status}")
+            return
+        self._delivered_status[device] = status
+        self._queue_event(event_data)
+    
+    def _queue_event(self, event_data: Dict[str, Any]):
+        """Queue an event for the next batch flush; only the first event of a window wakes the loop"""
+        with self._events_lock:
+            self._pending_events.append(event_data)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        window = self.config.event_batch_window
+        if threading.get_ident() == self._loop_thread_ident:
+            self.loop.call_later(window, self._flush_events)
+        else:
+            self.loop.call_soon_threadsafe(self.loop.call_later, window, self._flush_events)
+    
+    def _flush_events(self):
+        """Hand the events collected during the batch window to one delivery task (runs on the loop)"""
+        with self._events_lock:
+            batch = self._pending_events
+            self._pending_events = []
+            self._flush_scheduled = False
+        
+        if batch:
+            self.loop.create_task(self._deliver_events(batch))
+    
+    async def _deliver_events(self, batch: List[Dict[str, Any]]):
+        """Deliver a batch of events as one list callback, or one callback per event"""
+        if not self.config.batch_events:
+            for event_data in batch:
+                await self._execute_callback(event_data)
+            return
+        
+        try:
+            await self.callback(batch)
+        except Exception as e:
+            logger.error(f"Error in camera event callback: {e}")
+            self.stats.error_events += 1
+    
+    async def _run_blocking(self, func: Callable, *args):
+        """Run a blocking call in the default executor without stalling the event loop"""
+        ctx = contextvars.copy_context()
+        if not len(ctx):
+            # No context variables to propagate: skip the ctx.run indirection
+            return await self.loop.run_in_executor(None, func, *args)
+        return await self.loop.run_in_executor(None, ctx.run, func, *args)
     
     async def _execute_callback(self, event_data: Dict[str, Any]):
         """Execute the camera event callback"""
@@ -273,7 +578,7 @@ class CameraMonitor:
             await self.callback(event_data)
         except Exception as e:
             logger.error(f"Error in camera event callback: {e}")
-            self.stats["error_events"] += 1
+            self.stats.error_events += 1
     
     async def _send_initial_status(self):
         """Send initial camera status on startup"""
@@ -282,72 +587,58 @@ class CameraMonitor:
         
         try:
             # Detect initial cameras
-            current_cameras = self._detect_current_cameras()
+            current_cameras = await self._run_blocking(self._detect_current_cameras)
             
-            with self.lock:
-                if current_cameras:
-                    # Send status for each detected camera
-                    for device, camera_info in current_cameras.items():
-                        self.known_cameras[device] = camera_info
-                        logger.info(f"Initial camera status: {device} - CONNECTED")
-                        await self.callback(camera_info.to_dict())
-                else:
+            async with self._apply_lock:
+                # The polling loop may already have published (and announced) some
+                # of these; only report cameras it has not seen yet
+                known = self.known_cameras
+                current_cameras = {
+                    device: info for device, info in current_cameras.items()
+                    if device not in known
+                }
+                
+                if not current_cameras and not known:
                     # Send disconnected status for video0 if no cameras found
                     camera_info = CameraInfo("/dev/video0", status=CameraStatus.DISCONNECTED)
                     camera_info.mark_disconnected()
-                    self.known_cameras["/dev/video0"] = camera_info
-                    logger.info("Initial camera status: /dev/video0 - DISCONNECTED")
-                    await self.callback(camera_info.to_dict())
+                    current_cameras = {"/dev/video0": camera_info}
+                
+                if current_cameras:
+                    cameras = dict(known)
+                    cameras.update(current_cameras)
+                    self._publish(cameras)
+            
+            for device, camera_info in current_cameras.items():
+                logger.info(f"Initial camera status: {device} - {camera_info.status.value}")
+                self._delivered_status[device] = camera_info.status.value
+            if current_cameras:
+                await self._deliver_events([info.to_dict() for info in current_cameras.values()])
         
         except Exception as e:
             logger.error(f"Error sending initial camera status: {e}")
     
     def get_current_cameras(self) -> Dict[str, CameraInfo]:
-        """Get current camera status (thread-safe)"""
-        with self.lock:
-            return {device: CameraInfo(
-                device=info.device,
-                status=info.status,
-                capabilities=info.capabilities,
-                connected_at=info.connected_at,
-                disconnected_at=info.disconnected_at,
-                last_seen=info.last_seen,
-                error_message=info.error_message,
-                metadata=info.metadata.copy()
-            ) for device, info in self.known_cameras.items()}
+        """Get current camera status (thread-safe, lock-free read of the published snapshot)"""
+        return dict(self._snapshot)
     
     def get_camera_by_device(self, device: str) -> Optional[CameraInfo]:
-        """Get specific camera info by device path"""
-        with self.lock:
-            camera_info = self.known_cameras.get(device)
-            if camera_info:
-                # Return a copy to avoid thread safety issues
-                return CameraInfo(
-                    device=camera_info.device,
-                    status=camera_info.status,
-                    capabilities=camera_info.capabilities,
-                    connected_at=camera_info.connected_at,
-                    disconnected_at=camera_info.disconnected_at,
-                    last_seen=camera_info.last_seen,
-                    error_message=camera_info.error_message,
-                    metadata=camera_info.metadata.copy()
-                )
-            return None
+        """Get specific camera info by device path (read-only snapshot entry)"""
+        return self._snapshot.get(device)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get monitoring statistics"""
-        stats = self.stats.copy()
+        stats = asdict(self.stats)
         
         if stats["monitoring_started"]:
-            uptime = datetime.now() - stats["monitoring_started"]
-            stats["uptime_seconds"] = uptime.total_seconds()
+            stats["uptime_seconds"] = time.monotonic() - self._started_monotonic
         
-        with self.lock:
-            stats["current_cameras"] = len(self.known_cameras)
-            stats["connected_cameras"] = len([
-                c for c in self.known_cameras.values() 
-                if c.status == CameraStatus.CONNECTED
-            ])
+        snapshot = self._snapshot
+        stats["current_cameras"] = len(snapshot)
+        stats["connected_cameras"] = len([
+            c for c in snapshot.values() 
+            if c.status == CameraStatus.CONNECTED
+        ])
         
         return stats
     
@@ -359,12 +650,16 @@ class CameraMonitor:
         else:
             logger.info("Refreshing all camera capabilities")
             self.detector.clear_cache()
+        self._invalidate_info_cache(device)
 
 class EventDrivenCameraMonitor(CameraMonitor):
     """
     Event-driven camera monitor using pyudev (Linux only)
     
     Provides instant response to device changes without polling overhead.
+    The udev netlink socket is watched with loop.add_reader, so no thread is
+    needed to wait for events. Bursts are applied (in the executor) once the
+    socket has been quiet for event_settle_time.
     Falls back to polling if pyudev is not available.
     """
     
@@ -372,6 +667,11 @@ class EventDrivenCameraMonitor(CameraMonitor):
                  config: Optional[MonitorConfig] = None):
         super().__init__(callback, loop, config)
         
+        # udev event state, only touched on the loop thread
+        self._pending: Dict[str, str] = {}
+        self._settle_handle: Optional[asyncio.TimerHandle] = None
+        self._retries: Dict[str, asyncio.TimerHandle] = {}  # adds whose node was not ready yet
+        
         # Try to import pyudev
         try:
             import pyudev
@@ -386,101 +686,180 @@ class EventDrivenCameraMonitor(CameraMonitor):
             self.event_driven = False
             logger.warning("pyudev not available, falling back to polling")
     
-    def _monitor_loop(self):
-        """Event-driven monitoring loop"""
+    def _start_on_loop(self):
+        """Watch the udev socket from the loop (runs on the loop)"""
         if not self.event_driven:
             # Fall back to polling
-            super()._monitor_loop()
+            super()._start_on_loop()
             return
         
-        logger.info("Event-driven camera monitoring loop started")
+        # Initial status is sent once by start_monitoring(); the reader only
+        # delivers udev events, so an idle monitor never wakes up
+        self.monitor.start()
+        self.loop.add_reader(self.monitor.fileno(), self._on_udev_readable)
+        logger.info("Event-driven camera monitoring started")
+    
+    def _stop_on_loop(self):
+        """Stop watching the udev socket and drop queued work (runs on the loop)"""
+        if not self.event_driven:
+            super()._stop_on_loop()
+            return
         
+        self.loop.remove_reader(self.monitor.fileno())
+        if self._settle_handle is not None:
+            self._settle_handle.cancel()
+            self._settle_handle = None
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        self._pending.clear()
+        self._cancel_debounce()
+        logger.info("Event-driven camera monitoring stopped")
+    
+    def _on_udev_readable(self):
+        """Drain queued udev events and restart the settle timer (runs on the loop)"""
         try:
-            # Send initial status
-            self.loop.call_soon_threadsafe(
-                lambda: asyncio.create_task(self._detect_and_process_initial_cameras())
-            )
-            
-            # Start monitoring events
-            self.monitor.start()
-            
-            while self.monitoring:
-                # Poll for device events with timeout
-                device = self.monitor.poll(timeout=1.0)
-                
-                if device is None:
-                    continue  # Timeout, check if still monitoring
-                
-                action = device.action
-                device_path = device.device_node
-                
-                if not device_path or not device_path.startswith('/dev/video'):
+            for device in iter(lambda: self.monitor.poll(timeout=0), None):
+                event = self._udev_event(device)
+                if event is None:
                     continue
-                
-                logger.debug(f"Device event: {action} {device_path}")
-                
-                if action == 'add':
-                    self._handle_device_added(device_path)
-                elif action == 'remove':
-                    self._handle_device_removed(device_path)
-                    
+                action, device_path = event
+                self._pending[device_path] = action
+                retry = self._retries.pop(device_path, None)
+                if retry is not None:
+                    retry.cancel()  # Superseded by the newer event
         except Exception as e:
-            logger.error(f"Error in event-driven monitoring loop: {e}")
-        finally:
-            if hasattr(self, 'monitor'):
-                self.monitor.remove_filter()
+            logger.error(f"Error reading udev events: {e}")
+            self.stats.error_events += 1
         
-        logger.info("Event-driven camera monitoring loop stopped")
+        if self._pending:
+            # Apply the burst once the socket has been quiet for event_settle_time
+            if self._settle_handle is not None:
+                self._settle_handle.cancel()
+            self._settle_handle = self.loop.call_later(
+                self.config.event_settle_time, self._apply_pending
+            )
+    
+    def _apply_pending(self):
+        """Hand the settled burst to the executor (runs on the loop)"""
+        self._settle_handle = None
+        pending, self._pending = self._pending, {}
+        self._spawn(self._apply_pending_async(pending))
     
-    def _handle_device_added(self, device_path: str):
-        """Handle camera device addition"""
-        # Small delay to allow device to initialize  
-        time.sleep(0.1)
+    async def _apply_pending_async(self, pending: Dict[str, str]):
+        """Apply a burst off the loop and schedule retries for adds that were not ready"""
+        async with self._apply_lock:
+            not_ready = await self._run_blocking(self._process_pending_events, pending)
+        for device_path in not_ready:
+            self._schedule_add_retry(device_path, 0)
+    
+    def _candidate_devices(self) -> Optional[Collection[str]]:
+        """Initial enumeration from the udev database: only nodes udev has finished setting up"""
+        if not self.event_driven:
+            return super()._candidate_devices()
+        
+        try:
+            nodes = {
+                sys.intern(device.device_node)
+                for device in self.context.list_devices(subsystem='video4linux')
+                if device.device_node and device.device_node.startswith('/dev/video')
+            }
+        except Exception as e:
+            logger.warning(f"Could not enumerate video4linux devices from udev: {e}")
+            return super()._candidate_devices()
+        
+        allowed = self.config.device_paths
+        if allowed is not None:
+            nodes.intersection_update(allowed)
+        return nodes
+    
+    def _udev_event(self, device) -> Optional[Tuple[str, str]]:
+        """Return (action, device_path) for add/remove events on video nodes"""
+        device_path = device.device_node
+        if not device_path or not device_path.startswith('/dev/video'):
+            return None
+        
+        action = device.action
+        if action in ('add', 'remove'):
+            logger.debug(f"Device event: {action} {device_path}")
+            return action, device_path
+        return None
+    
+    def _process_pending_events(self, pending: Dict[str, str]) -> List[str]:
+        """Apply the net effect of a burst of udev events, returning adds that were not ready"""
+        not_ready = []
+        for device_path, action in pending.items():
+            if action == 'add':
+                if not self._handle_device_added(device_path):
+                    not_ready.append(device_path)
+            elif action == 'remove':
+                self._handle_device_removed(device_path)
+        return not_ready
+    
+    def _schedule_add_retry(self, device_path: str, attempt: int):
+        """Re-queue a device add with exponential backoff (runs on the loop)"""
+        if not self.monitoring:
+            return
+        delay = self.config.add_retry_delay * (2 ** attempt)
+        self._retries[device_path] = self.loop.call_later(
+            delay, self._retry_add, device_path, attempt
+        )
+    
+    def _retry_add(self, device_path: str, attempt: int):
+        """Backoff deadline reached for a device add (runs on the loop)"""
+        self._retries.pop(device_path, None)
+        self._spawn(self._retry_add_async(device_path, attempt))
+    
+    async def _retry_add_async(self, device_path: str, attempt: int):
+        """Retry a device add off the loop, backing off again if still not ready"""
+        final = attempt + 1 >= self.config.add_retry_attempts
+        async with self._apply_lock:
+            added = await self._run_blocking(self._handle_device_added, device_path, final)
+        if not added:
+            self._schedule_add_retry(device_path, attempt + 1)
+    
+    def _handle_device_added(self, device_path: str, final: bool = False) -> bool:
+        """
+        Handle camera device addition
+        
+        Returns False if the node is not ready yet (udev has not applied
+        permissions, or the driver does not answer capability queries) so the
+        caller can retry with backoff. With final=True the camera is recorded
+        with whatever could be detected.
+        """
+        if not final and not os.access(device_path, os.R_OK):
+            return False
         
         try:
             camera_info = self._create_camera_info(device_path)
-            if camera_info:
-                with self.lock:
-                    self.known_cameras[device_path] = camera_info
-                    self._schedule_camera_event(camera_info, "connected")
+            if camera_info is None:
+                return final
+            if (not final and self.config.enable_capability_detection
+                    and camera_info.capabilities is None):
+                return False
+            cameras = dict(self.known_cameras)
+            cameras[device_path] = camera_info
+            self._publish(cameras)
+            self._schedule_camera_event(camera_info, "connected")
+            return True
         except Exception as e:
             logger.error(f"Error handling device addition {device_path}: {e}")
+            return final
     
     def _handle_device_removed(self, device_path: str):
         """Handle camera device removal"""
+        self._invalidate_info_cache(device_path)
         try:
-            with self.lock:
-                if device_path in self.known_cameras:
-                    camera_info = self.known_cameras[device_path]
-                    camera_info.mark_disconnected()
-                    self._schedule_camera_event(camera_info, "disconnected")
-                    del self.known_cameras[device_path]
+            if device_path not in self.known_cameras:
+                return
+            cameras = dict(self.known_cameras)
+            camera_info = cameras.pop(device_path, None)
+            if camera_info:
+                camera_info.mark_disconnected()
+                self._schedule_camera_event(camera_info, "disconnected")
+                self._publish(cameras)
         except Exception as e:
             logger.error(f"Error handling device removal {device_path}: {e}")
-    
-    async def _detect_and_process_initial_cameras(self):
-        """Detect and process initial cameras for event-driven monitoring"""
-        await asyncio.sleep(0.1)  # Small delay
-        
-        try:
-            current_cameras = self._detect_current_cameras()
-            
-            with self.lock:
-                for device, camera_info in current_cameras.items():
-                    self.known_cameras[device] = camera_info
-                    logger.info(f"Initial camera status: {device} - CONNECTED")
-                    await self.callback(camera_info.to_dict())
-                
-                # If no cameras found, send default disconnected status
-                if not current_cameras:
-                    camera_info = CameraInfo("/dev/video0", status=CameraStatus.DISCONNECTED)
-                    camera_info.mark_disconnected()
-                    self.known_cameras["/dev/video0"] = camera_info
-                    logger.info("Initial camera status: /dev/video0 - DISCONNECTED")
-                    await self.callback(camera_info.to_dict())
-        
-        except Exception as e:
-            logger.error(f"Error detecting initial cameras: {e}")
 
 # Convenience functions for integration with existing code
 async def get_current_cameras() -> Dict[str, CameraInfo]:
@@ -497,7 +876,7 @@ async def get_camera_status_by_device(device: str) -> Dict[str, Any]:
             "device": device,
             "status": "UNKNOWN",
             "message": "Device not found in registry",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
 def create_camera_monitor(callback: Callable, loop: asyncio.AbstractEventLoop, 
@@ -519,6 +898,8 @@ def create_camera_monitor(callback: Callable, loop: asyncio.AbstractEventLoop,
         try:
             return EventDrivenCameraMonitor(callback, loop, config)
         except Exception as e:
-            logger.warning(f"Failed to create event-driven monitor: {e}")
+            logger.warning(f"Failed to create event-driven monitor, falling back to polling: {e}")
     
-    return CameraMonitor(callback, loop, config)
\ No newline at end of file
+    monitor = CameraMonitor(callback, loop, config)
+    monitor._from_factory = True
+    return monitor
\ No newline at end of file
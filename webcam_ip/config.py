@@ -1,27 +1,29 @@
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     host: str = "0.0.0.0" 
     port: int = 8002
     websocket_path: str = "/ws"
 
-@dataclass  
+@dataclass(frozen=True, slots=True)
 class CameraConfig:
     poll_interval: float = 0.1
     detection_timeout: float = 2.0
     devices_range: range = range(10)  # /dev/video0-9
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     level: str = "INFO"
     log_dir: Path = Path("/opt/webcam-env/logs")
     file_enabled: bool = True
 
+@functools.cache
 def load_config() -> tuple[ServerConfig, CameraConfig, LoggingConfig]:
-    """Load configuration from environment variables and config files"""
+    """Load configuration from environment variables and config files (parsed once, then cached)"""
     return (
         ServerConfig(
             host=os.getenv("WEBSOCKET_HOST", "0.0.0.0"),
@@ -34,4 +36,10 @@ def load_config() -> tuple[ServerConfig, CameraConfig, LoggingConfig]:
             level=os.getenv("LOG_LEVEL", "INFO"),
             log_dir=Path(os.getenv("LOG_DIR", "/opt/webcam-env/logs")),
         )
-    )
\ No newline at end of file
+    )
+
+
+def reload_config() -> tuple[ServerConfig, CameraConfig, LoggingConfig]:
+    """Re-read the environment, e.g. after tests change variables"""
+    load_config.cache_clear()
+    return load_config()
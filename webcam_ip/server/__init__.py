@@ -5,13 +5,15 @@ This module provides a WebSocket server with JSON-RPC 2.0 support
 and real-time USB camera monitoring capabilities.
 """
 
-from .websocket_server import WebSocketJSONRPCServer
+from .websocket_server import WebSocketJSONRPCServer, create_server, run_server
 from .jsonrpc_handler import JSONRPCHandler, JSONRPCError
 from .methods import ping, get_server_info
 
 __version__ = "1.0.0"
 __all__ = [
     "WebSocketJSONRPCServer",
+    "create_server",
+    "run_server",
     "JSONRPCHandler", 
     "JSONRPCError",
     "ping",
@@ -9,11 +9,56 @@ import json
 import logging
 import inspect
 import asyncio
-from typing import Dict, Any, Optional, Callable, Union
+import dataclasses
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple, Union
 from dataclasses import dataclass
 
+def _json_default(obj: Any) -> Any:
+    """Encode the non-JSON types method results carry (both encoders share this)"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson is optional: encodes several times faster than the stdlib codec and
+# handles dataclasses, datetimes and enums natively.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception.
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        # Decoded to str so WebSocket messages stay text frames
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def _dumpb(obj: Any) -> bytes:
+        # UTF-8 bytes straight from the encoder, for messages sent as-is
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        # Compact separators and the same type handling as the orjson path
+        return json.dumps(obj, default=_json_default, separators=(',', ':'))
+    
+    def _dumpb(obj: Any) -> bytes:
+        return _dumps(obj).encode()
+    
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+def _no_params(params: Any) -> bool:
+    """True for omitted/null params or an empty array/object (0, "" and false are invalid, not empty)"""
+    return params is None or (type(params) in (dict, list) and not params)
+
 @dataclass
 class JSONRPCError:
     """Standard JSON-RPC 2.0 error codes and messages"""
@@ -23,6 +68,20 @@ class JSONRPCError:
     INVALID_PARAMS = (-32602, "Invalid params")
     INTERNAL_ERROR = (-32603, "Internal error")
 
+def _error_payload(request_id: Any, code: int, message: str) -> Dict:
+    return {
+        "jsonrpc": "2.0", 
+        "error": {"code": code, "message": message},
+        "id": request_id
+    }
+
+# Errors answered with "id": null are constant; serialize them once
+_NULL_ID_ERRORS = {
+    error: _dumps(_error_payload(None, *error))
+    for error in (JSONRPCError.PARSE_ERROR, JSONRPCError.INVALID_REQUEST,
+                  JSONRPCError.INTERNAL_ERROR)
+}
+
 class JSONRPCHandler:
     """
     Streamlined JSON-RPC 2.0 handler without external dependencies
@@ -38,36 +97,76 @@ class JSONRPCHandler:
     
     def __init__(self):
         self.methods: Dict[str, Callable] = {}
+        # name -> (func, is_async, run_in_thread), resolved once at registration
+        self._dispatch: Dict[str, Tuple[Callable, bool, bool]] = {}
         self._request_id_counter = 0
+        # Encoded JSON for short string results (e.g. "pong"), see _encode_response
+        self._str_fragments: Dict[str, str] = {}
+        # Constant results declared via func.precomputed_result: name -> value,
+        # and name -> encoded JSON so the response skips the encoder
+        self._precomputed: Dict[str, Any] = {}
+        self._precomputed_json: Dict[str, str] = {}
     
-    def register_method(self, name: str, func: Callable):
-        """Register a method for JSON-RPC calls"""
-        self.methods[name] = func
+    def register_method(self, name: str, func: Callable, *, run_in_thread: bool = False):
+        """
+        Register a method for JSON-RPC calls
+        
+        Sync methods are called inline on the event loop, which is cheapest for
+        quick methods. Pass run_in_thread=True for sync methods that block
+        (I/O, subprocesses) so they run in the default executor instead.
+        
+        A function with a precomputed_result attribute always returns that
+        value; parameterless calls are answered from it without calling the
+        function, and its JSON encoding is built once here.
+        """
+        self._add_method(name, func, run_in_thread)
         logger.debug(f"Registered JSON-RPC method: {name}")
     
-    def method(self, name: Optional[str] = None):
+    def register_methods(self, methods: Iterable[Tuple[str, Callable]], *, run_in_thread: bool = False):
+        """
+        Register a table of (name, function) pairs in one call
+        
+        Same per-method handling as register_method, with a single log line
+        for the whole table instead of one per method.
+        """
+        names = []
+        for name, func in methods:
+            self._add_method(name, func, run_in_thread)
+            names.append(name)
+        logger.debug("Registered JSON-RPC methods: %s", names)
+    
+    def _add_method(self, name: str, func: Callable, run_in_thread: bool):
+        self.methods[name] = func
+        self._dispatch[name] = (func, inspect.iscoroutinefunction(func), run_in_thread)
+        self._drop_precomputed(name)
+        if hasattr(func, "precomputed_result"):
+            result = func.precomputed_result
+            self._precomputed[name] = result
+            self._precomputed_json[name] = _dumps(result)
+    
+    def method(self, name: Optional[str] = None, *, run_in_thread: bool = False):
         """Decorator to register methods"""
         def decorator(func: Callable):
             method_name = name or func.__name__
-            self.register_method(method_name, func)
+            self.register_method(method_name, func, run_in_thread=run_in_thread)
             return func
         return decorator
     
-    async def handle_request(self, message: str) -> Optional[str]:
+    async def handle_request(self, message: Union[str, bytes]) -> Optional[str]:
         """
         Handle a JSON-RPC request and return response as string
         
         Args:
-            message: JSON-RPC request string
+            message: JSON-RPC request (text or raw UTF-8 bytes)
             
         Returns:
             JSON-RPC response string, or None for notifications
         """
-        logger.debug(f"Handling JSON-RPC request: {message}")
+        logger.debug("Handling JSON-RPC request: %s", message)
         
         try:
-            request = json.loads(message)
-        except json.JSONDecodeError as e:
+            request = _loads(message)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             logger.error(f"JSON parse error: {e}")
             return self._create_error_response(None, *JSONRPCError.PARSE_ERROR)
         
@@ -83,17 +182,23 @@ class JSONRPCHandler:
                     responses.append(response)
             
             # Return batch response or None if all were notifications
-            return json.dumps(responses) if responses else None
+            return _dumps(responses) if responses else None
+        
+        # Constant-result calls (ping) are answered without dispatching at all
+        if type(request) is dict:
+            fast = self._precomputed_response(request)
+            if fast is not None:
+                return fast
         
         # Handle single request
         response = await self._handle_single_request(request)
-        return json.dumps(response) if response else None
+        return self._encode_response(response) if response else None
     
     async def _handle_single_request(self, request: Any) -> Optional[Dict]:
         """Handle a single JSON-RPC request"""
         # Validate request format
         if not isinstance(request, dict):
-            return self._create_error_response(None, *JSONRPCError.INVALID_REQUEST)
+            return self._create_error_dict(None, *JSONRPCError.INVALID_REQUEST)
         
         jsonrpc = request.get("jsonrpc")
         method_name = request.get("method") 
@@ -102,35 +207,39 @@ class JSONRPCHandler:
         
         # Validate JSON-RPC 2.0 format
         if jsonrpc != "2.0":
-            return self._create_error_response(request_id, *JSONRPCError.INVALID_REQUEST)
+            return self._create_error_dict(request_id, *JSONRPCError.INVALID_REQUEST)
         
         if not isinstance(method_name, str):
-            return self._create_error_response(request_id, *JSONRPCError.INVALID_REQUEST)
+            return self._create_error_dict(request_id, *JSONRPCError.INVALID_REQUEST)
         
         # Check if it's a notification (no id field)
         is_notification = "id" not in request
         
-        logger.debug(f"Processing method: {method_name}, params: {params}, notification: {is_notification}")
+        logger.debug("Processing method: %s, params: %s, notification: %s", method_name, params, is_notification)
         
         # Find and call method
-        if method_name not in self.methods:
+        if method_name not in self._dispatch:
             logger.warning(f"Method not found: {method_name}")
             if is_notification:
                 return None  # Don't respond to notification errors
-            return self._create_error_response(request_id, *JSONRPCError.METHOD_NOT_FOUND)
+            return self._create_error_dict(request_id, *JSONRPCError.METHOD_NOT_FOUND)
+        
+        # Constant result: answer without calling the method
+        if method_name in self._precomputed and _no_params(params):
+            if is_notification:
+                return None
+            return self._create_success_response(request_id, self._precomputed[method_name])
         
         try:
-            method = self.methods[method_name]
-            
             # Call method with appropriate parameters
-            result = await self._call_method_with_params(method, params)
+            result = await self._call_method_with_params(method_name, params)
             
             # Don't respond to notifications
             if is_notification:
-                logger.debug(f"Notification {method_name} processed successfully")
+                logger.debug("Notification %s processed successfully", method_name)
                 return None
             
-            logger.debug(f"Method {method_name} returned: {result}")
+            logger.debug("Method %s returned: %s", method_name, result)
             return self._create_success_response(request_id, result)
             
         except TypeError as e:
@@ -138,28 +247,28 @@ class JSONRPCHandler:
             logger.error(f"Invalid parameters for {method_name}: {e}")
             if is_notification:
                 return None
-            return self._create_error_response(request_id, *JSONRPCError.INVALID_PARAMS)
+            return self._create_error_dict(request_id, *JSONRPCError.INVALID_PARAMS)
             
         except Exception as e:
             # Internal error
             logger.error(f"Error calling {method_name}: {e}", exc_info=True)
             if is_notification:
                 return None
-            return self._create_error_response(request_id, *JSONRPCError.INTERNAL_ERROR)
+            return self._create_error_dict(request_id, *JSONRPCError.INTERNAL_ERROR)
     
-    async def _call_method_with_params(self, method: Callable, params: Any):
-        """Call a method with proper parameter handling"""
+    async def _call_method_with_params(self, method_name: str, params: Any):
+        """Call a registered method with proper parameter handling"""
         try:
             # Handle different parameter formats
             if isinstance(params, dict):
                 # Named parameters
-                result = await self._call_method(method, **params)
+                result = await self._call_method(method_name, **params)
             elif isinstance(params, list):
                 # Positional parameters
-                result = await self._call_method(method, *params)
+                result = await self._call_method(method_name, *params)
             elif params is None:
                 # No parameters
-                result = await self._call_method(method)
+                result = await self._call_method(method_name)
             else:
                 # Invalid parameter format
                 raise TypeError(f"Invalid parameter type: {type(params)}")
@@ -173,25 +282,35 @@ class JSONRPCHandler:
             # Wrap other exceptions as internal errors
             raise RuntimeError(f"Method execution failed: {e}") from e
     
-    async def _call_method(self, method: Callable, *args, **kwargs):
-        """Call a method, handling both sync and async functions"""
-        if inspect.iscoroutinefunction(method):
+    async def _call_method(self, method_name: str, *args, **kwargs):
+        """Call a registered method, handling both sync and async functions"""
+        method, is_async, run_in_thread = self._dispatch[method_name]
+        if is_async:
             return await method(*args, **kwargs)
-        else:
-            # Run sync function in thread pool to avoid blocking event loop
-            loop = asyncio.get_event_loop()
+        if run_in_thread:
+            # Blocking sync function: run in thread pool to avoid stalling the event loop
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(None, lambda: method(*args, **kwargs))
+        # Quick sync function: a thread hop would cost more than the call itself
+        return method(*args, **kwargs)
     
     def create_notification(self, method: str, params: Any = None) -> str:
         """Create a JSON-RPC notification (no response expected)"""
+        return _dumps(self._notification(method, params))
+    
+    def encode_notification(self, method: str, params: Any = None) -> bytes:
+        """Create a JSON-RPC notification as UTF-8 bytes, ready to broadcast"""
+        return _dumpb(self._notification(method, params))
+    
+    @staticmethod
+    def _notification(method: str, params: Any) -> Dict[str, Any]:
         notification = {
             "jsonrpc": "2.0",
             "method": method
         }
         if params is not None:
             notification["params"] = params
-        
-        return json.dumps(notification)
+        return notification
     
     def create_request(self, method: str, params: Any = None, request_id: Optional[int] = None) -> str:
         """Create a JSON-RPC request"""
@@ -207,7 +326,63 @@ class JSONRPCHandler:
         if params is not None:
             request["params"] = params
         
-        return json.dumps(request)
+        return _dumps(request)
+    
+    # Results encoded directly into the response template
+    STR_FRAGMENT_CACHE_SIZE = 64
+    STR_FRAGMENT_MAX_LENGTH = 64
+    
+    def _encode_response(self, response: Dict) -> str:
+        """
+        Serialize a single response
+        
+        Success responses with an integer id and a scalar result (health
+        checks) are filled into a fixed template instead of going through
+        the generic encoder; everything else is encoded as usual.
+        Precomputed results are templated earlier, in _precomputed_response.
+        """
+        request_id = response["id"]
+        if "result" not in response or type(request_id) is not int:
+            return _dumps(response)
+        
+        fragment = self._scalar_fragment(response["result"])
+        if fragment is None:
+            return _dumps(response)
+        return f'{{"jsonrpc":"2.0","result":{fragment},"id":{request_id}}}'
+    
+    def _precomputed_response(self, request: Dict) -> Optional[str]:
+        """
+        Encoded reply for a well-formed, parameterless call with an integer id
+        to a method with a precomputed result; None sends the request down
+        the normal dispatch path
+        """
+        request_id = request.get("id")
+        method_name = request.get("method")
+        if type(request_id) is not int or type(method_name) is not str or not _no_params(request.get("params")):
+            return None
+        fragment = self._precomputed_json.get(method_name)
+        if fragment is None or request.get("jsonrpc") != "2.0":
+            return None
+        return f'{{"jsonrpc":"2.0","result":{fragment},"id":{request_id}}}'
+    
+    def _scalar_fragment(self, result: Any) -> Optional[str]:
+        """JSON text for a str/int/bool/None result, None for anything else"""
+        kind = type(result)
+        if kind is str:
+            fragment = self._str_fragments.get(result)
+            if fragment is None:
+                fragment = _dumps(result)
+                if (len(result) <= self.STR_FRAGMENT_MAX_LENGTH
+                        and len(self._str_fragments) < self.STR_FRAGMENT_CACHE_SIZE):
+                    self._str_fragments[result] = fragment
+            return fragment
+        if kind is int:
+            return str(result)
+        if kind is bool:
+            return "true" if result else "false"
+        if result is None:
+            return "null"
+        return None
     
     @staticmethod
     def _create_success_response(request_id: Any, result: Any) -> Dict:
@@ -218,15 +393,24 @@ class JSONRPCHandler:
             "id": request_id
         }
     
+    @staticmethod
+    def _create_error_dict(request_id: Any, code: int, message: str) -> Dict:
+        """Create a JSON-RPC error response (for embedding in a single or batch reply)"""
+        return _error_payload(request_id, code, message)
+    
     @staticmethod  
     def _create_error_response(request_id: Any, code: int, message: str) -> str:
         """Create a JSON-RPC error response as JSON string"""
-        error_response = {
-            "jsonrpc": "2.0", 
-            "error": {"code": code, "message": message},
-            "id": request_id
-        }
-        return json.dumps(error_response)
+        if request_id is None:
+            cached = _NULL_ID_ERRORS.get((code, message))
+            if cached is not None:
+                return cached
+        return _dumps(_error_payload(request_id, code, message))
+    
+    def _drop_precomputed(self, method_name: str):
+        """Forget a method's precomputed result, if it had one"""
+        self._precomputed.pop(method_name, None)
+        self._precomputed_json.pop(method_name, None)
     
     def get_method_list(self) -> list:
         """Get list of registered methods"""
@@ -240,6 +424,8 @@ class JSONRPCHandler:
         """Unregister a method"""
         if method_name in self.methods:
             del self.methods[method_name]
+            del self._dispatch[method_name]
+            self._drop_precomputed(method_name)
             logger.debug(f"Unregistered JSON-RPC method: {method_name}")
             return True
         return False
\ No newline at end of file
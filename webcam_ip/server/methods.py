@@ -5,20 +5,145 @@ Contains all the RPC methods that can be called by clients.
 Methods should be simple, focused, and well-documented.
 """
 
+import copy
 import time
 import logging
 import platform
+import re
 import psutil
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 import subprocess
-import uuid
+import os
+import shutil
 from pathlib import Path
 import asyncio
-import json
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakValueDictionary
+
+from ..utils.clock import now_iso
+from .jsonrpc_handler import _dumpb
+from .snapshot_stream import SnapshotStream
+
+# Camera monitor lookups; resolved once here rather than imported per call
+try:
+    from ..camera.monitor import get_current_cameras, get_camera_status_by_device
+    from ..camera.models import camera_registry
+    _MONITOR_AVAILABLE = True
+except ImportError:
+    _MONITOR_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Server and platform details are fixed for the life of the process; collect
+# them once at import instead of on every get_server_info call
+SERVER_NAME = "WebSocket JSON-RPC Camera Server"
+SERVER_VERSION = "1.0.0"
+
+_SYSTEM_INFO = {
+    "platform": platform.system(),
+    "platform_version": platform.version(),
+    "architecture": platform.machine(),
+    "python_version": platform.python_version(),
+    "hostname": platform.node(),
+}
+
+# Valid camera device paths: /dev/videoN and nothing else (no traversal, no
+# suffixes). ASCII digits only: \d would also accept other Unicode digits
+_DEVICE_PATH_RE = re.compile(r'/dev/video[0-9]{1,3}')
+# Recording resolutions as WIDTHxHEIGHT
+_RESOLUTION_RE = re.compile(r'([0-9]{2,5})x([0-9]{2,5})')
+
+def _is_valid_device(device: Any) -> bool:
+    """Check a client-supplied camera device path"""
+    return isinstance(device, str) and _DEVICE_PATH_RE.fullmatch(device) is not None
+
+# Resource usage is sampled by a background task instead of per request
+STATS_REFRESH_INTERVAL = 2.0  # seconds between resource samples
+
+_resource_stats: Optional[Dict[str, Any]] = None
+_stats_task: Optional[asyncio.Task] = None
+
+_MB = 1 / (1024 * 1024)
+_GB = 1 / (1024 * 1024 * 1024)
+
+# Memory and disk totals do not change while running; rounded once on first sample
+_totals: Optional[Tuple[float, float]] = None  # (memory_total_mb, disk_total_gb)
+
+def _collect_resource_stats() -> Dict[str, Any]:
+    """Sample CPU, memory and disk usage (CPU is measured since the previous sample)"""
+    global _totals
+    try:
+        cpu_percent = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+    except Exception as e:
+        logger.warning(f"Could not get system info: {e}")
+        cpu_percent = 0
+        memory = None
+        disk = None
+    
+    if memory is None or disk is None:
+        return {
+            "cpu_percent": cpu_percent,
+            "memory_total_mb": None,
+            "memory_used_mb": None,
+            "memory_percent": None,
+            "disk_total_gb": None,
+            "disk_used_gb": None,
+            "disk_percent": None,
+        }
+    
+    if _totals is None:
+        _totals = (round(memory.total * _MB, 2), round(disk.total * _GB, 2))
+    memory_total_mb, disk_total_gb = _totals
+    
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_total_mb": memory_total_mb,
+        "memory_used_mb": round(memory.used * _MB, 2),
+        "memory_percent": memory.percent,
+        "disk_total_gb": disk_total_gb,
+        "disk_used_gb": round(disk.used * _GB, 2),
+        "disk_percent": round((disk.used / disk.total) * 100, 2),
+    }
+
+async def _sample_resource_stats() -> Dict[str, Any]:
+    """Take a resource sample in the default executor; the psutil calls are syscalls
+    that can stall under I/O pressure (disk_usage in particular)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _collect_resource_stats)
+
+async def _refresh_stats_loop():
+    """Refresh the cached resource sample every STATS_REFRESH_INTERVAL seconds"""
+    global _resource_stats
+    while True:
+        await asyncio.sleep(STATS_REFRESH_INTERVAL)
+        _resource_stats = await _sample_resource_stats()
+
+def _ensure_stats_refresher():
+    """Start the resource sampling task on the running loop if it is not running"""
+    global _stats_task
+    if _stats_task is None or _stats_task.done():
+        _stats_task = asyncio.get_running_loop().create_task(_refresh_stats_loop())
+
+async def stop_stats_refresher():
+    """Cancel the resource sampling task and wait for it to finish (server shutdown)"""
+    global _stats_task
+    task, _stats_task = _stats_task, None
+    if task is None or task.done():
+        return
+    task.cancel()
+    # The task's own CancelledError comes back as a value; cancelling this
+    # coroutine still propagates
+    await asyncio.gather(task, return_exceptions=True)
+
+# First cpu_percent(None) call only sets the baseline; later calls measure from it
+try:
+    psutil.cpu_percent(interval=None)
+except Exception:
+    pass
+
 # ============================================================================
 # Core Methods
 # ============================================================================
@@ -36,9 +161,12 @@ async def ping() -> str:
         Request:  {"jsonrpc": "2.0", "method": "ping", "id": 1}
         Response: {"jsonrpc": "2.0", "result": "pong", "id": 1}
     """
-    logger.info("Ping method called")
+    logger.debug("Ping method called")
     return "pong"
 
+# Constant result: the JSON-RPC handler answers ping without calling it
+ping.precomputed_result = "pong"
+
 async def get_server_info() -> Dict[str, Any]:
     """
     Get comprehensive server information
@@ -53,43 +181,24 @@ async def get_server_info() -> Dict[str, Any]:
         Request:  {"jsonrpc": "2.0", "method": "get_server_info", "id": 2}
         Response: {"jsonrpc": "2.0", "result": {...}, "id": 2}
     """
-    logger.info("Server info requested")
+    logger.debug("Server info requested")
     
-    # Get system information
-    try:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-    except Exception as e:
-        logger.warning(f"Could not get system info: {e}")
-        cpu_percent = 0
-        memory = None
-        disk = None
+    # Resource usage comes from the background sampler; no blocking CPU interval
+    global _resource_stats
+    _ensure_stats_refresher()
+    if _resource_stats is None:
+        _resource_stats = await _sample_resource_stats()
     
     server_info = {
         "server": {
-            "name": "WebSocket JSON-RPC Camera Server",
-            "version": "1.0.0",
+            "name": SERVER_NAME,
+            "version": SERVER_VERSION,
             "uptime_seconds": time.time() - getattr(get_server_info, '_start_time', time.time()),
-            "started_at": getattr(get_server_info, '_started_at', datetime.now().isoformat()),
-        },
-        "system": {
-            "platform": platform.system(),
-            "platform_version": platform.version(),
-            "architecture": platform.machine(),
-            "python_version": platform.python_version(),
-            "hostname": platform.node(),
+            "started_at": getattr(get_server_info, '_started_at', None) or now_iso(),
         },
-        "resources": {
-            "cpu_percent": cpu_percent,
-            "memory_total_mb": round(memory.total / 1024 / 1024, 2) if memory else None,
-            "memory_used_mb": round(memory.used / 1024 / 1024, 2) if memory else None,
-            "memory_percent": memory.percent if memory else None,
-            "disk_total_gb": round(disk.total / 1024 / 1024 / 1024, 2) if disk else None,
-            "disk_used_gb": round(disk.used / 1024 / 1024 / 1024, 2) if disk else None,
-            "disk_percent": round((disk.used / disk.total) * 100, 2) if disk else None,
-        },
-        "timestamp": datetime.now().isoformat()
+        "system": dict(_SYSTEM_INFO),
+        "resources": dict(_resource_stats),
+        "timestamp": now_iso()
     }
     
     return server_info
@@ -102,6 +211,15 @@ get_server_info._started_at = datetime.now().isoformat()
 # Camera Methods  
 # ============================================================================
 
+# get_camera_list payload, reused for polls within the TTL while the registry is unchanged
+CAMERA_LIST_CACHE_TTL = 2.0  # seconds
+_camera_list_cache: Optional[Tuple[float, int, Dict[str, Any]]] = None  # (monotonic time, registry generation, payload)
+
+def invalidate_camera_list_cache():
+    """Drop the cached get_camera_list payload (call on camera connect/disconnect)"""
+    global _camera_list_cache
+    _camera_list_cache = None
+
 async def get_camera_list() -> Dict[str, Any]:
     """
     Get list of currently connected cameras
@@ -116,41 +234,52 @@ async def get_camera_list() -> Dict[str, Any]:
         Request:  {"jsonrpc": "2.0", "method": "get_camera_list", "id": 3}
         Response: {"jsonrpc": "2.0", "result": {"cameras": [...], "total": 2}, "id": 3}
     """
-    logger.info("Camera list requested")
+    logger.debug("Camera list requested")
     
-    # This will be populated by the camera monitor
-    # For now, return a placeholder response
-    from ..camera.monitor import get_current_cameras
+    if not _MONITOR_AVAILABLE:
+        # Camera monitor not available, return empty list
+        logger.warning("Camera monitor not available, returning empty camera list")
+        return {
+            "cameras": [],
+            "total": 0,
+            "connected": 0,
+            "timestamp": now_iso()
+        }
+    
+    global _camera_list_cache
+    cached = _camera_list_cache
+    now = time.monotonic()
+    if (cached is not None and now - cached[0] < CAMERA_LIST_CACHE_TTL
+            and cached[1] == camera_registry.generation):
+        return {**cached[2], "timestamp": now_iso()}
     
     try:
+        generation = camera_registry.generation
         cameras = await get_current_cameras()
         
+        # One pass: build the entries and count connected cameras together
         camera_list = []
+        connected = 0
         for device, info in cameras.items():
+            is_connected = info.connected
+            connected += is_connected
             camera_list.append({
                 "device": device,
-                "status": "CONNECTED" if info.connected else "DISCONNECTED",
-                "resolution": info.resolution if info.connected else None,
-                "fps": info.fps if info.connected else None,
+                "status": "CONNECTED" if is_connected else "DISCONNECTED",
+                "resolution": info.resolution if is_connected else None,
+                "fps": info.fps if is_connected else None,
                 "capabilities": info.capabilities if hasattr(info, 'capabilities') else None
             })
         
-        return {
+        payload = {
             "cameras": camera_list,
             "total": len(camera_list),
-            "connected": len([c for c in camera_list if c["status"] == "CONNECTED"]),
-            "timestamp": datetime.now().isoformat()
+            "connected": connected,
+            "timestamp": now_iso()
         }
+        _camera_list_cache = (now, generation, payload)
+        return dict(payload)
         
-    except ImportError:
-        # Camera monitor not available yet, return empty list
-        logger.warning("Camera monitor not available, returning empty camera list")
-        return {
-            "cameras": [],
-            "total": 0,
-            "connected": 0,
-            "timestamp": datetime.now().isoformat()
-        }
     except Exception as e:
         logger.error(f"Error getting camera list: {e}")
         raise RuntimeError(f"Failed to get camera list: {e}")
@@ -169,32 +298,169 @@ async def get_camera_status(device: str) -> Dict[str, Any]:
         Request:  {"jsonrpc": "2.0", "method": "get_camera_status", "params": {"device": "/dev/video0"}, "id": 4}
         Response: {"jsonrpc": "2.0", "result": {...}, "id": 4}
     """
-    logger.info(f"Camera status requested for device: {device}")
+    logger.debug("Camera status requested for device: %s", device)
     
-    if not device or not device.startswith('/dev/video'):
+    if not _is_valid_device(device):
         raise ValueError(f"Invalid device path: {device}")
     
-    # This will be implemented with the camera monitor
-    try:
-        from ..camera.monitor import get_camera_status_by_device
-        status = await get_camera_status_by_device(device)
-        return status
-    except ImportError:
-        # Camera monitor not available yet
+    if not _MONITOR_AVAILABLE:
+        # Camera monitor not available
         return {
             "device": device,
             "status": "UNKNOWN",
             "message": "Camera monitoring not available",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
+    
+    try:
+        status = await get_camera_status_by_device(device)
+        return status
     except Exception as e:
         logger.error(f"Error getting camera status for {device}: {e}")
         raise RuntimeError(f"Failed to get camera status: {e}")
 
+async def get_camera_statuses(devices: List[str]) -> Dict[str, Any]:
+    """
+    Get detailed status for several camera devices in one call
+    
+    Saves a round trip per device compared to calling get_camera_status
+    repeatedly. A device whose lookup fails is reported with status ERROR
+    instead of failing the whole batch.
+    
+    Args:
+        devices: Camera device paths (e.g., ["/dev/video0", "/dev/video1"])
+    
+    Returns:
+        Dict mapping each device path to its status
+    
+    Example:
+        Request:  {"jsonrpc": "2.0", "method": "get_camera_statuses", "params": {"devices": ["/dev/video0", "/dev/video1"]}, "id": 11}
+        Response: {"jsonrpc": "2.0", "result": {"/dev/video0": {...}, "/dev/video1": {...}}, "id": 11}
+    """
+    logger.debug("Camera statuses requested for %s", devices)
+    
+    if not isinstance(devices, list):
+        raise ValueError("devices must be a list of device paths")
+    for device in devices:
+        if not _is_valid_device(device):
+            raise ValueError(f"Invalid device path: {device}")
+    
+    if not _MONITOR_AVAILABLE:
+        timestamp = now_iso()
+        return {
+            device: {
+                "device": device,
+                "status": "UNKNOWN",
+                "message": "Camera monitoring not available",
+                "timestamp": timestamp
+            }
+            for device in devices
+        }
+    
+    results = await asyncio.gather(
+        *(get_camera_status_by_device(device) for device in devices),
+        return_exceptions=True
+    )
+    
+    statuses = {}
+    for device, result in zip(devices, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error getting camera status for {device}: {result}")
+            result = {"device": device, "status": "ERROR", "error_message": str(result)}
+        statuses[device] = result
+    return statuses
+
+MEDIA_DIR = Path("/opt/webcam-env/media")
+# Blocking media work (encoder probes, frame and metadata writes) gets its own
+# small pool so it never queues behind, or holds up, the default executor
+MEDIA_EXECUTOR_WORKERS = 2
+_media_executor = ThreadPoolExecutor(max_workers=MEDIA_EXECUTOR_WORKERS, thread_name_prefix="media")
+FFMPEG_ERROR_TAIL = 2048  # bytes of ffmpeg stderr kept in snapshot errors
+_media_dir_ready = False
+
+# ffmpeg and gst-launch run niced and, on multi-core hosts, off the first CPU,
+# so a saturating encoder leaves a core and scheduling priority to the server
+MEDIA_PROCESS_NICE = 10
+
+def _media_command_prefix() -> List[str]:
+    """nice/taskset wrapper for media subprocesses (both exec in place, keeping the pid)"""
+    prefix = ["nice", "-n", str(MEDIA_PROCESS_NICE)] if shutil.which("nice") else []
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return prefix
+    if len(cpus) > 1 and shutil.which("taskset"):
+        prefix += ["taskset", "-c", ",".join(map(str, cpus[1:]))]
+    return prefix
+
+MEDIA_COMMAND_PREFIX = _media_command_prefix()
+
+def _ensure_media_dir() -> Path:
+    """Create the media directory on first use only"""
+    global _media_dir_ready
+    if not _media_dir_ready:
+        MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+        _media_dir_ready = True
+    return MEDIA_DIR
+
+# Hardware JPEG encoders in order of preference, with the ffmpeg arguments
+# that go before and after the input to feed frames to them
+VAAPI_DEVICE = "/dev/dri/renderD128"
+HW_MJPEG_ENCODERS = {
+    "mjpeg_vaapi": (
+        ["-vaapi_device", VAAPI_DEVICE],
+        ["-vf", "format=nv12,hwupload", "-c:v", "mjpeg_vaapi"],
+    ),
+    "mjpeg_qsv": (
+        ["-init_hw_device", "qsv=hw", "-filter_hw_device", "hw"],
+        ["-vf", "hwupload=extra_hw_frames=64,format=qsv", "-c:v", "mjpeg_qsv"],
+    ),
+}
+JPEG_FORMATS = ("jpeg", "jpg")
+FFMPEG_PROBE_TIMEOUT = 10  # seconds
+_mjpeg_encoder: Optional[str] = None  # "" once probed and none is usable
+
+def _detect_mjpeg_encoder() -> str:
+    """Return the first hardware JPEG encoder ffmpeg was built with, or "" for software"""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=FFMPEG_PROBE_TIMEOUT
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    available = {fields[1] for fields in map(str.split, result.stdout.splitlines()) if len(fields) > 1}
+    for encoder in HW_MJPEG_ENCODERS:
+        if encoder in available:
+            return encoder
+    return ""
+
+async def _get_mjpeg_encoder() -> str:
+    """Probe ffmpeg's JPEG encoders once and reuse the answer"""
+    global _mjpeg_encoder
+    if _mjpeg_encoder is None:
+        loop = asyncio.get_running_loop()
+        _mjpeg_encoder = await loop.run_in_executor(_media_executor, _detect_mjpeg_encoder)
+        logger.info("Snapshot JPEG encoder: %s", _mjpeg_encoder or "software")
+    return _mjpeg_encoder
+
+# Persistent ffmpeg MJPEG pipes, one per device, used for JPEG snapshots
+SNAPSHOT_STREAM_IDLE_TIMEOUT = 30.0  # seconds without requests before ffmpeg is stopped
+SNAPSHOT_FRAME_TIMEOUT = 5.0  # seconds to wait for a frame, including ffmpeg start-up
+_snapshot_streams: Dict[str, SnapshotStream] = {}
+
+# Snapshot captures in progress, keyed by (device, format)
+_inflight_snapshots: Dict[Tuple[str, str], asyncio.Task] = {}
+
 async def capture_snapshot(device: str, format: str = "jpeg") -> Dict[str, Any]:
     """
     Capture a snapshot from the specified camera device.
 
+    Concurrent requests for the same device and format share one capture
+    and receive the same snapshot.
+
     Args:
         device: Camera device path (e.g., "/dev/video0")
         format: Image format (default: "jpeg")
@@ -206,44 +472,157 @@ async def capture_snapshot(device: str, format: str = "jpeg") -> Dict[str, Any]:
         Request:  {"jsonrpc": "2.0", "method": "capture_snapshot", "params": {"device": "/dev/video0"}, "id": 7}
         Response: {"jsonrpc": "2.0", "result": {...}, "id": 7}
     """
-    logger.info(f"Snapshot capture requested for device: {device} in format: {format}")
+    logger.info("Snapshot capture requested for device: %s in format: %s", device, format)
 
-    if not device or not device.startswith('/dev/video'):
+    if not _is_valid_device(device):
         raise ValueError(f"Invalid device path: {device}")
 
-    snapshot_id = str(uuid.uuid4())
+    key = (device, format)
+    task = _inflight_snapshots.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_capture_snapshot(device, format))
+        _inflight_snapshots[key] = task
+        task.add_done_callback(lambda done: _inflight_snapshots.pop(key, None))
+    else:
+        logger.debug("Joining snapshot capture already in progress for %s", device)
+    
+    # Shielded so one caller going away does not cancel the capture for the others
+    return dict(await asyncio.shield(task))
+
+async def _capture_snapshot(device: str, format: str) -> Dict[str, Any]:
+    """Run one ffmpeg snapshot capture"""
+    global _mjpeg_encoder
+    snapshot_id = os.urandom(8).hex()  # 64 random bits: plenty for file names
     filename = f"{snapshot_id}.{format}"
-    media_dir = Path("/opt/webcam-env/media")
-    media_dir.mkdir(parents=True, exist_ok=True)
-    filepath = media_dir / filename
+    filepath = _ensure_media_dir() / filename
 
-    cmd = [
-        "ffmpeg", "-f", "v4l2", "-i", device,
-        "-frames:v", "1", "-y", str(filepath)
-    ]
+    encoder = await _get_mjpeg_encoder() if format in JPEG_FORMATS else ""
+
+    if format in JPEG_FORMATS:
+        try:
+            frame = await _get_snapshot_stream(device, encoder).next_frame(SNAPSHOT_FRAME_TIMEOUT)
+            await asyncio.get_running_loop().run_in_executor(_media_executor, filepath.write_bytes, frame)
+            return _snapshot_result(snapshot_id, filename, device)
+        except Exception as e:
+            # Fall back to a one-off capture, which also reports ffmpeg's error
+            logger.warning("Snapshot stream for %s failed (%s), capturing directly", device, e)
+            await close_snapshot_stream(device)
 
     try:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            logger.error(f"ffmpeg error: {stderr.decode().strip()}")
-            raise RuntimeError(f"Snapshot capture failed: {stderr.decode().strip()}")
+        returncode, stderr = await _run_ffmpeg_snapshot(device, filepath, encoder)
+        if returncode != 0 and encoder:
+            # Encoder compiled in but unusable on this host: stop trying it
+            logger.warning("Hardware JPEG encoder %s failed, using software encoding", encoder)
+            _mjpeg_encoder = ""
+            returncode, stderr = await _run_ffmpeg_snapshot(device, filepath, "")
+        if returncode != 0:
+            # Only the tail of ffmpeg's error output is worth reporting
+            error = stderr[-FFMPEG_ERROR_TAIL:].decode(errors="replace").strip()
+            logger.error(f"ffmpeg error: {error}")
+            raise RuntimeError(f"Snapshot capture failed: {error}")
     except Exception as e:
         logger.error(f"Error capturing snapshot: {e}")
         raise RuntimeError(f"Failed to capture snapshot: {e}")
 
+    return _snapshot_result(snapshot_id, filename, device)
+
+def _snapshot_result(snapshot_id: str, filename: str, device: str) -> Dict[str, Any]:
     return {
         "snapshot_id": snapshot_id,
         "filename": filename,
         "device": device,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
-GST_RECORDING_PROCESS = {"proc": None, "filename": None, "start_time": None}
+def _get_snapshot_stream(device: str, encoder: str) -> SnapshotStream:
+    """Return the device's persistent JPEG stream, creating it on first use"""
+    stream = _snapshot_streams.get(device)
+    if stream is None:
+        input_args, output_args = HW_MJPEG_ENCODERS.get(encoder, ([], []))
+        stream = SnapshotStream(device, SNAPSHOT_STREAM_IDLE_TIMEOUT, input_args, output_args,
+                                command_prefix=MEDIA_COMMAND_PREFIX)
+        _snapshot_streams[device] = stream
+    return stream
+
+async def close_snapshot_stream(device: str):
+    """Release the device held open by its snapshot stream, if any"""
+    stream = _snapshot_streams.pop(device, None)
+    if stream is not None:
+        await stream.close()
+
+async def close_snapshot_streams():
+    """Stop every snapshot stream (server shutdown)"""
+    for device in tuple(_snapshot_streams):
+        await close_snapshot_stream(device)
+
+async def _run_ffmpeg_snapshot(device: str, filepath: Path, encoder: str) -> Tuple[int, bytes]:
+    """Grab one frame into filepath; returns ffmpeg's exit code and stderr"""
+    input_args, output_args = HW_MJPEG_ENCODERS.get(encoder, ([], []))
+    # Non-interactive and quiet: no terminal setup, stderr carries only errors
+    cmd = [
+        *MEDIA_COMMAND_PREFIX,
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+        *input_args,
+        "-f", "v4l2", "-i", device,
+        *output_args,
+        "-frames:v", "1", "-y", str(filepath)
+    ]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await proc.communicate()
+    return proc.returncode, stderr
+
+# Running recordings keyed by device: {"proc", "filename", "start_time"}
+RECORDINGS: Dict[str, Dict[str, Any]] = {}
+# Serializes start/stop per device; a lock lives only while someone holds it
+_recording_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+def _recording_lock(device: str) -> asyncio.Lock:
+    lock = _recording_locks.get(device)
+    if lock is None:
+        lock = _recording_locks[device] = asyncio.Lock()
+    return lock
+
+# Hardware H.264 encoders in order of preference; x264enc is the fallback
+HW_H264_ENCODERS = ("nvh264enc", "vaapih264enc", "v4l2h264enc")
+GST_PROBE_TIMEOUT = 10  # seconds per gst-inspect call
+_h264_encoder: Optional[str] = None
+
+# Encoder stage of the recording pipeline for each supported element
+_H264_ENCODER_STAGES = {
+    "nvh264enc": ["videoconvert", "!", "nvh264enc", "preset=low-latency-hp"],
+    "vaapih264enc": ["vaapipostproc", "!", "vaapih264enc", "rate-control=cbr"],
+    "v4l2h264enc": ["videoconvert", "!", "v4l2h264enc"],
+    "x264enc": ["videoconvert", "!", "x264enc", "speed-preset=ultrafast", "tune=zerolatency"],
+}
+
+def _detect_h264_encoder() -> str:
+    """Return the first available hardware H.264 encoder, or x264enc"""
+    for element in HW_H264_ENCODERS:
+        try:
+            result = subprocess.run(
+                ["gst-inspect-1.0", "--exists", element],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=GST_PROBE_TIMEOUT
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            break
+        if result.returncode == 0:
+            return element
+    return "x264enc"
+
+async def _get_h264_encoder() -> str:
+    """Probe the GStreamer encoders once and reuse the answer"""
+    global _h264_encoder
+    if _h264_encoder is None:
+        loop = asyncio.get_running_loop()
+        _h264_encoder = await loop.run_in_executor(_media_executor, _detect_h264_encoder)
+        logger.info("Using GStreamer H.264 encoder: %s", _h264_encoder)
+    return _h264_encoder
 
 async def start_recording(device: str, filename: str, resolution: str = "640x480", duration: Optional[int] = None) -> dict:
     """
@@ -258,73 +637,109 @@ async def start_recording(device: str, filename: str, resolution: str = "640x480
     Returns:
         Dict containing recording metadata
     """
-    logger.info(f"Start recording requested for device: {device} to file: {filename} at resolution: {resolution}, duration: {duration}")
+    logger.info("Start recording requested for device: %s to file: %s at resolution: %s, duration: %s",
+                device, filename, resolution, duration)
 
     if not device or not filename:
         return {"error": "device and filename are required"}
-    if GST_RECORDING_PROCESS["proc"]:
-        return {"error": "A recording is already in progress"}
-    try:
-        width, height = map(int, resolution.split("x"))
-    except Exception:
+    if not _is_valid_device(device):
+        return {"error": f"Invalid device path: {device}"}
+    match = _RESOLUTION_RE.fullmatch(resolution) if isinstance(resolution, str) else None
+    if match is None:
         return {"error": "Invalid resolution format. Use 'WIDTHxHEIGHT'."}
+    width, height = int(match[1]), int(match[2])
+
+    async with _recording_lock(device):
+        recording = RECORDINGS.get(device)
+        # A recording that ended on its own (duration, camera unplugged) no longer blocks the device
+        if recording and recording["proc"].returncode is None:
+            return {"error": f"A recording is already in progress on {device}"}
+        return await _start_recording(device, filename, resolution, width, height, duration)
 
+async def _start_recording(device: str, filename: str, resolution: str, width: int, height: int,
+                           duration: Optional[int]) -> dict:
+    """Launch gst-launch for one device; called with the device's recording lock held"""
+    # The snapshot stream holds the device open; v4l2src needs it
+    await close_snapshot_stream(device)
+
+    encoder = await _get_h264_encoder()
     cmd = [
         "gst-launch-1.0",
         "v4l2src", f"device={device}",
         "!", f"video/x-raw,width={width},height={height}",
-        "!", "x264enc",
+        "!", *_H264_ENCODER_STAGES[encoder],
+        "!", "h264parse",
         "!", "mp4mux",
         "!", "filesink", f"location={filename}"
     ]
     if duration:
         # Use 'timeout' to limit duration if available (Linux)
         cmd = ["timeout", str(duration)] + cmd
+    cmd = MEDIA_COMMAND_PREFIX + cmd
 
     try:
+        # Output is never read: an undrained pipe would eventually fill and
+        # stall gst-launch mid-recording
         proc = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
         )
-        GST_RECORDING_PROCESS["proc"] = proc
-        GST_RECORDING_PROCESS["filename"] = filename
-        GST_RECORDING_PROCESS["start_time"] = datetime.now().isoformat()
+        start_time = datetime.now().isoformat()
+        RECORDINGS[device] = {"proc": proc, "filename": filename, "start_time": start_time}
         return {
             "filename": filename,
             "device": device,
             "resolution": resolution,
-            "started_at": GST_RECORDING_PROCESS["start_time"],
+            "encoder": encoder,
+            "started_at": start_time,
             "duration": duration
         }
     except Exception as e:
         logger.error(f"start_recording error: {e}")
         return {"error": str(e)}
 
-async def stop_recording() -> dict:
+async def stop_recording(device: Optional[str] = None) -> dict:
     """
-    Stop any running GStreamer process started by start_recording.
+    Stop the GStreamer process started by start_recording for a device.
+
+    Args:
+        device: Camera device path; may be omitted while only one recording runs
     """
-    proc = GST_RECORDING_PROCESS.get("proc")
-    filename = GST_RECORDING_PROCESS.get("filename")
-    start_time = GST_RECORDING_PROCESS.get("start_time")
-    if not proc:
+    if device is None:
+        if len(RECORDINGS) > 1:
+            return {"error": "Several recordings are running; specify the device"}
+        device = next(iter(RECORDINGS), None)
+    if device is None or device not in RECORDINGS:
         return {"error": "No recording in progress"}
+
+    async with _recording_lock(device):
+        recording = RECORDINGS.pop(device, None)
+        if recording is None:
+            return {"error": "No recording in progress"}
+        return await _stop_recording(device, recording)
+
+async def _stop_recording(device: str, recording: Dict[str, Any]) -> dict:
+    """Stop one recording and write its metadata file"""
+    proc = recording["proc"]
+    filename = recording["filename"]
+    start_time = recording["start_time"]
     try:
-        proc.terminate()
+        if proc.returncode is None:
+            proc.terminate()
         await proc.wait()
-        GST_RECORDING_PROCESS["proc"] = None
         stop_time = datetime.now().isoformat()
         # Optionally write metadata
         meta = {
+            "device": device,
             "filename": filename,
             "started_at": start_time,
             "stopped_at": stop_time
         }
         if filename:
-            meta_path = filename + ".json"
-            with open(meta_path, "w") as f:
-                json.dump(meta, f)
+            # Off the event loop: the file may sit on slow storage
+            meta_path = Path(filename + ".json")
+            await asyncio.get_running_loop().run_in_executor(_media_executor, meta_path.write_bytes, _dumpb(meta))
         return {"status": "stopped", **meta}
     except Exception as e:
         logger.error(f"stop_recording error: {e}")
@@ -343,7 +758,8 @@ async def schedule_recording(device: str, start_time: str, duration: int, format
     Returns:
         Dict containing schedule metadata
     """
-    logger.info(f"Schedule recording requested for device: {device} at {start_time} for {duration}s in format: {format}")
+    logger.info("Schedule recording requested for device: %s at %s for %ss in format: %s",
+                device, start_time, duration, format)
 
     try:
         start_dt = datetime.fromisoformat(start_time)
@@ -354,21 +770,103 @@ async def schedule_recording(device: str, start_time: str, duration: int, format
     delay = (start_dt - now).total_seconds()
     if delay < 0:
         raise ValueError("start_time must be in the future")
+    if not _is_valid_device(device):
+        raise ValueError(f"Invalid device path: {device}")
 
-    async def delayed_record():
-        await asyncio.sleep(delay)
-        await start_recording(device, format=format, duration=duration)
+    filename = str(_ensure_media_dir() / f"{os.urandom(8).hex()}.{format}")
 
-    asyncio.create_task(delayed_record())
+    # A timer on the loop's monotonic clock rather than a sleeping task: no
+    # coroutine stays resident until then, and wall-clock steps do not move it
+    loop = asyncio.get_running_loop()
+    _scheduled_timers[filename] = loop.call_at(
+        loop.time() + delay, _start_scheduled_recording, device, filename, duration
+    )
+    _set_scheduled_status(filename, {"device": device, "scheduled_for": start_time, "status": "scheduled"})
 
     return {
         "device": device,
+        "filename": filename,
         "scheduled_for": start_time,
         "duration": duration,
         "format": format,
         "status": "scheduled"
     }
 
+# Pending scheduled starts by output filename, so they can be cancelled
+_scheduled_timers: Dict[str, asyncio.TimerHandle] = {}
+# Started scheduled recordings, referenced until done so they are not collected
+_scheduled_tasks: Set[asyncio.Task] = set()
+
+# Outcome of each scheduled recording, keyed by output filename; oldest
+# entries are dropped past the limit
+_scheduled_status: Dict[str, Dict[str, Any]] = {}
+SCHEDULED_STATUS_LIMIT = 256
+
+def _set_scheduled_status(filename: str, status: Dict[str, Any]):
+    _scheduled_status.pop(filename, None)
+    _scheduled_status[filename] = status
+    while len(_scheduled_status) > SCHEDULED_STATUS_LIMIT:
+        del _scheduled_status[next(iter(_scheduled_status))]
+
+async def get_scheduled_recording_status(filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the status of scheduled recordings
+    
+    Status is "scheduled", "started", "failed" (with error) or "cancelled".
+    
+    Args:
+        filename: Output filename returned by schedule_recording; all when omitted
+    
+    Returns:
+        Dict with the schedule's status, or all statuses keyed by filename
+    
+    Example:
+        Request:  {"jsonrpc": "2.0", "method": "get_scheduled_recording_status", "params": {"filename": "/opt/webcam-env/media/3f2a9c1e5b7d4a60.mp4"}, "id": 13}
+        Response: {"jsonrpc": "2.0", "result": {"device": "/dev/video0", "scheduled_for": "...", "status": "started", ...}, "id": 13}
+    """
+    if filename is None:
+        return {name: dict(status) for name, status in _scheduled_status.items()}
+    status = _scheduled_status.get(filename)
+    return dict(status) if status else {"error": f"No scheduled recording for {filename}"}
+
+def cancel_scheduled_recordings():
+    """Cancel scheduled recordings that have not started yet (server shutdown)"""
+    for filename, timer in tuple(_scheduled_timers.items()):
+        timer.cancel()
+        status = dict(_scheduled_status.get(filename) or {})
+        status.update(status="cancelled")
+        _set_scheduled_status(filename, status)
+    if _scheduled_timers:
+        logger.info("Cancelled %d scheduled recordings", len(_scheduled_timers))
+    _scheduled_timers.clear()
+
+def _start_scheduled_recording(device: str, filename: str, duration: int):
+    _scheduled_timers.pop(filename, None)
+    task = asyncio.ensure_future(start_recording(device, filename, duration=duration))
+    _scheduled_tasks.add(task)
+    task.add_done_callback(_scheduled_tasks.discard)
+    task.add_done_callback(
+        lambda done: _record_scheduled_outcome(device, filename, done)
+    )
+
+def _record_scheduled_outcome(device: str, filename: str, task: asyncio.Task):
+    """Log a scheduled start that failed and keep its outcome for status queries"""
+    status = dict(_scheduled_status.get(filename) or {"device": device})
+    if task.cancelled():
+        error = "cancelled"
+    elif task.exception() is not None:
+        error = str(task.exception())
+    else:
+        result = task.result()
+        error = result.get("error")
+        if error is None:
+            status.update(status="started", started_at=result.get("started_at"))
+            _set_scheduled_status(filename, status)
+            return
+    logger.error("Scheduled recording on %s to %s failed to start: %s", device, filename, error)
+    status.update(status="failed", error=error)
+    _set_scheduled_status(filename, status)
+
 # ============================================================================
 # Utility Methods
 # ============================================================================
@@ -389,37 +887,22 @@ async def echo(message: str) -> str:
         Request:  {"jsonrpc": "2.0", "method": "echo", "params": {"message": "hello"}, "id": 5}
         Response: {"jsonrpc": "2.0", "result": "hello", "id": 5}
     """
-    logger.debug(f"Echo method called with message: {message}")
+    logger.debug("Echo method called with message: %s", message)
     return message
 
-async def get_supported_methods() -> List[str]:
+async def get_supported_methods() -> Tuple[str, ...]:
     """
     Get list of all supported RPC methods
     
     Returns:
-        List of method names that can be called
+        Method names that can be called (the shared, immutable SUPPORTED_METHODS)
     
     Example:
         Request:  {"jsonrpc": "2.0", "method": "get_supported_methods", "id": 6}
         Response: {"jsonrpc": "2.0", "result": ["ping", "echo", ...], "id": 6}
     """
-    logger.info("Supported methods list requested")
-    
-    # This will be populated by the JSON-RPC handler
-    methods = [
-        "ping",
-        "get_server_info", 
-        "get_camera_list",
-        "get_camera_status",
-        "capture_snapshot",
-        "start_recording",
-        "stop_recording",
-        "schedule_recording",
-        "echo",
-        "get_supported_methods"
-    ]
-    
-    return methods
+    logger.debug("Supported methods list requested")
+    return SUPPORTED_METHODS
 
 # ============================================================================
 # Method Registration Helper
@@ -429,27 +912,13 @@ def register_all_methods(rpc_handler):
     """
     Register all methods with the JSON-RPC handler
     
+    The method table is built once at import from METHOD_METADATA.
+    
     Args:
         rpc_handler: JSONRPCHandler instance to register methods with
     """
-    methods_to_register = [
-        ("ping", ping),
-        ("get_server_info", get_server_info),
-        ("get_camera_list", get_camera_list),
-        ("get_camera_status", get_camera_status),
-        ("capture_snapshot", capture_snapshot),
-        ("start_recording", start_recording),
-        ("stop_recording", stop_recording),
-        ("schedule_recording", schedule_recording),
-        ("echo", echo),
-        ("get_supported_methods", get_supported_methods),
-    ]
-    
-    for method_name, method_func in methods_to_register:
-        rpc_handler.register_method(method_name, method_func)
-        logger.debug(f"Registered method: {method_name}")
-    
-    logger.info(f"Registered {len(methods_to_register)} JSON-RPC methods")
+    rpc_handler.register_methods(_METHODS)
+    logger.info(f"Registered {len(_METHODS)} JSON-RPC methods")
 
 # ============================================================================  
 # Method Metadata (for documentation/introspection)
@@ -483,6 +952,14 @@ METHOD_METADATA = {
         "returns": "object",
         "example_request": {"jsonrpc": "2.0", "method": "get_camera_status", "params": {"device": "/dev/video0"}, "id": 4}
     },
+    "get_camera_statuses": {
+        "description": "Get detailed status for several camera devices in one call",
+        "parameters": {
+            "devices": {"type": "array", "description": "Camera device paths (e.g., ['/dev/video0', '/dev/video1'])", "required": True}
+        },
+        "returns": "object",
+        "example_request": {"jsonrpc": "2.0", "method": "get_camera_statuses", "params": {"devices": ["/dev/video0", "/dev/video1"]}, "id": 11}
+    },
     "capture_snapshot": {
         "description": "Capture a snapshot from the specified camera device",
         "parameters": {
@@ -503,12 +980,12 @@ METHOD_METADATA = {
         "example_request": {"jsonrpc": "2.0", "method": "start_recording", "params": {"device": "/dev/video0"}, "id": 8}
     },
     "stop_recording": {
-        "description": "Stop a running recording by its ID",
+        "description": "Stop the running recording on a camera device",
         "parameters": {
-            "recording_id": {"type": "string", "description": "The ID of the recording to stop", "required": True}
+            "device": {"type": "string", "description": "Camera device path; optional while only one recording runs", "required": False}
         },
         "returns": "object",
-        "example_request": {"jsonrpc": "2.0", "method": "stop_recording", "params": {"recording_id": "uuid"}, "id": 9}
+        "example_request": {"jsonrpc": "2.0", "method": "stop_recording", "params": {"device": "/dev/video0"}, "id": 9}
     },
     "schedule_recording": {
         "description": "Schedule a recording at a future time",
@@ -530,6 +1007,14 @@ METHOD_METADATA = {
             "id": 10
         }
     },
+    "get_scheduled_recording_status": {
+        "description": "Get the status of scheduled recordings",
+        "parameters": {
+            "filename": {"type": "string", "description": "Output filename returned by schedule_recording; all schedules when omitted", "required": False}
+        },
+        "returns": "object",
+        "example_request": {"jsonrpc": "2.0", "method": "get_scheduled_recording_status", "params": {"filename": "/opt/webcam-env/media/3f2a9c1e5b7d4a60.mp4"}, "id": 13}
+    },
     "echo": {
         "description": "Echo back the provided message",
         "parameters": {
@@ -543,5 +1028,41 @@ METHOD_METADATA = {
         "parameters": {},
         "returns": "array",
         "example_request": {"jsonrpc": "2.0", "method": "get_supported_methods", "id": 6}
+    },
+    "get_method_metadata": {
+        "description": "Get descriptions, parameters and examples for all RPC methods",
+        "parameters": {},
+        "returns": "object",
+        "example_request": {"jsonrpc": "2.0", "method": "get_method_metadata", "id": 12}
     }
-}
\ No newline at end of file
+}
+
+async def get_method_metadata() -> Dict[str, Any]:
+    """
+    Get descriptions, parameters and examples for all RPC methods
+    
+    Returns:
+        A copy of METHOD_METADATA, keyed by method name
+    
+    Example:
+        Request:  {"jsonrpc": "2.0", "method": "get_method_metadata", "id": 12}
+        Response: {"jsonrpc": "2.0", "result": {"ping": {...}, ...}, "id": 12}
+    """
+    return copy.deepcopy(METHOD_METADATA)
+
+# Static: the JSON-RPC handler encodes it once at registration and answers from
+# that; a private snapshot so later edits to METHOD_METADATA can't make the
+# cached JSON and the returned value disagree
+get_method_metadata.precomputed_result = copy.deepcopy(METHOD_METADATA)
+
+# ============================================================================
+# Method Table
+# ============================================================================
+
+# METHOD_METADATA is the single source of truth for what gets registered and
+# advertised; every key must name a function in this module
+SUPPORTED_METHODS = tuple(METHOD_METADATA)
+_METHODS = tuple((name, globals()[name]) for name in SUPPORTED_METHODS)
+
+# Constant result: the JSON-RPC handler answers from this without calling the method
+get_supported_methods.precomputed_result = SUPPORTED_METHODS
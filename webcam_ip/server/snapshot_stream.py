@@ -0,0 +1,204 @@
+"""
+Persistent Snapshot Stream
+
+Keeps one long-lived ffmpeg process per camera that writes MJPEG frames to a
+pipe, so a snapshot only has to wait for the next frame instead of paying for
+process start-up, device open and encoder set-up on every request. Frames are
+cut out of the byte stream at the JPEG SOI/EOI markers. The process is torn
+down after a period without requests so the camera is not held open forever.
+"""
+
+import asyncio
+import fcntl
+import logging
+import os
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+PIPE_BUFFER_SIZE = 1 << 20  # kernel pipe and StreamReader buffer for ffmpeg's output
+READ_CHUNK_SIZE = PIPE_BUFFER_SIZE
+
+def _open_frame_pipe():
+    """
+    Create the pipe ffmpeg writes frames into, enlarged to PIPE_BUFFER_SIZE.
+
+    With the default 64 KiB pipe a single high-resolution JPEG takes several
+    write/read round trips; a 1 MiB pipe holds whole frames.
+    """
+    read_fd, write_fd = os.pipe()
+    try:
+        fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except (AttributeError, OSError) as e:
+        # Not Linux, or above /proc/sys/fs/pipe-max-size: keep the default
+        logger.debug("Could not enlarge snapshot pipe: %s", e)
+    return read_fd, write_fd
+
+class SnapshotStream:
+    """Long-lived ffmpeg MJPEG pipe for one camera device"""
+
+    def __init__(self, device: str, idle_timeout: float,
+                 input_args: Optional[List[str]] = None,
+                 output_args: Optional[List[str]] = None,
+                 command_prefix: Optional[List[str]] = None):
+        self.device = device
+        self.idle_timeout = idle_timeout
+        self._input_args = input_args or []
+        self._output_args = output_args or []
+        self._command_prefix = command_prefix or []  # e.g. nice/taskset
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._stdout_transport: Optional[asyncio.ReadTransport] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._waiters: List[asyncio.Future] = []
+        self._start_lock = asyncio.Lock()
+        self._close_tasks: Set[asyncio.Task] = set()  # idle closes, referenced until done
+
+    @property
+    def running(self) -> bool:
+        return self._reader_task is not None and not self._reader_task.done()
+
+    async def next_frame(self, timeout: float) -> bytes:
+        """Wait for the next complete JPEG frame, starting ffmpeg if needed"""
+        async with self._start_lock:
+            if not self.running:
+                await self._start()
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self._arm_idle_timer(loop)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def close(self):
+        """Stop ffmpeg and fail any pending frame requests"""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+        reader_task, self._reader_task = self._reader_task, None
+        if reader_task is not None and not reader_task.done():
+            reader_task.cancel()
+            try:
+                await reader_task
+            except asyncio.CancelledError:
+                pass
+
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.terminate()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+        self._fail_waiters(RuntimeError(f"Snapshot stream for {self.device} closed"))
+
+    async def _start(self):
+        cmd = [
+            *self._command_prefix,
+            "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+            *self._input_args,
+            "-f", "v4l2", "-i", self.device,
+            # A hardware encoder's output args already pick the codec
+            *(self._output_args or ["-c:v", "mjpeg"]),
+            "-f", "image2pipe", "-"
+        ]
+
+        logger.info("Starting snapshot stream for %s", self.device)
+        loop = asyncio.get_running_loop()
+        read_fd, write_fd = _open_frame_pipe()
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=write_fd,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+
+        stdout = asyncio.StreamReader(limit=PIPE_BUFFER_SIZE)
+        self._stdout_transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(stdout), os.fdopen(read_fd, "rb", 0))
+        self._reader_task = loop.create_task(self._read_frames(self._proc, stdout))
+
+    async def _read_frames(self, proc: asyncio.subprocess.Process, stdout: asyncio.StreamReader):
+        """Split ffmpeg's output into JPEG frames and hand them to waiters"""
+        buffer = bytearray()
+        scanned = 0  # offset up to which no EOI marker was found
+        try:
+            while True:
+                chunk = await stdout.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer += chunk
+
+                while True:
+                    start = buffer.find(JPEG_SOI)
+                    if start < 0:
+                        # Keep a trailing 0xFF in case a marker is split across reads
+                        del buffer[:-1]
+                        scanned = 0
+                        break
+                    if start:
+                        del buffer[:start]
+                        scanned = max(scanned - start, 0)
+
+                    end = buffer.find(JPEG_EOI, max(scanned, 2))
+                    if end < 0:
+                        scanned = max(len(buffer) - 1, 0)
+                        break
+
+                    frame = bytes(buffer[:end + 2])
+                    del buffer[:end + 2]
+                    scanned = 0
+                    self._deliver(frame)
+        finally:
+            if self._stdout_transport is not None:
+                self._stdout_transport.close()
+                self._stdout_transport = None
+            if self._proc is proc and proc.returncode is None:
+                try:
+                    proc.terminate()
+                except ProcessLookupError:
+                    pass
+            self._fail_waiters(RuntimeError(f"Snapshot stream for {self.device} ended"))
+            logger.info("Snapshot stream for %s stopped", self.device)
+
+    def _deliver(self, frame: bytes):
+        """Give a frame to everyone waiting; frames nobody asked for are dropped"""
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(frame)
+
+    def _fail_waiters(self, error: Exception):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    def _arm_idle_timer(self, loop: asyncio.AbstractEventLoop):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._idle_handle = loop.call_later(self.idle_timeout, self._on_idle, loop)
+
+    def _on_idle(self, loop: asyncio.AbstractEventLoop):
+        self._idle_handle = None
+        if self._waiters:
+            self._arm_idle_timer(loop)
+            return
+        logger.debug("Snapshot stream for %s idle, closing", self.device)
+        task = loop.create_task(self.close())
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
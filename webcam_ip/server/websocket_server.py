@@ -12,14 +12,30 @@ import signal
 import sys
 import time
 from datetime import datetime
-from typing import Set, Dict, Any, Optional
+from typing import Set, Dict, Any, Optional, Coroutine, Tuple
 from pathlib import Path
 
 import websockets
-import uvloop
+from websockets.asyncio.server import ServerConnection
 
-from .jsonrpc_handler import JSONRPCHandler
-from .methods import register_all_methods
+# uvloop is optional; on Windows, where it is not available, its port winloop
+# is used instead if installed. Without either the server runs on the default
+# asyncio loop
+try:
+    if sys.platform == 'win32':
+        import winloop as uvloop
+    else:
+        import uvloop
+except ImportError:
+    uvloop = None
+
+from ..utils.clock import now_iso
+from .jsonrpc_handler import JSONRPCHandler, JSONRPCError
+from .methods import (
+    register_all_methods, invalidate_camera_list_cache, close_snapshot_streams,
+    cancel_scheduled_recordings, stop_stats_refresher,
+    SERVER_NAME, SERVER_VERSION
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,17 +52,24 @@ class WebSocketJSONRPCServer:
     - Performance optimizations with uvloop
     """
     
+    BROADCAST_BATCH_SIZE = 50  # clients written per event-loop turn during a broadcast
+    MAX_CLIENT_WRITE_BUFFER = 256 * 1024  # bytes a client may fall behind before it is dropped
+    MAX_MESSAGE_SIZE = 1024 * 1024  # largest accepted message; also the send() high-water mark
+    
     def __init__(self, host: str = "0.0.0.0", port: int = 8002, websocket_path: str = "/ws"):
         self.host = host
         self.port = port
         self.websocket_path = websocket_path
         
         # Client management
-        self.clients: Set[websockets.WebSocketServerProtocol] = set()
+        self.clients: Set[ServerConnection] = set()
+        self._close_tasks: Set[asyncio.Task] = set()  # closes of dropped slow clients
         
         # JSON-RPC handler
         self.rpc_handler = JSONRPCHandler()
         register_all_methods(self.rpc_handler)
+        # Encoded welcome message around its timestamp, keyed by the method names
+        self._welcome_parts: Optional[Tuple[Tuple[str, ...], bytes, bytes]] = None
         
         # Server state
         self.server = None
@@ -68,7 +91,7 @@ class WebSocketJSONRPCServer:
         
         # Install signal handlers for graceful shutdown
         if sys.platform != 'win32':
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             for sig in (signal.SIGTERM, signal.SIGINT):
                 loop.add_signal_handler(sig, self._signal_handler)
         
@@ -83,8 +106,11 @@ class WebSocketJSONRPCServer:
             subprotocols=["echo-protocol"],
             logger=logger,
             # Performance settings
-            max_size=1024*1024,  # 1MB max message size
+            max_size=self.MAX_MESSAGE_SIZE,
             max_queue=32,        # Max queued messages per client
+            # send() only waits for the socket once this much is unsent, so a
+            # full-size response is buffered in one go instead of in 32 KiB steps
+            write_limit=self.MAX_MESSAGE_SIZE,
             compression=None,    # Disable compression for speed
             ping_interval=20,    # Send ping every 20 seconds
             ping_timeout=10,     # Wait 10 seconds for pong
@@ -110,11 +136,20 @@ class WebSocketJSONRPCServer:
         if self.camera_monitor:
             await self._stop_camera_monitor()
         
+        # Scheduled recordings must not start on a stopped server
+        cancel_scheduled_recordings()
+        
+        # Release cameras held open for snapshots
+        await close_snapshot_streams()
+        
+        # Stop sampling resource usage for get_server_info
+        await stop_stats_refresher()
+        
         # Close all client connections
         if self.clients:
             logger.info(f"Closing {len(self.clients)} client connections")
             close_tasks = []
-            for client in self.clients.copy():
+            for client in tuple(self.clients):
                 try:
                     close_tasks.append(self._close_client_gracefully(client))
                 except Exception as e:
@@ -134,16 +169,17 @@ class WebSocketJSONRPCServer:
         logger.info(f"Server stopped after {uptime:.2f} seconds")
         logger.info(f"Final stats: {self.stats}")
     
-    async def _close_client_gracefully(self, client: websockets.WebSocketServerProtocol):
+    async def _close_client_gracefully(self, client: ServerConnection):
         """Close a client connection gracefully"""
         try:
             await client.close(code=1001, reason="Server shutdown")
         except Exception as e:
             logger.debug(f"Error closing client: {e}")
     
-    async def handle_client(self, websocket, path):
+    async def handle_client(self, websocket: ServerConnection):
         """Handle WebSocket client connections"""
         client_addr = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
+        path = websocket.request.path
         
         # Validate path
         if path != self.websocket_path:
@@ -160,8 +196,11 @@ class WebSocketJSONRPCServer:
             # Send welcome message with server info
             await self._send_welcome_message(websocket)
             
-            # Handle messages
-            async for message in websocket:
+            # Handle messages. Frames are received as raw bytes: the JSON
+            # parser validates UTF-8 itself, so decoding them here first
+            # would do the work twice.
+            while True:
+                message = await websocket.recv(decode=False)
                 await self._handle_client_message(websocket, client_addr, message)
         
         except websockets.exceptions.ConnectionClosed:
@@ -178,51 +217,75 @@ class WebSocketJSONRPCServer:
     async def _send_welcome_message(self, websocket):
         """Send welcome notification to newly connected client"""
         try:
-            welcome_notification = self.rpc_handler.create_notification(
+            await websocket.send(self._welcome_message(), text=True)
+            logger.debug(f"Sent welcome message to {websocket.remote_address}")
+        except Exception as e:
+            logger.warning(f"Failed to send welcome message: {e}")
+    
+    _WELCOME_TIMESTAMP_SLOT = "\x00timestamp\x00"
+    
+    def _welcome_message(self) -> bytes:
+        """
+        Encoded server_welcome notification for a new connection
+        
+        Only the timestamp changes between connections, so the rest is
+        encoded once and re-encoded only if the registered methods change.
+        """
+        methods = tuple(self.rpc_handler.methods)
+        if self._welcome_parts is None or self._welcome_parts[0] != methods:
+            encoded = self.rpc_handler.encode_notification(
                 "server_welcome",
                 {
-                    "server": "WebSocket JSON-RPC Camera Server",
-                    "version": "1.0.0",
-                    "timestamp": datetime.now().isoformat(),
-                    "available_methods": self.rpc_handler.get_method_list()
+                    "server": SERVER_NAME,
+                    "version": SERVER_VERSION,
+                    "timestamp": self._WELCOME_TIMESTAMP_SLOT,
+                    "available_methods": list(methods)
                 }
             )
-            await websocket.send(welcome_notification)
-            logger.debug(f"Sent welcome message to {websocket.remote_address}")
-        except Exception as e:
-            logger.warning(f"Failed to send welcome message: {e}")
+            head, _, tail = encoded.partition(b'"\\u0000timestamp\\u0000"')
+            self._welcome_parts = (methods, head, tail)
+        _, head, tail = self._welcome_parts
+        return b'%s"%s"%s' % (head, now_iso().encode(), tail)
     
     async def _handle_client_message(self, websocket, client_addr, message):
         """Handle individual client messages"""
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
-            logger.debug(f"Received from {client_addr}: {message}")
+            if debug:
+                logger.debug("Received from %s: %s", client_addr, message)
             
             # Update statistics
             self.stats["total_requests"] += 1
             
-            # Process JSON-RPC request
-            start_time = time.time()
+            # Process JSON-RPC request; only timed when the timing gets logged
+            if not debug:
+                response = await self.rpc_handler.handle_request(message)
+                if response:
+                    await websocket.send(response)
+                return
+            
+            start_ns = time.perf_counter_ns()
             response = await self.rpc_handler.handle_request(message)
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1e6
             
             # Send response if not a notification
             if response:
                 await websocket.send(response)
-                logger.debug(f"Sent to {client_addr} ({response_time:.2f}ms): {response}")
+                logger.debug("Sent to %s (%.2fms): %s", client_addr, response_time, response)
             else:
-                logger.debug(f"Processed notification from {client_addr} ({response_time:.2f}ms)")
+                logger.debug("Processed notification from %s (%.2fms)", client_addr, response_time)
         
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error from {client_addr}: {e}")
             error_response = self.rpc_handler._create_error_response(
-                None, -32700, "Parse error"
+                None, *JSONRPCError.PARSE_ERROR
             )
             await websocket.send(error_response)
         
         except Exception as e:
             logger.error(f"Error handling message from {client_addr}: {e}", exc_info=True)
             error_response = self.rpc_handler._create_error_response(
-                None, -32603, "Internal error"
+                None, *JSONRPCError.INTERNAL_ERROR
             )
             await websocket.send(error_response)
     
@@ -233,42 +296,75 @@ class WebSocketJSONRPCServer:
         Args:
             status_data: Camera status information to broadcast
         """
+        # Camera set changed: the next get_camera_list must not be served from cache
+        invalidate_camera_list_cache()
+        
         if not self.clients:
             logger.debug("No clients connected, skipping camera status broadcast")
             return
         
         # Create notification
-        notification = self.rpc_handler.create_notification(
+        notification = self.rpc_handler.encode_notification(
             "camera_status_update",
             status_data
         )
         
         logger.info(f"Broadcasting camera status to {len(self.clients)} clients")
-        logger.debug(f"Camera status data: {status_data}")
-        
-        # Send to all connected clients
-        disconnected_clients = []
-        successful_sends = 0
-        
-        for client in self.clients.copy():
-            try:
-                await client.send(notification)
-                successful_sends += 1
-            except websockets.exceptions.ConnectionClosed:
-                logger.debug(f"Client disconnected during broadcast")
-                disconnected_clients.append(client)
-            except Exception as e:
-                logger.warning(f"Failed to send camera status to client: {e}")
-                disconnected_clients.append(client)
-        
-        # Remove disconnected clients
-        for client in disconnected_clients:
-            self.clients.discard(client)
+        logger.debug("Camera status data: %s", status_data)
+        
+        successful_sends = await self._broadcast(notification)
         
         # Update statistics
         self.stats["total_notifications"] += successful_sends
         
-        logger.debug(f"Camera status broadcast completed: {successful_sends} successful, {len(disconnected_clients)} failed")
+        logger.debug(f"Camera status broadcast completed: {successful_sends} successful")
+    
+    async def _broadcast(self, message: bytes) -> int:
+        """
+        Send one message to every connected client
+        
+        The message is UTF-8 encoded JSON, sent as a text frame without being
+        re-encoded. websockets.broadcast() frames it once and writes the same
+        frame to each connection without awaiting, so a slow client cannot
+        hold up the others. Large fan-outs are split into batches with
+        a yield to the event loop in between, so request handling is not
+        starved. Closed connections are skipped; they are removed from
+        self.clients when their handler exits.
+        
+        broadcast() applies no backpressure, so a client whose unsent data
+        exceeds MAX_CLIENT_WRITE_BUFFER is disconnected instead of buffering
+        without bound.
+        
+        Returns:
+            Number of clients the message was sent to
+        """
+        # One snapshot per broadcast; self.clients may change across batch yields
+        clients = tuple(self.clients)
+        batch_size = self.BROADCAST_BATCH_SIZE
+        sent = 0
+        for start in range(0, len(clients), batch_size):
+            if start:
+                await asyncio.sleep(0)
+            
+            ready = []
+            for client in clients[start:start + batch_size]:
+                if client.transport.get_write_buffer_size() > self.MAX_CLIENT_WRITE_BUFFER:
+                    self._drop_slow_client(client)
+                else:
+                    ready.append(client)
+            
+            websockets.broadcast(ready, message, text=True)
+            sent += len(ready)
+        return sent
+    
+    def _drop_slow_client(self, client):
+        """Disconnect a client that cannot keep up with broadcasts"""
+        logger.warning(f"Dropping slow client {client.remote_address}: "
+                       f"{client.transport.get_write_buffer_size()} bytes unsent")
+        self.clients.discard(client)
+        task = asyncio.create_task(client.close(code=1013, reason="Client too slow"))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
     
     async def broadcast_notification(self, method: str, params: Any = None):
         """
@@ -282,25 +378,11 @@ class WebSocketJSONRPCServer:
             logger.debug(f"No clients connected, skipping broadcast of {method}")
             return
         
-        notification = self.rpc_handler.create_notification(method, params)
+        notification = self.rpc_handler.encode_notification(method, params)
         
         logger.info(f"Broadcasting {method} notification to {len(self.clients)} clients")
         
-        # Send to all connected clients
-        disconnected_clients = []
-        successful_sends = 0
-        
-        for client in self.clients.copy():
-            try:
-                await client.send(notification)
-                successful_sends += 1
-            except Exception as e:
-                logger.warning(f"Failed to send {method} notification to client: {e}")
-                disconnected_clients.append(client)
-        
-        # Remove disconnected clients
-        for client in disconnected_clients:
-            self.clients.discard(client)
+        successful_sends = await self._broadcast(notification)
         
         self.stats["total_notifications"] += successful_sends
         logger.debug(f"Broadcast {method} completed: {successful_sends} successful")
@@ -351,24 +433,32 @@ def create_server(host: str = "0.0.0.0", port: int = 8002,
         host: Host to bind to
         port: Port to bind to  
         websocket_path: WebSocket endpoint path
-        use_uvloop: Whether to use uvloop for performance (Linux only)
+        use_uvloop: Ignored, kept for compatibility. The event loop is chosen
+            when it is created: start the server with run_server() for uvloop
     
     Returns:
         Configured WebSocketJSONRPCServer instance
     """
-    # Install uvloop for better performance on Linux
-    if use_uvloop and sys.platform != 'win32':
-        try:
-            uvloop.install()
-            logger.info("uvloop installed for improved performance")
-        except ImportError:
-            logger.warning("uvloop not available, using default event loop")
-    
     server = WebSocketJSONRPCServer(host, port, websocket_path)
     logger.info(f"Created WebSocket server: {host}:{port}{websocket_path}")
     
     return server
 
+def _uvloop_supported() -> bool:
+    return uvloop is not None
+
+def run_server(main: Coroutine) -> Any:
+    """
+    Run the server's top-level coroutine, on uvloop (winloop on Windows) when available
+    
+    Use this instead of asyncio.run(): the event loop implementation has to be
+    chosen before the loop starts, so installing uvloop from inside a running
+    coroutine has no effect.
+    """
+    if _uvloop_supported():
+        return uvloop.run(main)
+    return asyncio.run(main)
+
 # ============================================================================
 # Main Server Entry Point  
 # ============================================================================
@@ -397,4 +487,4 @@ if __name__ == "__main__":
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    asyncio.run(main())
\ No newline at end of file
+    run_server(main())
\ No newline at end of file
@@ -11,7 +11,8 @@ from .logging import (
     JsonFormatter,
     StructuredLogger,
     LogConfig,
-    configure_uvicorn_logging
+    configure_uvicorn_logging,
+    flush_logging
 )
 
 from .signals import (
@@ -21,6 +22,8 @@ from .signals import (
     cleanup_on_exit
 )
 
+from .clock import now_iso
+
 __version__ = "1.0.0"
 __all__ = [
     # Logging
@@ -30,10 +33,14 @@ __all__ = [
     "StructuredLogger",
     "LogConfig",
     "configure_uvicorn_logging",
+    "flush_logging",
     
     # Signal handling
     "SignalHandler",
     "GracefulShutdown",
     "setup_signal_handlers", 
-    "cleanup_on_exit"
+    "cleanup_on_exit",
+    
+    # Timestamps
+    "now_iso"
 ]
\ No newline at end of file
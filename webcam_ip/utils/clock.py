@@ -0,0 +1,24 @@
+"""
+Timestamp Utilities
+
+ISO timestamps for status payloads and notifications. These only need second
+resolution, so the formatted string is cached and rebuilt at most once per
+second instead of constructing and formatting a datetime on every call.
+"""
+
+import time
+from datetime import datetime
+
+# (epoch second, ISO string), rebound as a whole so readers never see a torn pair
+_timestamp_cache = (0, "")
+
+def now_iso() -> str:
+    """Current local time as an ISO string at second resolution"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, cached_iso = _timestamp_cache
+    if cached_second == second:
+        return cached_iso
+    iso = datetime.fromtimestamp(second).isoformat()
+    _timestamp_cache = (second, iso)
+    return iso
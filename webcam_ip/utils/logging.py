@@ -5,17 +5,64 @@ Provides structured logging with JSON output, file rotation, and ELK stack compa
 Supports both development-friendly and production-ready logging formats.
 """
 
+import atexit
 import json
 import logging
 import logging.handlers
 import os
+import queue
 import sys
-import traceback
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass, field
 
+# orjson is optional: several times faster than the stdlib encoder for the
+# per-record dicts built by JsonFormatter
+try:
+    import orjson
+    
+    def _dumps_log_entry(entry: Dict[str, Any]) -> str:
+        # orjson always emits UTF-8, matching ensure_ascii=False below.
+        # OPT_NON_STR_KEYS costs on every dict, so it is only used for the rare
+        # entry whose extras have non-string keys
+        try:
+            return orjson.dumps(entry, default=str).decode()
+        except TypeError:
+            return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def _dumpb_log_line(entry: Dict[str, Any]) -> bytes:
+        # UTF-8 line for binary file handlers, newline included
+        try:
+            return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return orjson.dumps(entry, default=str,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dumps_log_entry(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, default=str, ensure_ascii=False)
+    
+    def _dumpb_log_line(entry: Dict[str, Any]) -> bytes:
+        return (json.dumps(entry, default=str, ensure_ascii=False) + "\n").encode("utf-8")
+
+_SIZE_MULTIPLIERS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 * 1024,
+    'GB': 1024 * 1024 * 1024
+}
+
+# Loggers handed back by setup_logging, keyed by name
+_MODULE_LOGGER_NAMES = (
+    'webcam_ip',
+    'webcam_ip.server',
+    'webcam_ip.camera',
+    'webcam_ip.utils',
+    'websockets',
+    'asyncio'
+)
+
 @dataclass
 class LogConfig:
     """Configuration for logging setup"""
@@ -28,11 +75,19 @@ class LogConfig:
     backup_count: int = 5
     format_string: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     json_format_string: str = None
+    # Hand records to a background thread so handler I/O never blocks the event loop
+    queue_handlers: bool = True
+    # Per-destination levels, e.g. INFO on the console but DEBUG in the file;
+    # None means use level
+    console_level: Optional[str] = None
+    file_level: Optional[str] = None
     
     def __post_init__(self):
         """Initialize derived values"""
         # Convert string level to logging constant
         self.log_level = getattr(logging, self.level.upper(), logging.INFO)
+        self.console_log_level = self._parse_level(self.console_level)
+        self.file_log_level = self._parse_level(self.file_level)
         
         # Convert max_file_size string to bytes
         self.max_file_size_bytes = self._parse_file_size(self.max_file_size)
@@ -45,27 +100,36 @@ class LogConfig:
         if self.json_format_string is None:
             self.json_format_string = self.format_string
     
+    def _parse_level(self, level: Optional[str]) -> int:
+        """Parse an optional level name, defaulting to the overall level"""
+        if level is None:
+            return self.log_level
+        return getattr(logging, level.upper(), self.log_level)
+    
     def _parse_file_size(self, size_str: str) -> int:
         """Parse file size string like '10MB' to bytes"""
         size_str = size_str.upper().strip()
         
-        multipliers = {
-            'B': 1,
-            'KB': 1024,
-            'MB': 1024 * 1024,
-            'GB': 1024 * 1024 * 1024
-        }
-        
-        for suffix, multiplier in multipliers.items():
-            if size_str.endswith(suffix):
-                try:
-                    return int(float(size_str[:-len(suffix)]) * multiplier)
-                except ValueError:
-                    break
+        # Try the two-letter suffix first so 'B' cannot swallow 'KB'/'MB'/'GB'
+        suffix = size_str[-2:]
+        if suffix not in _SIZE_MULTIPLIERS:
+            suffix = size_str[-1:]
+        multiplier = _SIZE_MULTIPLIERS.get(suffix)
+        if multiplier is not None:
+            try:
+                return int(float(size_str[:-len(suffix)]) * multiplier)
+            except ValueError:
+                pass
         
         # Default to 10MB if parsing fails
         return 10 * 1024 * 1024
 
+# Attributes every LogRecord has (taken from a blank record, so it tracks the
+# running Python version) plus those Formatter.format adds; the rest are extras
+_STANDARD_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+# Extras that are also promoted to top-level fields
+_CONTEXT_FIELDS = ("request_id", "user_id", "component")
+
 class JsonFormatter(logging.Formatter):
     """
     JSON formatter for structured logging
@@ -76,56 +140,67 @@ class JsonFormatter(logging.Formatter):
     def __init__(self, format_string: str = None):
         super().__init__()
         self.format_string = format_string or "%(message)s"
+        # The server never forks, so the pid is fixed; setup_logging() turns
+        # off per-record pid collection when only this formatter needs it
+        self._pid = os.getpid()
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last record formatted
+        self._second_prefix = (None, "")
+    
+    def _timestamp(self, created: float) -> str:
+        """ISO timestamp with microseconds; the date/time part is reused within a second"""
+        second = int(created)
+        cached_second, prefix = self._second_prefix
+        if cached_second != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            self._second_prefix = (second, prefix)
+        return "%s.%06d" % (prefix, min(round((created - second) * 1_000_000), 999_999))
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
+        return _dumps_log_entry(self._log_entry(record))
+    
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        """Format log record as one UTF-8 encoded JSON line, for binary handlers"""
+        return _dumpb_log_line(self._log_entry(record))
+    
+    def _log_entry(self, record: logging.LogRecord) -> Dict[str, Any]:
         # Create base log entry
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
-            "process_id": record.process,
+            "process_id": self._pid,
             "thread_id": record.thread,
             "thread_name": record.threadName
         }
         
-        # Add exception info if present
+        # Add exception info if present. exc_text is the standard per-record
+        # cache, so the traceback is rendered once however many handlers format it
         if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
             log_entry["exception"] = {
                 "type": record.exc_info[0].__name__ if record.exc_info[0] else None,
                 "message": str(record.exc_info[1]) if record.exc_info[1] else None,
-                "traceback": traceback.format_exception(*record.exc_info)
+                "traceback": record.exc_text
             }
         
-        # Add extra fields from record
-        extra_fields = {}
-        for key, value in record.__dict__.items():
-            if key not in {
-                'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                'thread', 'threadName', 'processName', 'process', 'message', 'exc_info',
-                'exc_text', 'stack_info', 'getMessage'
-            }:
-                extra_fields[key] = value
-        
+        # Add extra fields from record, plus application context if available
+        extra_fields = {
+            key: value for key, value in record.__dict__.items()
+            if key not in _STANDARD_RECORD_ATTRS
+        }
         if extra_fields:
             log_entry["extra"] = extra_fields
+            for key in _CONTEXT_FIELDS:
+                if key in extra_fields:
+                    log_entry[key] = extra_fields[key]
         
-        # Add application context if available
-        if hasattr(record, 'request_id'):
-            log_entry["request_id"] = record.request_id
-        
-        if hasattr(record, 'user_id'):
-            log_entry["user_id"] = record.user_id
-        
-        if hasattr(record, 'component'):
-            log_entry["component"] = record.component
-        
-        return json.dumps(log_entry, default=str, ensure_ascii=False)
+        return log_entry
 
 class StructuredLogger:
     """
@@ -137,6 +212,7 @@ class StructuredLogger:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
         self._context: Dict[str, Any] = {}
+        self._is_enabled_for = logger.isEnabledFor
     
     def set_context(self, **kwargs):
         """Set persistent context for all log messages"""
@@ -146,16 +222,36 @@ class StructuredLogger:
         """Clear persistent context"""
         self._context.clear()
     
+    def bind(self, **kwargs) -> 'StructuredLogger':
+        """
+        Return a new logger with kwargs added to this logger's context
+    
+        The merged context is built once here and reused by every log call
+        that adds no fields of its own. Unlike set_context() this logger is
+        left untouched, so it suits per-request or per-connection loggers.
+        """
+        bound = StructuredLogger(self.logger)
+        bound._context = {**self._context, **kwargs}
+        return bound
+    
     def _log_with_context(self, level: int, message: str, **kwargs):
         """Log with combined context and kwargs"""
-        combined_context = {**self._context, **kwargs}
+        # Filtered-out levels cost one cached check, no dict merge or record
+        if not self._is_enabled_for(level):
+            return
         
-        # Create LogRecord with extra context
-        record = self.logger.makeRecord(
-            self.logger.name, level, "", 0, message, (), None, 
-            extra=combined_context
-        )
-        self.logger.handle(record)
+        exc_info = kwargs.pop('exc_info', None)
+        # Only merge when both sides have fields; logging copies extra into
+        # the record and never modifies it, so either dict can be passed as is
+        if not self._context:
+            extra = kwargs
+        elif not kwargs:
+            extra = self._context
+        else:
+            extra = {**self._context, **kwargs}
+        # stacklevel=3 skips this method and the debug()/info()/... wrapper, so
+        # the record carries the real caller's module, function and line
+        self.logger.log(level, message, exc_info=exc_info, extra=extra, stacklevel=3)
     
     def debug(self, message: str, **kwargs):
         """Log debug message with context"""
@@ -199,19 +295,26 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Environment and terminal do not change while the process runs
+        self._use_colors = self._should_use_colors()
+        # Colored level names, built once; unknown levels stay uncolored
+        reset = self.COLORS['RESET']
+        self._colored_levelnames = {
+            level: f"{color}{level}{reset}"
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format with colors if supported"""
         # Check if colors should be used
-        if not self._should_use_colors():
+        if not self._use_colors:
             return super().format(record)
         
-        # Add color to level name
-        level_color = self.COLORS.get(record.levelname, '')
-        reset_color = self.COLORS['RESET']
-        
         # Temporarily modify the record
         original_levelname = record.levelname
-        record.levelname = f"{level_color}{record.levelname}{reset_color}"
+        record.levelname = self._colored_levelnames.get(original_levelname, original_levelname)
         
         try:
             return super().format(record)
@@ -232,6 +335,153 @@ class ColoredFormatter(logging.Formatter):
         # Use colors if stderr is a TTY
         return hasattr(sys.stderr, 'isatty') and sys.stderr.isatty()
 
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue
+    
+    The stock handler formats each record before enqueueing it, so the
+    formatting cost stays on the caller's thread and the traceback ends up
+    both in the message and again from the listener's formatter. Here only
+    the message is merged with its arguments on the caller's thread, so
+    mutable arguments are logged as they were at call time and bad format
+    strings fail where they were written; the rest of the formatting happens
+    once on the listener thread.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+class _DeferredFlushMixin:
+    """Handler whose per-record flush can be held back while a batch is written"""
+    
+    _hold_flush = False
+    
+    def flush(self):
+        if not self._hold_flush:
+            super().flush()
+
+class _StreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+class _RotatingFileHandler(_DeferredFlushMixin, logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes encoded bytes to a binary stream
+    
+    Each record is formatted and encoded once: JSON lines come straight from
+    JsonFormatter.format_bytes, and the rollover check uses the same bytes
+    instead of formatting the record a second time as the base class does.
+    """
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode + 'b')
+        # Only regular files are rotated (bpo-45401); checked per open, not per record
+        self._rotatable = os.path.isfile(self.baseFilename)
+        return stream
+    
+    def _encode(self, record: logging.LogRecord) -> bytes:
+        formatter = self.formatter
+        if isinstance(formatter, JsonFormatter):
+            return formatter.format_bytes(record)
+        return (self.format(record) + self.terminator).encode(
+            self.encoding or 'utf-8', self.errors or 'strict')
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            data = self._encode(record)
+            if self.stream is None:
+                self.stream = self._open()
+            if (self.maxBytes > 0 and self._rotatable
+                    and self.stream.tell() + len(data) >= self.maxBytes):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that handles records in batches
+    
+    After each blocking get, whatever else is already queued (up to
+    batch_size records) is taken too. Stream handlers skip their per-record
+    flush inside a batch and flush once at the end, so a burst of records
+    costs one write per buffer-full instead of one write per record.
+    """
+    
+    batch_size = 64
+    
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        stopping = False
+        while not stopping:
+            batch = []
+            record = self.dequeue(True)
+            while True:
+                if record is self._sentinel:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = q.get_nowait()
+                except queue.Empty:
+                    break
+            self._handle_batch(batch)
+            if has_task_done:
+                for _ in range(len(batch) + stopping):
+                    q.task_done()
+    
+    def _handle_batch(self, batch):
+        deferred = [h for h in self.handlers if isinstance(h, _DeferredFlushMixin)]
+        for handler in deferred:
+            handler._hold_flush = True
+        try:
+            for record in batch:
+                self.handle(record)
+        finally:
+            for handler in deferred:
+                handler._hold_flush = False
+                handler.flush()
+
+# Background listener that drains the logging queue (see setup_logging)
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+# Serializes stopping and restarting the listener: a second stop() while the
+# first is mid-restart would find no thread to join
+_listener_lock = threading.Lock()
+
+def _stop_queue_listener():
+    """Flush and stop the background logging listener, if one is running"""
+    global _queue_listener
+    with _listener_lock:
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            _queue_listener = None
+
+atexit.register(_stop_queue_listener)
+
+def flush_logging():
+    """
+    Block until every record logged so far has been written
+    
+    With queue_handlers the writes happen on the listener thread, so a log
+    file read right after logging may not have the latest records yet.
+    """
+    with _listener_lock:
+        listener = _queue_listener
+        if listener is not None:
+            # stop() drains the queue up to its sentinel and joins the thread
+            listener.stop()
+            listener.start()
+
 def setup_logging(config: LogConfig) -> Dict[str, logging.Logger]:
     """
     Set up logging with the provided configuration
@@ -242,20 +492,38 @@ def setup_logging(config: LogConfig) -> Dict[str, logging.Logger]:
     Returns:
         Dictionary of configured loggers by name
     """
+    global _queue_listener
+    
     # Clear any existing handlers
+    _stop_queue_listener()
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Set root logger level
-    root_logger.setLevel(config.log_level)
+    handlers = []
+    
+    # Root passes anything at least one destination wants; each handler's own
+    # level then drops the rest before its formatter runs
+    enabled_levels = []
+    if config.console_enabled:
+        enabled_levels.append(config.console_log_level)
+    if config.file_enabled:
+        enabled_levels.append(config.file_log_level)
+    root_level = min(enabled_levels, default=config.log_level)
+    root_logger.setLevel(root_level)
+    
+    # LogRecord calls os.getpid() and looks up multiprocessing for every
+    # record; skip that unless a text format actually prints it
+    wants_process = not config.json_format and "%(process" in config.format_string
+    logging.logProcesses = wants_process
+    logging.logMultiprocessing = wants_process
     
     loggers = {}
     
     # Console handler
     if config.console_enabled:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(config.log_level)
+        console_handler = _StreamHandler(sys.stdout)
+        console_handler.setLevel(config.console_log_level)
         
         if config.json_format:
             console_formatter = JsonFormatter(config.json_format_string)
@@ -263,19 +531,19 @@ def setup_logging(config: LogConfig) -> Dict[str, logging.Logger]:
             console_formatter = ColoredFormatter(config.format_string)
         
         console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # File handler with rotation
     if config.file_enabled:
         try:
             log_file = config.log_dir / "server.log"
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = _RotatingFileHandler(
                 log_file,
                 maxBytes=config.max_file_size_bytes,
                 backupCount=config.backup_count,
                 encoding='utf-8'
             )
-            file_handler.setLevel(config.log_level)
+            file_handler.setLevel(config.file_log_level)
             
             if config.json_format:
                 file_formatter = JsonFormatter(config.json_format_string)
@@ -283,25 +551,27 @@ def setup_logging(config: LogConfig) -> Dict[str, logging.Logger]:
                 file_formatter = logging.Formatter(config.format_string)
             
             file_handler.setFormatter(file_formatter)
-            root_logger.addHandler(file_handler)
+            handlers.append(file_handler)
             
         except Exception as e:
             print(f"Warning: Could not set up file logging: {e}", file=sys.stderr)
     
-    # Create specific loggers for modules
-    module_names = [
-        'webcam_ip',
-        'webcam_ip.server',
-        'webcam_ip.camera', 
-        'webcam_ip.utils',
-        'websockets',
-        'asyncio'
-    ]
-    
-    for module_name in module_names:
-        logger = logging.getLogger(module_name)
-        logger.setLevel(config.log_level)
-        loggers[module_name] = logger
+    # Console/file writes happen on the listener thread; callers only enqueue
+    if config.queue_handlers and handlers:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(_LocalQueueHandler(log_queue))
+        _queue_listener = _BatchingQueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+    
+    # Module loggers are left at NOTSET and inherit the root level, so they
+    # are only looked up here, never given a level of their own
+    for module_name in _MODULE_LOGGER_NAMES:
+        loggers[module_name] = logging.getLogger(module_name)
     
     # Log successful setup
     setup_logger = logging.getLogger('webcam_ip.utils.logging')
@@ -8,17 +8,28 @@ Coordinates cleanup of resources, connections, and background tasks.
 import asyncio
 import atexit
 import logging
+import select
 import signal
+import socket
 import sys
 import threading
 import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import asynccontextmanager
-from typing import List, Callable, Any, Optional, Dict, Set
+from typing import Callable, Any, Optional, Dict, Literal, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Most of the shutdown budget the "stop" cleanup phase may use; drain
+# handlers get whatever is left
+STOP_PHASE_TIMEOUT = 5.0
+# Upper bound on threads used for parallel sync cleanup handlers
+MAX_PARALLEL_CLEANUP_WORKERS = 8
+
 class ShutdownReason(Enum):
     """Reasons for application shutdown"""
     SIGNAL_SIGTERM = "SIGTERM"
@@ -28,25 +39,54 @@ class ShutdownReason(Enum):
     ERROR = "ERROR"
     TIMEOUT = "TIMEOUT"
 
+# Shutdown reason per signal number; SIGQUIT does not exist on Windows
+_SIGNAL_REASONS: Dict[int, ShutdownReason] = {
+    signal.SIGTERM: ShutdownReason.SIGNAL_SIGTERM,
+    signal.SIGINT: ShutdownReason.SIGNAL_SIGINT,
+}
+if hasattr(signal, 'SIGQUIT'):
+    _SIGNAL_REASONS[signal.SIGQUIT] = ShutdownReason.SIGNAL_SIGQUIT
+
+# Signals that trigger a graceful shutdown on this platform
+if sys.platform == 'win32':
+    _SIGNALS_TO_HANDLE = (signal.SIGINT,)
+else:
+    _SIGNALS_TO_HANDLE = (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT)
+
 @dataclass
 class ShutdownContext:
     """Context information for shutdown process"""
     reason: ShutdownReason
     signal_number: Optional[int] = None
-    start_time: float = field(default_factory=time.time)
+    # time.monotonic() values, so clock adjustments cannot stretch or cut
+    # the cleanup budget
+    start_time: float = field(default_factory=time.monotonic)
     timeout: float = 30.0
-    cleanup_handlers: List[Callable] = field(default_factory=list)
-    async_cleanup_handlers: List[Callable] = field(default_factory=list)
+    # Handlers registered when shutdown started; never modified afterwards
+    cleanup_handlers: Tuple[Callable, ...] = ()
+    async_cleanup_handlers: Tuple[Callable, ...] = ()
+    async_stop_handlers: Tuple[Callable, ...] = ()
+    deadline: float = field(init=False)
+    
+    def __post_init__(self):
+        self.deadline = self.start_time + self.timeout
     
     @property
     def elapsed_time(self) -> float:
         """Get elapsed time since shutdown started"""
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
     
     @property
     def remaining_time(self) -> float:
         """Get remaining time before timeout"""
-        return max(0, self.timeout - self.elapsed_time)
+        return max(0.0, self.deadline - time.monotonic())
+
+def _is_running_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """Whether loop is the loop running in the calling thread"""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
 
 class SignalHandler:
     """
@@ -64,59 +104,115 @@ class SignalHandler:
         self.timeout = timeout
         self.shutdown_event = asyncio.Event()
         self.shutdown_context: Optional[ShutdownContext] = None
-        self.cleanup_handlers: List[Callable] = []
-        self.async_cleanup_handlers: List[Callable] = []
+        # Insertion-ordered sets (dict keys): iterating yields the handlers in
+        # registration order, and removal is O(1) however many are registered.
+        # Sync handlers map to their parallel flag
+        self.cleanup_handlers: Dict[Callable, bool] = {}
+        self.async_cleanup_handlers: Dict[Callable, None] = {}
+        # Async handlers that stop new work; run before async_cleanup_handlers
+        self.async_stop_handlers: Dict[Callable, None] = {}
         self._signal_handlers: Dict[int, Callable] = {}
         self._original_handlers: Dict[int, Any] = {}
         self._shutdown_in_progress = False
-        self._lock = threading.Lock()
+        # Taken once and never released: a non-blocking acquire is an atomic
+        # test-and-set, so exactly one trigger_shutdown call wins
+        self._shutdown_once = threading.Lock()
+        # Loop the signals were registered on with add_signal_handler, if any
+        self._signal_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Loop waiting on shutdown_event, so other threads can set it safely
+        self._wait_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Signals caught by the signal.signal() fallback, not yet processed
+        self._pending_signals: deque = deque()
+        # Write end of the socket the fallback's signals arrive on through
+        # signal.set_wakeup_fd(), and the wakeup fd it replaced
+        self._wakeup_socket: Optional[socket.socket] = None
+        self._previous_wakeup_fd = -1
+        # Write end of the socket pair wait_for_shutdown_sync() sleeps on
+        self._sync_waker: Optional[socket.socket] = None
         
         logger.info(f"Signal handler initialized with {timeout}s timeout")
     
-    def add_cleanup_handler(self, handler: Callable, async_handler: bool = False):
+    def add_cleanup_handler(self, handler: Callable, async_handler: bool = False,
+                            phase: Literal['stop', 'drain'] = 'drain',
+                            parallel: bool = False):
         """
         Add a cleanup handler to be called during shutdown
         
+        Handlers run in reverse order of registration, so something set up
+        later (and likely depending on what came before it) is torn down
+        first.
+        
         Args:
             handler: Cleanup function to call
             async_handler: Whether handler is async
+            phase: For async handlers, 'stop' for quick handlers that stop
+                accepting new work, run first with their own short timeout;
+                'drain' for handlers that wait for in-flight work
+            parallel: For sync handlers with independent blocking work (closing
+                files or sockets); they run on worker threads alongside the
+                ordered handlers instead of taking their turn
         """
-        with self._lock:
-            if async_handler:
-                self.async_cleanup_handlers.append(handler)
-                logger.debug(f"Added async cleanup handler: {handler.__name__}")
-            else:
-                self.cleanup_handlers.append(handler)
-                logger.debug(f"Added sync cleanup handler: {handler.__name__}")
+        # Single dict stores and deletes are atomic, and readers iterate over
+        # copies, so registration needs no lock
+        if async_handler and phase == 'stop':
+            self.async_stop_handlers[handler] = None
+            logger.debug("Added async stop handler: %s", handler.__name__)
+        elif async_handler:
+            self.async_cleanup_handlers[handler] = None
+            logger.debug("Added async cleanup handler: %s", handler.__name__)
+        else:
+            self.cleanup_handlers[handler] = parallel
+            logger.debug("Added sync cleanup handler: %s", handler.__name__)
     
     def remove_cleanup_handler(self, handler: Callable):
         """Remove a cleanup handler"""
-        with self._lock:
-            if handler in self.cleanup_handlers:
-                self.cleanup_handlers.remove(handler)
-                logger.debug(f"Removed sync cleanup handler: {handler.__name__}")
-            
-            if handler in self.async_cleanup_handlers:
-                self.async_cleanup_handlers.remove(handler)
-                logger.debug(f"Removed async cleanup handler: {handler.__name__}")
+        try:
+            del self.cleanup_handlers[handler]
+            logger.debug("Removed sync cleanup handler: %s", handler.__name__)
+        except KeyError:
+            pass
+        
+        try:
+            del self.async_cleanup_handlers[handler]
+            logger.debug("Removed async cleanup handler: %s", handler.__name__)
+        except KeyError:
+            pass
+        
+        try:
+            del self.async_stop_handlers[handler]
+            logger.debug("Removed async stop handler: %s", handler.__name__)
+        except KeyError:
+            pass
     
     def setup_signal_handlers(self):
         """Set up signal handlers for graceful shutdown"""
-        if sys.platform == 'win32':
-            # Windows signal handling
-            signals_to_handle = [signal.SIGINT]
-        else:
-            # Unix signal handling
-            signals_to_handle = [signal.SIGTERM, signal.SIGINT, signal.SIGQUIT]
+        signals_to_handle = _SIGNALS_TO_HANDLE
+        
+        # With a running loop in the main thread the signal is delivered as an
+        # ordinary loop callback; plain signal.signal() is the fallback
+        loop = None
+        if sys.platform != 'win32' and threading.current_thread() is threading.main_thread():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
         
         for sig in signals_to_handle:
             try:
                 # Store original handler
-                self._original_handlers[sig] = signal.signal(sig, self._signal_handler)
-                self._signal_handlers[sig] = self._signal_handler
+                if loop is not None:
+                    self._original_handlers[sig] = signal.getsignal(sig)
+                    loop.add_signal_handler(sig, self._loop_signal_handler, sig)
+                    self._signal_handlers[sig] = self._loop_signal_handler
+                else:
+                    self._original_handlers[sig] = signal.signal(sig, self._signal_handler)
+                    self._signal_handlers[sig] = self._signal_handler
                 logger.debug(f"Registered signal handler for {signal.Signals(sig).name}")
-            except (OSError, ValueError) as e:
+            except (OSError, ValueError, RuntimeError) as e:
                 logger.warning(f"Could not register handler for signal {sig}: {e}")
+        self._signal_loop = loop
+        if loop is None and self._signal_handlers:
+            self._start_wakeup_reader()
         
         # Register cleanup on normal exit
         atexit.register(self._atexit_handler)
@@ -125,8 +221,11 @@ class SignalHandler:
     
     def restore_signal_handlers(self):
         """Restore original signal handlers"""
+        loop, self._signal_loop = self._signal_loop, None
         for sig, original_handler in self._original_handlers.items():
             try:
+                if loop is not None and not loop.is_closed():
+                    loop.remove_signal_handler(sig)
                 signal.signal(sig, original_handler)
                 logger.debug(f"Restored original handler for {signal.Signals(sig).name}")
             except (OSError, ValueError) as e:
@@ -134,20 +233,102 @@ class SignalHandler:
         
         self._original_handlers.clear()
         self._signal_handlers.clear()
+        
+        # Hand the wakeup fd back before closing ours, so a late signal
+        # cannot be written to a closed (or reused) descriptor. Closing the
+        # write end ends the reader thread
+        waker, self._wakeup_socket = self._wakeup_socket, None
+        if waker is not None:
+            try:
+                signal.set_wakeup_fd(self._previous_wakeup_fd)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not restore signal wakeup fd: {e}")
+            waker.close()
+        
+        # A restored global handler no longer catches anything; let the next
+        # setup_signal_handlers() call install a fresh one
+        global _global_signal_handler
+        if _global_signal_handler is self:
+            _global_signal_handler = None
+    
+    def _start_wakeup_reader(self):
+        """
+        Deliver signals caught by signal.signal() through a wakeup socket
+        
+        The interpreter's C-level handler writes each signal number to the
+        socket as the signal arrives; a reader thread turns it into
+        trigger_shutdown() outside signal context, so the shutdown state is
+        set right away even when nothing is waiting or polling.
+        """
+        reader, waker = socket.socketpair()
+        waker.setblocking(False)
+        try:
+            self._previous_wakeup_fd = signal.set_wakeup_fd(waker.fileno(), warn_on_full_buffer=False)
+        except (OSError, ValueError) as e:
+            # Not the main thread; signals stay queued for the next poll
+            logger.debug(f"Signal wakeup fd unavailable: {e}")
+            reader.close()
+            waker.close()
+            return
+        self._wakeup_socket = waker
+        threading.Thread(target=self._read_wakeup_socket, args=(reader,),
+                         name="signal-wakeup", daemon=True).start()
+    
+    def _read_wakeup_socket(self, reader: socket.socket):
+        """Reader thread: handle signal numbers until the write end is closed"""
+        try:
+            while True:
+                try:
+                    data = reader.recv(64)
+                except OSError:
+                    break
+                if not data:
+                    break
+                for sig in data:
+                    # Every signal with a Python-level handler is written
+                    # here, not only the ones this handler registered
+                    if sig in self._signal_handlers:
+                        self._handle_signal(sig)
+        finally:
+            reader.close()
     
     def _signal_handler(self, sig: int, frame):
-        """Handle received signals"""
+        """
+        Handle received signals
+        
+        Runs between two bytecodes of the main thread, which may be holding
+        a logging lock at that moment, so it does no work of its own. With
+        the wakeup socket in place the reader thread already has the signal;
+        otherwise it is queued for the waiting loop or the next
+        is_shutdown_requested() poll.
+        """
+        if self._wakeup_socket is not None:
+            return
+        self._pending_signals.append(sig)
+        self._wake_sync_waiter()
+        loop = self._wait_loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._process_pending_signals)
+            except RuntimeError:
+                # Loop already closed; the next poll picks the signal up
+                pass
+    
+    def _process_pending_signals(self):
+        """Act on signals queued by _signal_handler, outside signal context"""
+        while self._pending_signals:
+            self._handle_signal(self._pending_signals.popleft())
+    
+    def _loop_signal_handler(self, sig: int):
+        """Handle a signal delivered through the event loop"""
+        self._handle_signal(sig)
+    
+    def _handle_signal(self, sig: int):
         signal_name = signal.Signals(sig).name
         logger.info(f"Received signal {signal_name} ({sig})")
         
         # Determine shutdown reason
-        reason_map = {
-            signal.SIGTERM: ShutdownReason.SIGNAL_SIGTERM,
-            signal.SIGINT: ShutdownReason.SIGNAL_SIGINT,
-            signal.SIGQUIT: ShutdownReason.SIGNAL_SIGQUIT,
-        }
-        
-        reason = reason_map.get(sig, ShutdownReason.SIGNAL_SIGTERM)
+        reason = _SIGNAL_REASONS.get(sig, ShutdownReason.SIGNAL_SIGTERM)
         
         # Trigger shutdown
         self.trigger_shutdown(reason, sig)
@@ -166,12 +347,11 @@ class SignalHandler:
             reason: Reason for shutdown
             signal_number: Signal number if triggered by signal
         """
-        with self._lock:
-            if self._shutdown_in_progress:
-                logger.warning(f"Shutdown already in progress, ignoring {reason}")
-                return
-            
-            self._shutdown_in_progress = True
+        if not self._shutdown_once.acquire(blocking=False):
+            logger.warning(f"Shutdown already in progress, ignoring {reason}")
+            return
+        
+        self._shutdown_in_progress = True
         
         logger.info(f"Initiating graceful shutdown: {reason.value}")
         
@@ -180,30 +360,58 @@ class SignalHandler:
             reason=reason,
             signal_number=signal_number,
             timeout=self.timeout,
-            cleanup_handlers=self.cleanup_handlers.copy(),
-            async_cleanup_handlers=self.async_cleanup_handlers.copy()
+            cleanup_handlers=tuple(self.cleanup_handlers),
+            async_cleanup_handlers=tuple(self.async_cleanup_handlers),
+            async_stop_handlers=tuple(self.async_stop_handlers)
         )
         
-        # Set shutdown event
-        try:
-            # Try to set the event in the current loop
-            loop = asyncio.get_running_loop()
+        # Set shutdown event. asyncio.Event.set() needs no loop of its own; it
+        # only has to run on the loop that is waiting, if that is another thread
+        loop = self._wait_loop
+        if loop is not None and not loop.is_closed() and not _is_running_loop(loop):
             loop.call_soon_threadsafe(self.shutdown_event.set)
-        except RuntimeError:
-            # No running loop, set directly
-            if not self.shutdown_event.is_set():
-                # Create a new loop to set the event
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(self._set_shutdown_event())
-                    loop.close()
-                except Exception as e:
-                    logger.error(f"Could not set shutdown event: {e}")
+        else:
+            self.shutdown_event.set()
+        self._wake_sync_waiter()
     
-    async def _set_shutdown_event(self):
-        """Set shutdown event in async context"""
-        self.shutdown_event.set()
+    def _wake_sync_waiter(self):
+        waker = self._sync_waker
+        if waker is not None:
+            try:
+                waker.send(b"\0")
+            except OSError:
+                # Buffer full (a wake-up is already pending) or already closed
+                pass
+    
+    def wait_for_shutdown_sync(self) -> Optional[ShutdownContext]:
+        """
+        Block the calling thread until shutdown is requested
+        
+        Sleeps in select() on a socket pair that the signal handler and
+        trigger_shutdown() write to, so there is no polling. A signal
+        interrupting the select() runs the handler, which writes the wake-up
+        byte before select() is retried.
+        
+        Returns:
+            ShutdownContext with shutdown information
+        """
+        reader, waker = socket.socketpair()
+        reader.setblocking(False)
+        waker.setblocking(False)
+        self._sync_waker = waker
+        try:
+            while not self.is_shutdown_requested():
+                select.select([reader], [], [])
+                try:
+                    while reader.recv(512):
+                        pass
+                except BlockingIOError:
+                    pass
+        finally:
+            self._sync_waker = None
+            reader.close()
+            waker.close()
+        return self.get_shutdown_context()
     
     async def wait_for_shutdown(self) -> ShutdownContext:
         """
@@ -213,56 +421,74 @@ class SignalHandler:
             ShutdownContext with shutdown information
         """
         logger.debug("Waiting for shutdown signal...")
+        self._wait_loop = asyncio.get_running_loop()
+        # A signal may have been caught before anyone was waiting
+        self._process_pending_signals()
         await self.shutdown_event.wait()
         logger.info(f"Shutdown signal received: {self.shutdown_context.reason.value}")
         return self.shutdown_context
     
     async def run_async_cleanup(self):
-        """Run all async cleanup handlers with timeout"""
+        """
+        Run all async cleanup handlers with timeout
+        
+        Stop handlers run first, limited to STOP_PHASE_TIMEOUT, so accepting
+        new work ends quickly; drain handlers then share the rest of the
+        shutdown budget. Each phase returns as soon as its handlers finish.
+        """
         if not self.shutdown_context:
             return
         
-        if not self.async_cleanup_handlers:
+        context = self.shutdown_context
+        if not context.async_stop_handlers and not context.async_cleanup_handlers:
             logger.debug("No async cleanup handlers to run")
             return
         
-        logger.info(f"Running {len(self.async_cleanup_handlers)} async cleanup handlers...")
+        await self._run_async_phase(
+            "stop", context.async_stop_handlers,
+            min(STOP_PHASE_TIMEOUT, context.remaining_time))
+        await self._run_async_phase(
+            "cleanup", context.async_cleanup_handlers, context.remaining_time)
+    
+    async def _run_async_phase(self, name: str, handlers: Tuple[Callable, ...], timeout: float):
+        """Run one phase of async handlers concurrently, cancelling them on timeout"""
+        if not handlers:
+            return
+        
+        logger.info(f"Running {len(handlers)} async {name} handlers...")
         
-        cleanup_tasks = []
-        for handler in self.shutdown_context.async_cleanup_handlers:
+        # Coroutines and executor futures go to gather() as they are: no extra
+        # task or wrapper coroutine per handler
+        loop = asyncio.get_running_loop()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        awaitables = []
+        for handler in reversed(handlers):
             try:
                 if asyncio.iscoroutinefunction(handler):
-                    task = asyncio.create_task(handler())
+                    awaitables.append(handler())
                 else:
-                    # Wrap sync function in async
-                    task = asyncio.create_task(self._run_sync_in_executor(handler))
-                
-                cleanup_tasks.append(task)
-                logger.debug(f"Added cleanup task: {handler.__name__}")
+                    awaitables.append(loop.run_in_executor(None, handler))
+                if debug:
+                    logger.debug("Added %s task: %s", name, handler.__name__)
                 
             except Exception as e:
-                logger.error(f"Error creating cleanup task for {handler.__name__}: {e}")
+                logger.error(f"Error creating {name} task for {handler.__name__}: {e}")
         
-        if cleanup_tasks:
+        if awaitables:
             try:
-                # Wait for all cleanup tasks with timeout
+                # Wait for all tasks with timeout; on timeout wait_for cancels
+                # the gather, which cancels whatever is still running
                 await asyncio.wait_for(
-                    asyncio.gather(*cleanup_tasks, return_exceptions=True),
-                    timeout=self.shutdown_context.remaining_time
+                    asyncio.gather(*awaitables, return_exceptions=True),
+                    timeout=timeout
                 )
-                logger.info("All async cleanup handlers completed")
+                logger.info(f"All async {name} handlers completed")
                 
             except asyncio.TimeoutError:
-                logger.warning(f"Async cleanup timed out after {self.shutdown_context.remaining_time:.1f}s")
-                
-                # Cancel remaining tasks
-                for task in cleanup_tasks:
-                    if not task.done():
-                        task.cancel()
-                        logger.debug(f"Cancelled cleanup task: {task}")
+                logger.warning(f"Async {name} timed out after {timeout:.1f}s")
                 
             except Exception as e:
-                logger.error(f"Error during async cleanup: {e}")
+                logger.error(f"Error during async {name}: {e}")
     
     def run_sync_cleanup(self):
         """Run all sync cleanup handlers"""
@@ -276,24 +502,53 @@ class SignalHandler:
         
         logger.info(f"Running {len(self.cleanup_handlers)} sync cleanup handlers...")
         
-        for handler in self.cleanup_handlers:
+        handlers = tuple(self.cleanup_handlers.items())
+        parallel = [handler for handler, is_parallel in handlers if is_parallel]
+        executor = None
+        futures = []
+        if parallel:
+            executor = ThreadPoolExecutor(
+                max_workers=min(MAX_PARALLEL_CLEANUP_WORKERS, len(parallel)),
+                thread_name_prefix="cleanup")
             try:
-                handler()
-                logger.debug(f"Completed cleanup handler: {handler.__name__}")
-            except Exception as e:
-                logger.error(f"Error in cleanup handler {handler.__name__}: {e}")
-    
-    async def _run_sync_in_executor(self, handler: Callable):
-        """Run sync handler in thread executor"""
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, handler)
+                futures = [executor.submit(self._run_sync_cleanup_handler, handler)
+                           for handler in reversed(parallel)]
+            except RuntimeError:
+                # Interpreter exit (the atexit path) refuses new threads;
+                # fall back to running everything in order
+                executor.shutdown(wait=True, cancel_futures=True)
+                executor = None
+                futures = []
+                parallel = []
+        
+        # Ordered handlers run here while the parallel ones work in the pool
+        for handler, is_parallel in reversed(handlers):
+            if not (is_parallel and parallel):
+                self._run_sync_cleanup_handler(handler)
+        
+        if executor is not None:
+            timeout = self.shutdown_context.remaining_time if self.shutdown_context else self.timeout
+            _, not_done = wait(futures, timeout=timeout)
+            if not_done:
+                logger.warning(f"{len(not_done)} parallel cleanup handlers still running after {timeout:.1f}s")
+            # Threads cannot be interrupted; do not wait for stragglers
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run_sync_cleanup_handler(self, handler: Callable):
+        try:
+            handler()
+            logger.debug("Completed cleanup handler: %s", handler.__name__)
+        except Exception as e:
+            logger.error(f"Error in cleanup handler {handler.__name__}: {e}")
     
     def is_shutdown_requested(self) -> bool:
         """Check if shutdown has been requested"""
+        self._process_pending_signals()
         return self.shutdown_event.is_set()
     
     def get_shutdown_context(self) -> Optional[ShutdownContext]:
         """Get current shutdown context"""
+        self._process_pending_signals()
         return self.shutdown_context
 
 class GracefulShutdown:
@@ -307,7 +562,10 @@ class GracefulShutdown:
     def __init__(self, timeout: float = 30.0, setup_signals: bool = True):
         self.signal_handler = SignalHandler(timeout)
         self.setup_signals = setup_signals
-        self._resources: Set[Any] = set()
+        # (reference to resource, cleanup method name) in registration order,
+        # keyed by id() of the reference. Resources are held weakly and drop
+        # out when collected, so one discarded before shutdown is not kept alive
+        self._resources: Dict[int, Tuple[Callable[[], Any], str]] = {}
     
     def __enter__(self):
         if self.setup_signals:
@@ -336,9 +594,11 @@ class GracefulShutdown:
         if self.setup_signals:
             self.signal_handler.restore_signal_handlers()
     
-    def add_cleanup_handler(self, handler: Callable, async_handler: bool = False):
+    def add_cleanup_handler(self, handler: Callable, async_handler: bool = False,
+                            phase: Literal['stop', 'drain'] = 'drain',
+                            parallel: bool = False):
         """Add cleanup handler"""
-        self.signal_handler.add_cleanup_handler(handler, async_handler)
+        self.signal_handler.add_cleanup_handler(handler, async_handler, phase, parallel)
     
     def add_resource(self, resource: Any, cleanup_method: str = "close"):
         """
@@ -348,19 +608,33 @@ class GracefulShutdown:
             resource: Resource object
             cleanup_method: Method name to call for cleanup
         """
-        self._resources.add(resource)
-        
-        def cleanup():
+        # One shared cleanup handler walks all resources, registered with the
+        # first of them
+        if not self._resources:
+            self.add_cleanup_handler(self._cleanup_resources)
+        try:
+            ref = weakref.ref(resource, self._forget_resource)
+        except TypeError:
+            # No weakref support (builtins, __slots__ classes): keep it alive
+            ref = lambda: resource
+        self._resources[id(ref)] = (ref, cleanup_method)
+    
+    def _forget_resource(self, ref: weakref.ref):
+        self._resources.pop(id(ref), None)
+    
+    def _cleanup_resources(self):
+        """Clean up added resources, most recently added first"""
+        for ref, cleanup_method in reversed(tuple(self._resources.values())):
+            resource = ref()
+            if resource is None:
+                continue
             try:
-                if hasattr(resource, cleanup_method):
-                    method = getattr(resource, cleanup_method)
-                    if callable(method):
-                        method()
-                        logger.debug(f"Cleaned up resource: {resource}")
+                method = getattr(resource, cleanup_method, None)
+                if callable(method):
+                    method()
+                    logger.debug("Cleaned up resource: %s", resource)
             except Exception as e:
                 logger.error(f"Error cleaning up resource {resource}: {e}")
-        
-        self.add_cleanup_handler(cleanup)
     
     async def wait_for_shutdown(self) -> ShutdownContext:
         """Wait for shutdown signal"""
@@ -373,6 +647,7 @@ class GracefulShutdown:
 
 # Global signal handler instance
 _global_signal_handler: Optional[SignalHandler] = None
+_global_signal_handler_lock = threading.Lock()
 
 def setup_signal_handlers(timeout: float = 30.0) -> SignalHandler:
     """
@@ -386,12 +661,18 @@ def setup_signal_handlers(timeout: float = 30.0) -> SignalHandler:
     """
     global _global_signal_handler
     
-    if _global_signal_handler is None:
-        _global_signal_handler = SignalHandler(timeout)
-        _global_signal_handler.setup_signal_handlers()
-        logger.info("Global signal handlers set up")
+    handler = _global_signal_handler
+    if handler is None:
+        # Double-checked so concurrent first calls install the handlers once
+        with _global_signal_handler_lock:
+            handler = _global_signal_handler
+            if handler is None:
+                handler = SignalHandler(timeout)
+                handler.setup_signal_handlers()
+                _global_signal_handler = handler
+                logger.info("Global signal handlers set up")
     
-    return _global_signal_handler
+    return handler
 
 def get_signal_handler() -> Optional[SignalHandler]:
     """Get global signal handler"""
@@ -441,10 +722,7 @@ def wait_for_signal(timeout: float = 30.0) -> ShutdownContext:
     handler = setup_signal_handlers(timeout)
     
     # Block until signal received
-    while not handler.is_shutdown_requested():
-        time.sleep(0.1)
-    
-    return handler.get_shutdown_context()
+    return handler.wait_for_shutdown_sync()
 
 def register_cleanup(func: Callable, async_cleanup: bool = False):
     """